@@ -1 +0,0 @@
-# Modul src 
\ No newline at end of file
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark koneksi Bot API: HTTPXRequest bawaan dibanding TelegramTransport.
+
+Menjalankan server Bot API palsu di localhost yang menambahkan jeda
+--handshake pada setiap koneksi baru (pengganti TCP + TLS handshake ke
+api.telegram.org). Untuk kedua pengaturan, bot diinisialisasi, dibiarkan idle
+selama --idle detik (lebih lama dari keepalive bawaan httpx, 5 detik), lalu
+mengirim --requests send_message bersamaan dua kali. Dicatat latensi dan
+jumlah koneksi baru yang harus dibuka selama burst.
+
+HTTP/2 tidak diukur karena server lokal tanpa TLS.
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_bot_transport.py --requests 20 --handshake 0.1 --idle 6
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+from telegram import Bot
+from telegram.request import HTTPXRequest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.telegram_transport import TelegramTransport
+
+TOKEN = "123456:BENCHMARK"
+METHOD = re.compile(rb'^[A-Z]+ /(?:file/)?bot[^/]+/(\w*)')
+
+RESULTS = {
+    b'getMe': {"id": 123456, "is_bot": True, "first_name": "Bench", "username": "bench_bot"},
+    b'sendMessage': {"message_id": 1, "date": 0, "chat": {"id": 1, "type": "private"}, "text": "ok"}
+}
+
+
+class FakeBotApi:
+    def __init__(self, handshake, latency):
+        self.handshake = handshake
+        self.latency = latency
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        # Jeda koneksi baru menggantikan TCP + TLS handshake
+        await asyncio.sleep(self.handshake)
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = re.search(rb'(?i)content-length:\s*(\d+)', head)
+                if length:
+                    await reader.readexactly(int(length.group(1)))
+                await asyncio.sleep(self.latency)
+                match = METHOD.match(head)
+                result = RESULTS.get(match.group(1) if match else b'')
+                if result is None:
+                    status, body = b'404 Not Found', {"ok": False, "error_code": 404, "description": "Not Found"}
+                else:
+                    status, body = b'200 OK', {"ok": True, "result": result}
+                payload = json.dumps(body).encode()
+                writer.write(b'HTTP/1.1 ' + status + b'\r\nContent-Type: application/json\r\n'
+                             b'Content-Length: ' + str(len(payload)).encode() + b'\r\n\r\n' + payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def burst(bot, api, requests):
+    before = api.connections
+    latencies = []
+
+    async def send(i):
+        start = time.perf_counter()
+        await bot.send_message(chat_id=1, text=f"bench {i}")
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(send(i) for i in range(requests)))
+    return latencies, api.connections - before
+
+
+async def run(label, bot, api, requests, idle, prewarm=None):
+    await bot.initialize()
+    if prewarm is not None:
+        await prewarm()
+    await asyncio.sleep(idle)
+    print(f"{label}")
+    for name in ("burst setelah idle", "burst berikutnya"):
+        latencies, opened = await burst(bot, api, requests)
+        print(f"  {name:18}: p50 {percentile(latencies, 0.5) * 1000:6.1f} ms, "
+              f"maks {max(latencies) * 1000:6.1f} ms, koneksi baru {opened}")
+    await bot.shutdown()
+
+
+async def main(requests, handshake, latency, idle, port):
+    api = FakeBotApi(handshake, latency)
+    server = await asyncio.start_server(api.handle, '127.0.0.1', port)
+    base_url = f"http://127.0.0.1:{port}/bot"
+    base_file_url = f"http://127.0.0.1:{port}/file/bot"
+
+    default_bot = Bot(TOKEN, base_url=base_url, base_file_url=base_file_url,
+                      request=HTTPXRequest(connection_pool_size=256))
+    await run("HTTPXRequest bawaan", default_bot, api, requests, idle)
+
+    transport = TelegramTransport(pool_size=max(requests, 1), http2=False, prewarm_connections=requests)
+    tuned_bot = Bot(TOKEN, base_url=base_url, base_file_url=base_file_url,
+                    request=transport.build_request(transport.pool_size))
+    download_request = transport.build_request(transport.download_pool_size)
+    await run(f"TelegramTransport (keepalive {transport.keepalive_expiry:g}s, prewarm {requests})",
+              tuned_bot, api, requests, idle, lambda: transport.prewarm(tuned_bot, download_request))
+    await download_request.shutdown()
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=20, help='send_message bersamaan per burst')
+    parser.add_argument('--handshake', type=float, default=0.1, help='Jeda setiap koneksi baru (detik)')
+    parser.add_argument('--latency', type=float, default=0.01, help='Waktu proses server per request (detik)')
+    parser.add_argument('--idle', type=float, default=6, help='Jeda idle sebelum burst (detik)')
+    parser.add_argument('--port', type=int, default=8766, help='Port server Bot API palsu')
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.handshake, args.latency, args.idle, args.port))
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark handle_photo dengan N update foto bersamaan.
+
+Membandingkan jalur lama (request OpenAI sinkron yang memblokir event loop,
+disimulasikan di benchmark ini) dengan jalur async (analyze_photo_async). Request ke OpenAI dan Bot API
+disimulasikan dengan latensi tetap sehingga tidak butuh jaringan atau API key.
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_concurrent_photos.py --updates 10 --latency 0.5
+"""
+
+import io
+import os
+import sys
+import time
+import asyncio
+import argparse
+from types import SimpleNamespace
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('PROFILES', 'M15')
+os.environ.setdefault('M15_TELEGRAM_BOT_TOKEN', '123456:BENCHMARK')
+os.environ.setdefault('OPENAI_API_KEY', 'sk-benchmark-0000')
+os.environ.setdefault('STREAM_ANALYSIS', 'false')
+
+from src.openai_client import OpenAIClient
+from src.telegram_bot import TelegramBot
+from src.profiles import load_profiles
+from src.analysis_queue import AnalysisQueue
+from src.result_cache import ResultCache
+from src.phash_cache import PhashCache
+from src.rate_limiter import UserRateLimiter
+from src.telegram_transport import TelegramTransport
+
+
+def fake_response(text):
+    message = SimpleNamespace(content=text)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeCompletions:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def create(self, **kwargs):
+        time.sleep(self.latency)
+        return fake_response("🔮 CRYPTOSCREENER AI 🔮\n\nbenchmark")
+
+    @property
+    def with_raw_response(self):
+        return SimpleNamespace(create=self.create_raw)
+
+    async def create_raw(self, **kwargs):
+        return FakeRawResponse(await self.create(**kwargs))
+
+
+class FakeRawResponse:
+    headers = {}
+
+    def __init__(self, response):
+        self.response = response
+
+    def parse(self):
+        return self.response
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        return fake_response("🔮 CRYPTOSCREENER AI 🔮\n\nbenchmark")
+
+
+class FakeUserManager:
+    def is_allowed(self, user_id):
+        return True
+
+    def is_admin(self, user_id):
+        return False
+
+
+class FakeBot:
+    def __init__(self):
+        self.calls = 0
+        self.chat_actions = 0
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(message_id=1, chat_id=chat_id)
+
+    async def edit_message_text(self, text, chat_id, message_id, **kwargs):
+        self.calls += 1
+        return True
+
+    async def delete_message(self, chat_id, message_id, **kwargs):
+        self.calls += 1
+        return True
+
+    async def send_chat_action(self, chat_id, action, **kwargs):
+        self.chat_actions += 1
+        return True
+
+
+def make_chart_jpeg():
+    buffer = io.BytesIO()
+    Image.new('RGB', (1280, 720), (20, 20, 30)).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+CHART_JPEG = make_chart_jpeg()
+
+
+class FakeFile:
+    async def download_as_bytearray(self):
+        return bytearray(CHART_JPEG)
+
+
+def make_bot(latency, workers):
+    bot = TelegramBot.__new__(TelegramBot)
+    bot.profile = load_profiles()[0]
+    bot.user_manager = FakeUserManager()
+    bot.analysis_queue = AnalysisQueue(workers, max_size=10000)
+    bot.result_cache = ResultCache(max_size=0)
+    bot.phash_cache = PhashCache(max_size=0)
+    bot.rate_limiter = UserRateLimiter()
+    bot.transport = TelegramTransport(http2=False)
+    bot.download_request = None
+    bot.openai_client = OpenAIClient()
+    bot.openai_client.async_client = SimpleNamespace(chat=SimpleNamespace(completions=FakeAsyncCompletions(latency)))
+    return bot
+
+
+def make_update(user_id):
+    async def get_file():
+        return FakeFile()
+
+    photo = SimpleNamespace(get_file=get_file, file_unique_id=f"bench-{user_id}")
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id),
+        effective_chat=SimpleNamespace(id=user_id),
+        message=SimpleNamespace(photo=[photo])
+    )
+
+
+async def run_updates(bot, updates):
+    context = SimpleNamespace(bot=FakeBot(), args=[])
+    start = time.perf_counter()
+    await asyncio.gather(*(bot.handle_photo(make_update(1000 + i), context) for i in range(updates)))
+    await bot.analysis_queue.join()
+    elapsed = time.perf_counter() - start
+    await bot.analysis_queue.stop()
+    return elapsed, context.bot
+
+
+async def main(updates, latency, workers):
+    # Jalur lama: handler memanggil OpenAI secara sinkron di event loop
+    blocking_bot = make_bot(latency, workers)
+    blocking_completions = FakeCompletions(latency)
+
+    async def blocking_analyze(profile, image, on_progress=None):
+        client = blocking_bot.openai_client
+        base64_image, mime_type = client.prepare_image(image)
+        response = blocking_completions.create(
+            model=profile.gpt_id,
+            messages=client._photo_messages(profile, base64_image, mime_type),
+            max_tokens=1500
+        )
+        return client._clean_photo_analysis(profile, response.choices[0].message.content)
+
+    blocking_bot.openai_client.analyze_photo_async = blocking_analyze
+    blocking, _ = await run_updates(blocking_bot, updates)
+
+    # Jalur baru: handler meng-await analyze_photo_async
+    async_bot = make_bot(latency, workers)
+    non_blocking, fake_bot = await run_updates(async_bot, updates)
+
+    print(f"{updates} update foto, {workers} worker, latensi OpenAI {latency:.2f}s")
+    print(f"  sinkron (blocking) : {blocking:.2f}s")
+    print(f"  async              : {non_blocking:.2f}s (OPENAI_MAX_CONCURRENCY {async_bot.openai_client.limiter.max_concurrency})")
+    print(f"  speedup            : {blocking / non_blocking:.1f}x")
+    print(f"  panggilan Bot API  : {fake_bot.calls / updates:.1f} pesan + {fake_bot.chat_actions / updates:.1f} status chat per foto")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--updates', type=int, default=10, help='Jumlah update foto bersamaan')
+    parser.add_argument('--latency', type=float, default=0.5, help='Latensi simulasi OpenAI (detik)')
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah worker antrian (default: sama dengan --updates)')
+    args = parser.parse_args()
+    asyncio.run(main(args.updates, args.latency, args.workers or args.updates))
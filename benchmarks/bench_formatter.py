@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark render HTML hasil analisis dibanding pembersihan dan render parsial lama.
+
+Mengukur dua jalur yang benar-benar berjalan di bot:
+- hasil akhir: _clean_photo_analysis pada teks lengkap dari model;
+- streaming: render_partial_html pada setiap prefix teks, seperti edit
+  pesan progres selama analisis di-stream.
+Implementasi lama disalin ke sini sebagai pembanding. Selain waktu, dicek
+juga apakah hasilnya HTML yang diterima Telegram, untuk teks template yang
+rapi dan teks berisi markdown, <br>, karakter < dan & serta tag tidak tertutup.
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_formatter.py --iterations 2000
+"""
+
+import os
+import re
+import sys
+import html
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('PROFILES', 'M15')
+os.environ.setdefault('M15_TELEGRAM_BOT_TOKEN', '123456:BENCHMARK')
+os.environ.setdefault('OPENAI_API_KEY', 'sk-benchmark-0000')
+
+from src.analysis_formatter import ALLOWED_TAGS
+from src.openai_client import OpenAIClient, ANALYSIS_HEADER
+from src.profiles import load_profiles
+from src.progress_message import render_partial_html, PARTIAL_TAG_PATTERN, PARTIAL_ENTITY_PATTERN
+
+LEGACY_TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9-]*)([^<>]*)>')
+LEGACY_ENTITY_PATTERN = re.compile(r'&(#\d+|#x[0-9a-fA-F]+|[a-zA-Z]+);')
+TAG = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9-]*)[^<>]*>')
+
+
+def legacy_clean(profile, analysis):
+    """_clean_photo_analysis sebelum formatter: hanya membuang disclaimer"""
+    if "unable to provide" in analysis.lower() or "i can guide you" in analysis.lower() or "i can't assist" in analysis.lower() or "i'm sorry" in analysis.lower() or "sorry" in analysis.lower():
+        match = re.search(ANALYSIS_HEADER, analysis)
+        if match:
+            analysis = analysis[match.start():]
+        else:
+            analysis = profile.prompts.PHOTO_FALLBACK_ANALYSIS
+    return analysis
+
+
+def legacy_render_partial(text, cursor=" ▌"):
+    """render_partial_html sebelum formatter: scan per karakter di Python"""
+    partial = PARTIAL_TAG_PATTERN.search(text)
+    if partial:
+        text = text[:partial.start()]
+    partial = PARTIAL_ENTITY_PATTERN.search(text)
+    if partial:
+        text = text[:partial.start()]
+
+    parts = []
+    stack = []
+    position = 0
+    while position < len(text):
+        char = text[position]
+        if char == '<':
+            match = LEGACY_TAG_PATTERN.match(text, position)
+            if match and match.group(2).lower() in ALLOWED_TAGS:
+                closing, name = match.group(1), match.group(2).lower()
+                if not closing:
+                    stack.append(name)
+                    parts.append(match.group(0))
+                elif name in stack:
+                    while stack:
+                        open_name = stack.pop()
+                        parts.append(f"</{open_name}>")
+                        if open_name == name:
+                            break
+                position = match.end()
+                continue
+            parts.append('&lt;')
+        elif char == '&':
+            match = LEGACY_ENTITY_PATTERN.match(text, position)
+            if match:
+                parts.append(match.group(0))
+                position = match.end()
+                continue
+            parts.append('&amp;')
+        elif char == '>':
+            parts.append('&gt;')
+        else:
+            parts.append(char)
+        position += 1
+
+    rendered = ''.join(parts).rstrip() + html.escape(cursor)
+    return rendered + ''.join(f"</{name}>" for name in reversed(stack))
+
+
+def telegram_accepts(rendered):
+    """Perkiraan parser HTML Telegram: hanya tag yang didukung, seimbang, tanpa < lepas"""
+    stack = []
+    for match in TAG.finditer(rendered):
+        name = match.group(2).lower()
+        if name not in ALLOWED_TAGS:
+            return False
+        if not match.group(1):
+            stack.append(name)
+        elif not stack or stack.pop() != name:
+            return False
+    return not stack and '<' not in TAG.sub('', rendered)
+
+
+def sample_texts(profile):
+    """Analisis template yang rapi dan versi dengan kesalahan format yang biasa dibuat model"""
+    clean = profile.prompts.PHOTO_FALLBACK_ANALYSIS
+    messy = clean.replace(
+        "📈 TREND\n", "### 📈 TREND\n"
+    ).replace(
+        "- 🚀 TREND UTAMA:", "- 🚀 **TREND UTAMA:**"
+    ).replace(
+        "⚡ SETUP TRADING\n", "⚡ SETUP TRADING<br>\n- 📊 R:R < 1:2 & volume tipis\n- <b>Catatan: tunggu konfirmasi\n"
+    )
+    return {'rapi': clean, 'berantakan': f"I'm sorry, tapi berikut analisisnya.\n\n{messy}"}
+
+
+def best_of(repeat, iterations, func):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def main(iterations, step):
+    profile = load_profiles()[0]
+    client = OpenAIClient()
+
+    for name, text in sample_texts(profile).items():
+        prefixes = [text[:i] for i in range(step, len(text), step)] + [text]
+
+        old_final = best_of(5, iterations, lambda: legacy_clean(profile, text))
+        new_final = best_of(5, iterations, lambda: client._clean_photo_analysis(profile, text))
+        old_stream = best_of(5, max(1, iterations // 50), lambda: [legacy_render_partial(p) for p in prefixes])
+        new_stream = best_of(5, max(1, iterations // 50), lambda: [render_partial_html(p) for p in prefixes])
+
+        print(f"Teks {name} ({len(text)} karakter, {len(prefixes)} render parsial tiap {step} karakter)")
+        print(f"  hasil akhir   : lama {old_final * 1e6:7.1f} us, baru {new_final * 1e6:7.1f} us")
+        print(f"  streaming     : lama {old_stream * 1e3:7.2f} ms, baru {new_stream * 1e3:7.2f} ms ({old_stream / new_stream:.1f}x lebih cepat)")
+        print(f"  HTML diterima : lama {telegram_accepts(legacy_clean(profile, text))}, baru {telegram_accepts(client._clean_photo_analysis(profile, text))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=2000, help='Jumlah pengulangan per pengukuran')
+    parser.add_argument('--step', type=int, default=40, help='Jumlah karakter baru per render parsial')
+    args = parser.parse_args()
+    main(args.iterations, args.step)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark latensi ekor analisis dengan dan tanpa hedged request.
+
+Model disimulasikan dengan latensi berekor panjang: sebagian besar request
+selesai sekitar --latency detik, tetapi sebagian kecil (--slow-fraction)
+berjalan --slow-factor kali lebih lama. Histogram latensi dihangatkan dulu,
+lalu p50/p95/p99 dibandingkan antara tanpa hedging dan dengan hedging ke
+OPENAI_HEDGE_MODEL (default gpt-4o-mini), beserta jumlah request tambahan
+yang dikirim.
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_hedging.py --requests 400 --latency 0.2
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('OPENAI_API_KEY', 'sk-benchmark-0000')
+os.environ.setdefault('OPENAI_HEDGE_MIN_DELAY', '0')
+os.environ.setdefault('OPENAI_HEDGE_MODEL', 'gpt-4o-mini')
+
+import src.openai_client as openai_client_module
+from src.openai_client import OpenAIClient
+
+
+class FakeRawResponse:
+    headers = {}
+
+    def __init__(self, response):
+        self.response = response
+
+    def parse(self):
+        return self.response
+
+
+class FakeCompletions:
+    def __init__(self, latency, slow_fraction, slow_factor):
+        self.latency = latency
+        self.slow_fraction = slow_fraction
+        self.slow_factor = slow_factor
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        delay = self.latency * random.uniform(0.8, 1.2)
+        if random.random() < self.slow_fraction:
+            delay *= self.slow_factor
+        await asyncio.sleep(delay)
+        message = SimpleNamespace(content="🔮 CRYPTOSCREENER AI 🔮\n\nbenchmark")
+        return FakeRawResponse(SimpleNamespace(choices=[SimpleNamespace(message=message)]))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run(client, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await client._complete('gpt-4o', [], 100)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+async def main(requests, latency, slow_fraction, slow_factor, concurrency):
+    client = OpenAIClient()
+    completions = FakeCompletions(latency, slow_fraction, slow_factor)
+    client.async_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=completions)))
+
+    # Hangatkan histogram latensi tanpa hedging
+    openai_client_module.OPENAI_HEDGE = False
+    await run(client, 100, concurrency)
+
+    completions.calls = 0
+    without = await run(client, requests, concurrency)
+    calls_without = completions.calls
+
+    openai_client_module.OPENAI_HEDGE = True
+    completions.calls = 0
+    with_hedge = await run(client, requests, concurrency)
+    calls_with = completions.calls
+
+    print(f"{requests} request, latensi {latency:.2f}s, {slow_fraction:.0%} request {slow_factor:g}x lebih lambat")
+    for label, values, calls in (("tanpa hedging", without, calls_without), ("dengan hedging", with_hedge, calls_with)):
+        print(f"  {label:15}: p50 {percentile(values, 0.5):.2f}s, p95 {percentile(values, 0.95):.2f}s, "
+              f"p99 {percentile(values, 0.99):.2f}s, {calls} request ke API")
+    print(f"  hedge dikirim {client.hedges}, menang {client.hedge_wins}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=400, help='Jumlah analisis yang diukur')
+    parser.add_argument('--latency', type=float, default=0.2, help='Latensi normal model (detik)')
+    parser.add_argument('--slow-fraction', type=float, default=0.03, help='Fraksi request yang lambat')
+    parser.add_argument('--slow-factor', type=float, default=10, help='Berapa kali lebih lambat request lambat')
+    parser.add_argument('--concurrency', type=int, default=4, help='Analisis bersamaan')
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency, args.slow_fraction, args.slow_factor, args.concurrency))
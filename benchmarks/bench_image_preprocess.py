@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Laporan penghematan preprocessing gambar sebelum upload ke OpenAI.
+
+Untuk setiap gambar ditampilkan ukuran, byte dan estimasi token vision
+sebelum dan sesudah preprocessing, serta waktu proses.
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_image_preprocess.py chart1.jpg chart2.png
+    python benchmarks/bench_image_preprocess.py --max-edge 1024 --format WEBP chart1.jpg
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.image_processor import ImageProcessor
+
+
+def main(paths, max_edge, quality, image_format):
+    processor = ImageProcessor(max_edge, quality, image_format)
+    print(f"{'gambar':<30} {'ukuran':>21} {'KB':>16} {'token':>13} {'ms':>7}")
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        start = time.perf_counter()
+        _, _, report = processor.process(data)
+        elapsed = (time.perf_counter() - start) * 1000
+        before = "x".join(map(str, report['original_size']))
+        after = "x".join(map(str, report['processed_size']))
+        print(
+            f"{os.path.basename(path)[:30]:<30} {before:>10}>{after:<10} "
+            f"{report['original_bytes']/1024:>7.1f}>{report['processed_bytes']/1024:<8.1f} "
+            f"{report['original_tokens']:>6}>{report['processed_tokens']:<6} {elapsed:>7.1f}"
+        )
+    stats = processor.get_stats()
+    print(f"\nTotal {stats['images']} gambar: hemat {stats['bytes_saved']/1024:.1f} KB dan {stats['tokens_saved']} token vision")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('paths', nargs='+', help='File gambar chart')
+    parser.add_argument('--max-edge', type=int, default=1024, help='Sisi terpanjang maksimum (piksel)')
+    parser.add_argument('--quality', type=int, default=85, help='Kualitas JPEG/WebP')
+    parser.add_argument('--format', default='JPEG', choices=['JPEG', 'WEBP'], help='Format output')
+    args = parser.parse_args()
+    main(args.paths, args.max_edge, args.quality, args.format)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark lookup cache phash (near-duplicate chart) dengan banyak entri.
+
+Mengisi PhashCache dengan hash acak lalu mengukur waktu rata-rata dan p99
+lookup untuk hash yang berjarak dekat (hit) dan hash acak (miss).
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_phash_lookup.py --entries 100000 --distance 10
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.phash_cache import PhashCache, HASH_BITS
+
+
+def flip_bits(value, count):
+    for bit in random.sample(range(HASH_BITS), count):
+        value ^= 1 << bit
+    return value
+
+
+def measure(cache, queries):
+    timings = []
+    for value in queries:
+        start = time.perf_counter()
+        cache.get(value, 'bench')
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return sum(timings) / len(timings), timings[int(len(timings) * 0.99)]
+
+
+def main(entries, distance, lookups):
+    cache = PhashCache(max_distance=distance, window=3600, max_size=entries)
+    values = [random.getrandbits(HASH_BITS) for _ in range(entries)]
+    start = time.perf_counter()
+    for value in values:
+        cache.set(value, 'bench', 'analysis')
+    print(f"Insert {entries} entri: {time.perf_counter() - start:.2f}s")
+
+    near = [flip_bits(random.choice(values), random.randint(0, distance)) for _ in range(lookups)]
+    far = [random.getrandbits(HASH_BITS) for _ in range(lookups)]
+    for label, queries in (('hit (jarak <= %d)' % distance, near), ('miss (acak)', far)):
+        mean, p99 = measure(cache, queries)
+        print(f"  {label:<18} rata-rata {mean:.4f} ms, p99 {p99:.4f} ms")
+    stats = cache.get_stats()
+    print(f"  hit {stats['hits']}, miss {stats['misses']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=100000, help='Jumlah entri di cache')
+    parser.add_argument('--distance', type=int, default=10, help='Jarak Hamming maksimum')
+    parser.add_argument('--lookups', type=int, default=10000, help='Jumlah lookup yang diukur')
+    args = parser.parse_args()
+    main(args.entries, args.distance, args.lookups)
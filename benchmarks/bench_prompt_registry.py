@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Laporan token prompt per profil dan waktu menyusun pesan request.
+
+Menampilkan berapa token input yang dipakai setiap profil sebelum gambar
+(dihitung dengan tiktoken jika tersedia, selain itu diperkirakan), lalu
+mengukur waktu menyusun pesan analyze_photo_async dari kerangka yang sudah jadi.
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_prompt_registry.py --iterations 100000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('PROFILES', 'H1,H4,M15')
+for name, token in (('H1', '1:BENCH'), ('H4', '2:BENCH'), ('M15', '3:BENCH')):
+    os.environ.setdefault(f'{name}_TELEGRAM_BOT_TOKEN', token)
+os.environ.setdefault('OPENAI_API_KEY', 'sk-benchmark-0000')
+
+from src.profiles import load_profiles
+
+
+def main(iterations):
+    base64_image = "A" * 200000
+    for profile in load_profiles():
+        prompt_set = profile.prompt_set
+        tokens = prompt_set.token_counts
+        start = time.perf_counter()
+        for _ in range(iterations):
+            prompt_set.photo_messages(prompt_set.image_part(base64_image))
+        elapsed = (time.perf_counter() - start) / iterations * 1e6
+
+        label = "tiktoken" if prompt_set.exact else "perkiraan"
+        print(f"{profile.name} ({profile.profile_name}), token {label}")
+        print(f"  system {tokens['photo_system']}, prompt foto {tokens['photo_prompt']}, "
+              f"total sebelum gambar {tokens['photo_request']}")
+        print(f"  prompt terstruktur {tokens['structured_prompt']}, total sebelum gambar {tokens['structured_request']} "
+              f"(STRUCTURED_OUTPUT)")
+        print(f"  susun pesan analyze_photo_async: {elapsed:.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=100000, help='Jumlah penyusunan pesan yang diukur')
+    args = parser.parse_args()
+    main(args.iterations)
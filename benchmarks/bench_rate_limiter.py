@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark pengecekan rate limit per pengguna dan ukuran memori bucket.
+
+Mensimulasikan banyak pengguna berbeda yang mengirim chart, mengukur waktu
+rata-rata satu pengecekan token bucket, lalu memajukan waktu untuk
+memastikan bucket yang sudah idle dibuang sehingga memori tetap terbatas.
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_rate_limiter.py --users 100000 --requests 1000000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.rate_limiter import UserRateLimiter
+
+
+def main(users, requests, capacity, per_minute):
+    limiter = UserRateLimiter(capacity, per_minute)
+    user_ids = [random.randrange(1, 2 ** 40) for _ in range(users)]
+
+    start = time.perf_counter()
+    for i in range(requests):
+        limiter.acquire(user_ids[i % users])
+    elapsed = (time.perf_counter() - start) / requests * 1e6
+    stats = limiter.get_stats()
+    print(f"{requests} pengecekan untuk {users} user: {elapsed:.2f} us per pengecekan")
+    print(f"  diizinkan {stats['allowed']}, ditolak {stats['limited']}, bucket aktif {stats['buckets']}")
+
+    # Setelah semua bucket penuh kembali, bucket idle harus dibuang
+    later = time.monotonic() + capacity / (per_minute / 60.0) + 1
+    with mock.patch('src.rate_limiter.time.monotonic', return_value=later):
+        limiter.acquire(user_ids[0])
+        print(f"  bucket aktif setelah idle: {limiter.get_stats()['buckets']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=100000, help='Jumlah pengguna berbeda')
+    parser.add_argument('--requests', type=int, default=1000000, help='Jumlah pengecekan')
+    parser.add_argument('--capacity', type=int, default=3, help='Jumlah chart beruntun per pengguna')
+    parser.add_argument('--per-minute', type=float, default=6, help='Isi ulang token per menit')
+    args = parser.parse_args()
+    main(args.users, args.requests, args.capacity, args.per_minute)
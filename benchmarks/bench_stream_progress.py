@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark waktu sampai konten pertama terlihat saat analisis di-stream.
+
+Model disimulasikan mengirim analisis token demi token dengan jeda tetap.
+Membandingkan kapan pengguna pertama kali melihat isi analisis (edit pertama
+pesan "Sedang memproses") dengan kapan analisis lengkap tersedia, lalu
+memastikan setiap potongan HTML parsial memiliki tag yang seimbang.
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_stream_progress.py --tokens 1500 --token-latency 0.02
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import asyncio
+import argparse
+from types import SimpleNamespace
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('PROFILES', 'M15')
+os.environ.setdefault('M15_TELEGRAM_BOT_TOKEN', '123456:BENCHMARK')
+os.environ.setdefault('OPENAI_API_KEY', 'sk-benchmark-0000')
+
+from src.analysis_formatter import to_telegram_html
+from src.openai_client import OpenAIClient
+from src.profiles import load_profiles
+from src.progress_message import ProgressMessage, render_partial_html
+
+TAG = re.compile(r'<(/?)([a-z-]+)[^>]*>')
+
+
+def chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class FakeRawResponse:
+    headers = {}
+
+    def __init__(self, response):
+        self.response = response
+
+    def parse(self):
+        return self.response
+
+
+class FakeStreamingCompletions:
+    def __init__(self, text, tokens, token_latency):
+        size = max(1, len(text) // tokens)
+        self.pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        self.token_latency = token_latency
+
+    async def create(self, **kwargs):
+        assert kwargs.get('stream')
+
+        async def generate():
+            for piece in self.pieces:
+                await asyncio.sleep(self.token_latency)
+                yield chunk(piece)
+        return generate()
+
+    @property
+    def with_raw_response(self):
+        return SimpleNamespace(create=self.create_raw)
+
+    async def create_raw(self, **kwargs):
+        return FakeRawResponse(await self.create(**kwargs))
+
+
+class FakeBot:
+    def __init__(self, start):
+        self.start = start
+        self.first_edit = None
+        self.edits = []
+
+    async def edit_message_text(self, chat_id, message_id, text, **kwargs):
+        if self.first_edit is None:
+            self.first_edit = time.perf_counter() - self.start
+        self.edits.append(text)
+
+
+def balanced(rendered):
+    stack = []
+    for match in TAG.finditer(rendered):
+        if not match.group(1):
+            stack.append(match.group(2))
+        elif not stack or stack.pop() != match.group(2):
+            return False
+    return not stack and '<' not in TAG.sub('', rendered)
+
+
+async def main(tokens, token_latency, interval):
+    profile = load_profiles()[0]
+    text = profile.prompts.PHOTO_FALLBACK_ANALYSIS
+
+    # Setiap prefix teks harus menghasilkan HTML dengan tag seimbang
+    broken = [i for i in range(len(text) + 1) if not balanced(render_partial_html(text[:i]))]
+
+    client = OpenAIClient()
+    client.async_client = SimpleNamespace(chat=SimpleNamespace(completions=FakeStreamingCompletions(text, tokens, token_latency)))
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (1280, 720), (20, 20, 30)).save(buffer, format='JPEG')
+
+    start = time.perf_counter()
+    bot = FakeBot(start)
+    progress = ProgressMessage(bot, chat_id=1, message_id=1, interval=interval)
+    analysis = await client.analyze_photo_async(profile, buffer.getvalue(), on_progress=progress.update)
+    total = time.perf_counter() - start
+
+    print(f"{tokens} token, {token_latency * 1000:.0f} ms per token, edit paling cepat tiap {interval:.1f}s")
+    print(f"  konten pertama     : {bot.first_edit:.2f}s")
+    print(f"  analisis lengkap   : {total:.2f}s")
+    print(f"  jumlah edit        : {len(bot.edits)}")
+    print(f"  hasil akhir utuh   : {analysis == to_telegram_html(text)}")
+    print(f"  prefix HTML rusak  : {len(broken)} dari {len(text) + 1}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tokens', type=int, default=500, help='Jumlah potongan yang di-stream')
+    parser.add_argument('--token-latency', type=float, default=0.02, help='Jeda antar potongan (detik)')
+    parser.add_argument('--interval', type=float, default=1.5, help='Jarak minimum antar edit (detik)')
+    args = parser.parse_args()
+    asyncio.run(main(args.tokens, args.token_latency, args.interval))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Client Telegram palsu untuk menguji server webhook secara lokal.
+
+Menjalankan WebhookServer di localhost lalu mengirim N update foto lewat
+POST seperti server Telegram, dengan secret token yang benar dan yang salah.
+Mengukur latensi sampai update masuk ke update_queue aplikasi, tanpa
+jaringan ke Telegram atau token bot asli.
+
+Jalankan dari direktori bot:
+    python benchmarks/bench_webhook.py --updates 200 --concurrency 20
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import httpx
+from telegram.ext import Application
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.webhook_server import WebhookServer, SECRET_HEADER
+
+SECRET = "benchmark-secret"
+PATH = "/telegram/m15"
+
+
+def make_update(update_id):
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": 1000 + update_id, "type": "private"},
+            "from": {"id": 1000 + update_id, "is_bot": False, "first_name": "Bench"},
+            "photo": [{"file_id": f"file-{update_id}", "file_unique_id": f"uniq-{update_id}", "width": 1280, "height": 720}]
+        }
+    }
+
+
+async def main(updates, concurrency, port):
+    application = Application.builder().token("123456:BENCHMARK").build()
+    server = WebhookServer("127.0.0.1", port, SECRET)
+    server.add_bot(PATH, application)
+    await server.start()
+
+    url = f"http://127.0.0.1:{port}{PATH}"
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient() as client:
+        # Request tanpa secret token yang benar harus ditolak
+        wrong = await client.post(url, json=make_update(0), headers={SECRET_HEADER: "salah"})
+        missing = await client.post(url, json=make_update(0))
+        invalid = await client.post(url, content=b"bukan json", headers={SECRET_HEADER: SECRET})
+
+        async def post(update_id):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(url, json=make_update(update_id), headers={SECRET_HEADER: SECRET})
+                latencies.append(time.perf_counter() - start)
+                return response.status_code
+
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*(post(i) for i in range(1, updates + 1)))
+        elapsed = time.perf_counter() - start
+
+    await server.stop()
+
+    queued = application.update_queue.qsize()
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{updates} update, {concurrency} request bersamaan")
+    print(f"  secret salah / tanpa secret / bukan JSON: {wrong.status_code} / {missing.status_code} / {invalid.status_code}")
+    print(f"  status 200         : {statuses.count(200)}/{updates}, masuk update_queue: {queued}")
+    print(f"  throughput         : {updates / elapsed:.0f} update/detik")
+    print(f"  latensi POST       : p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    print(f"  statistik server   : {server.get_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--updates', type=int, default=200, help='Jumlah update yang dikirim')
+    parser.add_argument('--concurrency', type=int, default=20, help='Jumlah request bersamaan')
+    parser.add_argument('--port', type=int, default=8765, help='Port server webhook lokal')
+    args = parser.parse_args()
+    asyncio.run(main(args.updates, args.concurrency, args.port))
@@ -3,27 +3,24 @@
 Bot Telegram untuk menganalisis gambar grafik trading dengan CryptoScreener AI
 """
 
-import os
+import asyncio
 import logging
-from src.config import TEMP_DIR, BOT_NAME
-from src.telegram_bot import TelegramBot
-
-# Pastikan direktori sementara ada
-os.makedirs(TEMP_DIR, exist_ok=True)
+from src.config import BOT_NAME, PROFILES
+from src.bot_host import BotHost
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 def main():
     """
-    Fungsi utama untuk menjalankan bot
+    Fungsi utama untuk menjalankan semua profil bot dalam satu proses
     """
     try:
-        logger.info(f"Memulai bot {BOT_NAME}...")
-        bot = TelegramBot()
+        logger.info(f"Memulai bot {BOT_NAME} untuk profil {', '.join(PROFILES)}...")
+        host = BotHost()
         
-        # Jalankan bot
-        bot.run()
+        # Jalankan semua bot dalam satu event loop
+        asyncio.run(host.run())
         
     except KeyboardInterrupt:
         logger.info("Bot dihentikan oleh pengguna")
@@ -0,0 +1,100 @@
+"""
+Formatter HTML hasil analisis untuk parse_mode HTML Telegram
+
+Hasil analisis adalah teks template dari model yang dikirim apa adanya dengan
+parse_mode HTML. Model kadang menulis markdown (**tebal**, ### judul), tag yang
+tidak didukung Telegram (mis. <br>), karakter < atau & di tengah teks, atau
+lupa menutup tag. Telegram menolak seluruh pesan jika HTML-nya tidak valid,
+sehingga pengguna hanya melihat pesan error.
+
+Teks di-tokenisasi dalam satu kali scan dengan satu pola yang dikompilasi
+sekali. Teks biasa di antara token disalin apa adanya; hanya token (tag,
+entity, markdown, karakter khusus) yang diproses di Python.
+"""
+
+import re
+import html
+from typing import List, Tuple
+
+# Tag HTML yang didukung Telegram
+ALLOWED_TAGS = {'b', 'strong', 'i', 'em', 'u', 'ins', 's', 'strike', 'del', 'code', 'pre', 'a', 'tg-spoiler', 'span', 'blockquote'}
+
+# Satu pola untuk semua token; urutan alternatif menentukan prioritas pada posisi yang sama.
+# Lookahead di depan membuat mesin regex melompati teks biasa dengan scan karakter cepat
+# alih-alih mencoba setiap alternatif di setiap posisi
+TOKEN_PATTERN = re.compile(
+    r'(?=[<>&*#])(?:'
+    r'<(?P<closing>/?)(?P<name>[a-zA-Z][a-zA-Z0-9-]*)(?P<attrs>[^<>]*)>'
+    r'|(?P<entity>&(?:#\d+|#x[0-9a-fA-F]+|[a-zA-Z]+);)'
+    r'|\*\*(?P<bold>[^*\n]+)\*\*'
+    r'|^#{1,6}[ \t]+(?P<heading>[^\n]+)'
+    r'|(?P<special>[<>&]))',
+    re.MULTILINE
+)
+
+ESCAPES = {'<': '&lt;', '>': '&gt;', '&': '&amp;'}
+
+def render_html(text: str) -> Tuple[str, List[str]]:
+    """
+    Ubah teks analisis menjadi HTML yang diterima Telegram dalam satu kali scan
+
+    Tag yang didukung dipertahankan, tag penutup tanpa pasangan dibuang, <br>
+    menjadi baris baru, tag lain dan karakter < > & yang berdiri sendiri
+    di-escape, serta **tebal** dan ### judul diubah menjadi <b>.
+
+    Args:
+        text: Teks analisis dari model
+
+    Returns:
+        Tuple[str, List[str]]: HTML dan tag yang masih terbuka di akhir teks (urutan buka)
+    """
+    parts: List[str] = []
+    stack: List[str] = []
+    position = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        parts.append(text[position:match.start()])
+        position = match.end()
+
+        name = match.group('name')
+        if name is not None:
+            name = name.lower()
+            if name in ALLOWED_TAGS:
+                if not match.group('closing'):
+                    stack.append(name)
+                    parts.append(match.group(0))
+                elif name in stack:
+                    # Tutup juga tag di dalamnya yang lupa ditutup model
+                    while stack:
+                        open_name = stack.pop()
+                        parts.append(f"</{open_name}>")
+                        if open_name == name:
+                            break
+            elif name == 'br':
+                parts.append('\n')
+            else:
+                parts.append(html.escape(match.group(0), quote=False))
+        elif match.group('entity') is not None:
+            parts.append(match.group('entity'))
+        elif match.group('special') is not None:
+            parts.append(ESCAPES[match.group('special')])
+        else:
+            inner = match.group('bold')
+            if inner is None:
+                inner = match.group('heading').replace('**', '')
+            parts.append(f"<b>{to_telegram_html(inner)}</b>")
+
+    parts.append(text[position:])
+    return ''.join(parts), stack
+
+def to_telegram_html(text: str) -> str:
+    """
+    Render teks analisis lengkap menjadi HTML Telegram, menutup tag yang masih terbuka
+
+    Args:
+        text: Teks analisis dari model
+
+    Returns:
+        str: HTML yang aman dikirim dengan parse_mode HTML
+    """
+    rendered, stack = render_html(text)
+    return rendered + ''.join(f"</{name}>" for name in reversed(stack))
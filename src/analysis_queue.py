@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import traceback
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class QueueFullError(Exception):
+    """Dilempar ketika antrian analisis sudah mencapai kapasitas maksimum"""
+
+class AnalysisQueue:
+    """
+    Antrian analisis dengan worker pool dan penjadwalan round-robin per user
+
+    Setiap user memiliki antrian sendiri. Worker mengambil satu job dari setiap
+    user secara bergiliran, sehingga user yang mengirim banyak chart sekaligus
+    tidak memonopoli kapasitas OpenAI.
+    """
+    def __init__(self, workers: int = 4, max_size: int = 100):
+        """
+        Inisialisasi AnalysisQueue
+
+        Args:
+            workers: Jumlah worker yang memproses job secara bersamaan
+            max_size: Jumlah maksimum job yang menunggu di antrian
+        """
+        self.workers = max(1, workers)
+        self.max_size = max_size
+        self._queues: Dict[int, Deque[Callable[[], Awaitable[None]]]] = {}
+        self._rotation: Deque[int] = deque()  # Urutan giliran user berikutnya
+        self._pending = 0
+        self._running = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task] = []
+        self.processed = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        """Jalankan worker pada event loop yang sedang aktif"""
+        if self._tasks:
+            return
+        self._condition = asyncio.Condition()
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+        logger.info(f"Antrian analisis dimulai dengan {self.workers} worker, kapasitas {self.max_size}")
+
+    async def stop(self) -> None:
+        """Hentikan semua worker"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Antrian analisis dihentikan")
+
+    def is_full(self) -> bool:
+        """Cek apakah antrian sudah penuh"""
+        return self._pending >= self.max_size
+
+    def ensure_capacity(self) -> None:
+        """Lempar QueueFullError jika antrian sudah penuh"""
+        if self.is_full():
+            self.rejected += 1
+            raise QueueFullError(f"Antrian analisis penuh ({self.max_size} job)")
+
+    def _jobs_ahead(self, user_id: int) -> int:
+        """Hitung jumlah job yang akan dijalankan sebelum job baru milik user"""
+        own = len(self._queues.get(user_id, ()))
+        in_rotation = user_id in self._queues
+        ahead = own
+        before_user = True
+        for other_id in self._rotation:
+            if other_id == user_id:
+                before_user = False
+                continue
+            other = len(self._queues[other_id])
+            # User yang mendapat giliran lebih dulu ikut maju satu job pada putaran terakhir
+            ahead += min(other, own + (1 if before_user or not in_rotation else 0))
+        return ahead
+
+    def next_position(self, user_id: int) -> int:
+        """
+        Posisi job baru milik user di antrian
+
+        Returns:
+            int: 0 jika ada worker kosong, selain itu posisi antrian (mulai dari 1)
+        """
+        # Job yang sudah menunggu akan lebih dulu mengisi worker yang kosong
+        idle_workers = self.workers - self._running
+        return max(0, self._jobs_ahead(user_id) + 1 - idle_workers)
+
+    async def submit(self, user_id: int, job: Callable[[], Awaitable[None]]) -> int:
+        """
+        Masukkan job ke antrian user
+
+        Args:
+            user_id: ID pengguna Telegram
+            job: Fungsi async tanpa argumen yang menjalankan analisis
+
+        Returns:
+            int: Posisi job di antrian (lihat next_position)
+        """
+        self.ensure_capacity()
+        if self._condition is None:
+            self.start()
+
+        position = self.next_position(user_id)
+        async with self._condition:
+            if user_id not in self._queues:
+                self._queues[user_id] = deque()
+                self._rotation.append(user_id)
+            self._queues[user_id].append(job)
+            self._pending += 1
+            self._condition.notify_all()
+
+        logger.debug(f"Job user {user_id} masuk antrian pada posisi {position}")
+        return position
+
+    def _next_job(self) -> Callable[[], Awaitable[None]]:
+        """Ambil job berikutnya secara round-robin antar user"""
+        user_id = self._rotation.popleft()
+        user_queue = self._queues[user_id]
+        job = user_queue.popleft()
+        if user_queue:
+            self._rotation.append(user_id)
+        else:
+            del self._queues[user_id]
+        self._pending -= 1
+        return job
+
+    async def _worker(self, index: int) -> None:
+        """Loop worker yang menjalankan job dari antrian"""
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._pending > 0)
+                job = self._next_job()
+                self._running += 1
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error pada worker analisis {index}: {str(e)}")
+                logger.error(f"Traceback: {traceback.format_exc()}")
+            finally:
+                async with self._condition:
+                    self._running -= 1
+                    self.processed += 1
+                    self._condition.notify_all()
+
+    async def join(self) -> None:
+        """Tunggu sampai semua job di antrian selesai diproses"""
+        if self._condition is None:
+            return
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._pending == 0 and self._running == 0)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Dapatkan statistik antrian
+
+        Returns:
+            dict: Jumlah worker, job menunggu, job berjalan, selesai dan ditolak
+        """
+        return {
+            'workers': self.workers,
+            'max_size': self.max_size,
+            'pending': self._pending,
+            'running': self._running,
+            'users': len(self._queues),
+            'processed': self.processed,
+            'rejected': self.rejected
+        }
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import signal
+from src.config import (
+    DEFAULT_ADMIN_IDS,
+    USERS_FILE,
+    USERS_STORAGE,
+    USERS_DB,
+    USERS_SAVE_DELAY,
+    USERS_RELOAD_INTERVAL,
+    ANALYSIS_WORKERS,
+    ANALYSIS_QUEUE_MAX_SIZE,
+    RATE_LIMIT_CAPACITY,
+    RATE_LIMIT_PER_MINUTE,
+    RATE_LIMIT_ADMIN_CAPACITY,
+    RATE_LIMIT_ADMIN_PER_MINUTE,
+    RESULT_CACHE_SIZE,
+    RESULT_CACHE_TTL,
+    PHASH_MAX_DISTANCE,
+    PHASH_WINDOW,
+    PHASH_CACHE_SIZE,
+    TELEGRAM_POOL_SIZE,
+    TELEGRAM_DOWNLOAD_POOL_SIZE,
+    TELEGRAM_HTTP2,
+    TELEGRAM_KEEPALIVE_EXPIRY,
+    TELEGRAM_PREWARM_CONNECTIONS,
+    UPDATE_MODE,
+    WEBHOOK_LISTEN,
+    WEBHOOK_PORT,
+    WEBHOOK_URL,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET_TOKEN
+)
+from src.openai_client import OpenAIClient
+from src.user_manager import UserManager
+from src.user_storage import create_user_storage
+from src.analysis_queue import AnalysisQueue
+from src.result_cache import ResultCache
+from src.phash_cache import PhashCache
+from src.rate_limiter import UserRateLimiter
+from src.telegram_transport import TelegramTransport
+from src.profiles import load_profiles
+from src.telegram_bot import TelegramBot
+
+logger = logging.getLogger(__name__)
+
+class BotHost:
+    """
+    Menjalankan semua profil (H1, H4, M15) dalam satu proses dan satu event loop.
+    OpenAI client, antrian analisis, cache dan daftar pengguna dibuat sekali dan
+    dipakai bersama oleh bot Telegram setiap profil.
+    """
+    def __init__(self, profiles=None):
+        self.openai_client = OpenAIClient()
+        self.user_manager = UserManager(
+            USERS_FILE,
+            USERS_SAVE_DELAY,
+            storage=create_user_storage(USERS_STORAGE, USERS_FILE, USERS_DB)
+        )
+        self.analysis_queue = AnalysisQueue(ANALYSIS_WORKERS, ANALYSIS_QUEUE_MAX_SIZE)
+        self.result_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL)
+        self.phash_cache = PhashCache(PHASH_MAX_DISTANCE, PHASH_WINDOW, PHASH_CACHE_SIZE)
+        self.rate_limiter = UserRateLimiter(
+            RATE_LIMIT_CAPACITY,
+            RATE_LIMIT_PER_MINUTE,
+            RATE_LIMIT_ADMIN_CAPACITY,
+            RATE_LIMIT_ADMIN_PER_MINUTE
+        )
+        # Pengaturan koneksi Bot API yang dipakai semua bot profil
+        self.telegram_transport = TelegramTransport(
+            TELEGRAM_POOL_SIZE,
+            TELEGRAM_DOWNLOAD_POOL_SIZE,
+            TELEGRAM_HTTP2,
+            TELEGRAM_KEEPALIVE_EXPIRY,
+            TELEGRAM_PREWARM_CONNECTIONS
+        )
+
+        # Tambahkan admin default dari konfigurasi
+        for admin_id in DEFAULT_ADMIN_IDS:
+            self.user_manager.add_admin(admin_id)
+
+        self.profiles = profiles if profiles is not None else load_profiles()
+        self.bots = [TelegramBot(profile, self) for profile in self.profiles]
+        self.webhook_server = None
+        if UPDATE_MODE == 'webhook':
+            # Import di sini agar mode polling tidak membutuhkan tornado
+            from src.webhook_server import WebhookServer
+            self.webhook_server = WebhookServer(WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_SECRET_TOKEN)
+            for bot in self.bots:
+                self.webhook_server.add_bot(self.webhook_path(bot.profile), bot.application)
+        self._stop_event = None
+
+        logger.info(f"Host bot diinisialisasi dengan {len(self.bots)} profil: {', '.join(p.name for p in self.profiles)}")
+
+    def webhook_path(self, profile):
+        """Path webhook untuk profil, mis. /telegram/m15"""
+        return f"{WEBHOOK_PATH.rstrip('/')}/{profile.name.lower()}"
+
+    def stop(self):
+        """Minta host berhenti (aman dipanggil dari signal handler)"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def _install_signal_handlers(self):
+        """Hentikan host dengan rapi saat menerima SIGINT/SIGTERM"""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows tidak mendukung add_signal_handler; Ctrl+C tetap memunculkan KeyboardInterrupt
+                pass
+
+    async def run(self):
+        """Menjalankan semua bot sampai dihentikan"""
+        self._stop_event = asyncio.Event()
+        self._install_signal_handlers()
+
+        self.analysis_queue.start()
+        self.openai_client.health_monitor.start()
+        self.user_manager.start_watching(USERS_RELOAD_INTERVAL)
+        started = []
+        try:
+            for bot in self.bots:
+                await bot.start()
+                started.append(bot)
+            if self.webhook_server is not None:
+                # Server harus sudah mendengarkan sebelum Telegram mulai mengirim update
+                await self.webhook_server.start()
+                for bot in self.bots:
+                    await bot.set_webhook(WEBHOOK_URL + self.webhook_path(bot.profile), WEBHOOK_SECRET_TOKEN)
+            else:
+                for bot in self.bots:
+                    await bot.start_polling()
+            logger.info("Semua bot berjalan, tekan Ctrl+C untuk berhenti")
+            await self._stop_event.wait()
+        finally:
+            # Webhook tidak dihapus saat berhenti: replika lain mungkin masih melayani URL yang sama
+            if self.webhook_server is not None:
+                await self.webhook_server.stop()
+            for bot in reversed(started):
+                try:
+                    await bot.stop()
+                except Exception as e:
+                    logger.error(f"Error saat menghentikan {bot.profile.bot_name}: {str(e)}")
+            await self.analysis_queue.stop()
+            await self.openai_client.health_monitor.stop()
+            await self.user_manager.stop_watching()
+            # Tulis perubahan daftar pengguna yang masih tertunda
+            await self.user_manager.flush()
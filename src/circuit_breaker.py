@@ -0,0 +1,143 @@
+import time
+import logging
+from typing import Any, Dict, Optional
+import openai
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """Dilempar ketika circuit breaker sebuah model sedang terbuka"""
+
+class CircuitBreaker:
+    """
+    Circuit breaker per model id untuk GPT kustom
+
+    Setelah sejumlah kegagalan berturut-turut circuit terbuka dan model
+    dilewati selama masa cooldown, sehingga request langsung memakai model
+    fallback. Setelah cooldown, satu request dijadikan probe (half-open):
+    jika berhasil circuit tertutup kembali, jika gagal circuit terbuka lagi.
+    """
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 300.0):
+        """
+        Inisialisasi CircuitBreaker
+
+        Args:
+            failure_threshold: Jumlah kegagalan berturut-turut sebelum circuit terbuka
+            cooldown: Lama circuit terbuka sebelum probe berikutnya (detik)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self._models: Dict[str, Dict[str, Any]] = {}
+
+    def _get(self, model: str) -> Dict[str, Any]:
+        """Dapatkan status model, buat baru jika belum ada"""
+        if model not in self._models:
+            self._models[model] = {
+                'state': CLOSED,
+                'failures': 0,
+                'opened_at': None,
+                'probe_in_flight': False,
+                'trips': 0,
+                'last_error': None
+            }
+        return self._models[model]
+
+    def _transition(self, model: str, status: Dict[str, Any], state: str) -> None:
+        """Ubah state circuit dan catat transisinya di log"""
+        if status['state'] == state:
+            return
+        logger.warning(f"Circuit breaker model {model}: {status['state']} -> {state}")
+        status['state'] = state
+
+    def allow(self, model: str) -> bool:
+        """
+        Cek apakah request ke model boleh dikirim
+
+        Args:
+            model: ID model atau GPT kustom
+
+        Returns:
+            bool: True jika circuit tertutup atau request ini menjadi probe half-open
+        """
+        status = self._get(model)
+        if status['state'] == CLOSED:
+            return True
+        if status['state'] == OPEN:
+            if time.monotonic() - status['opened_at'] < self.cooldown:
+                return False
+            self._transition(model, status, HALF_OPEN)
+        # Half-open: hanya satu probe yang boleh berjalan
+        if status['probe_in_flight']:
+            return False
+        status['probe_in_flight'] = True
+        logger.info(f"Circuit breaker model {model}: mengirim probe")
+        return True
+
+    def record_success(self, model: str) -> None:
+        """Catat request yang berhasil; probe yang berhasil menutup circuit"""
+        status = self._get(model)
+        status['failures'] = 0
+        status['probe_in_flight'] = False
+        status['opened_at'] = None
+        self._transition(model, status, CLOSED)
+
+    def release_probe(self, model: str) -> None:
+        """
+        Lepas probe half-open yang selesai tanpa hasil yang menentukan
+
+        Dipanggil saat request probe berakhir tanpa record_success atau
+        record_failure, mis. karena 429, penolakan model atau task dibatalkan,
+        sehingga request berikutnya bisa menjadi probe. State tidak berubah.
+        """
+        status = self._get(model)
+        if status['state'] == HALF_OPEN:
+            status['probe_in_flight'] = False
+
+    def record_failure(self, model: str, error: Optional[Exception] = None) -> None:
+        """
+        Catat request yang gagal
+
+        Args:
+            model: ID model atau GPT kustom
+            error: Exception dari request; rate limit tidak dihitung sebagai kegagalan model
+        """
+        status = self._get(model)
+        status['probe_in_flight'] = False
+        if isinstance(error, openai.RateLimitError):
+            return
+        status['failures'] += 1
+        status['last_error'] = str(error) if error else None
+        if status['state'] == HALF_OPEN or status['failures'] >= self.failure_threshold:
+            if status['state'] != OPEN:
+                status['trips'] += 1
+            status['opened_at'] = time.monotonic()
+            self._transition(model, status, OPEN)
+
+    def get_state(self, model: str) -> str:
+        """Dapatkan state circuit untuk model"""
+        return self._get(model)['state']
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Dapatkan statistik circuit breaker semua model
+
+        Returns:
+            dict: State, jumlah kegagalan, jumlah trip dan sisa cooldown per model
+        """
+        stats = {}
+        for model, status in self._models.items():
+            remaining = None
+            if status['state'] == OPEN:
+                remaining = max(0.0, self.cooldown - (time.monotonic() - status['opened_at']))
+            stats[model] = {
+                'state': status['state'],
+                'failures': status['failures'],
+                'trips': status['trips'],
+                'cooldown_remaining': remaining,
+                'last_error': status['last_error']
+            }
+        return stats
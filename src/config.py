@@ -0,0 +1,193 @@
+import os
+import re
+import logging
+from dotenv import load_dotenv
+
+# Memuat variabel lingkungan dari file .env
+load_dotenv('config/.env')
+
+# Konfigurasi logging
+log_level = os.getenv('LOG_LEVEL', 'INFO')
+numeric_level = getattr(logging, log_level.upper(), None)
+if not isinstance(numeric_level, int):
+    numeric_level = logging.INFO
+
+logging.basicConfig(
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    level=numeric_level
+)
+
+logger = logging.getLogger(__name__)
+
+# Profil timeframe yang dijalankan bersama dalam satu proses (gunakan koma sebagai pemisah)
+PROFILES = [name.strip().upper() for name in os.getenv('PROFILES', 'H1,H4,M15').split(',') if name.strip()]
+if not PROFILES:
+    logger.error("PROFILES kosong. Isi minimal satu profil (H1, H4, M15) di file .env")
+    raise ValueError("PROFILES kosong")
+
+# Token bot, ID GPT kustom dan nama bot per profil, mis. M15_TELEGRAM_BOT_TOKEN, M15_GPT_ID, M15_BOT_NAME
+PROFILE_SETTINGS = {}
+for profile_name in PROFILES:
+    profile_token = os.getenv(f'{profile_name}_TELEGRAM_BOT_TOKEN')
+    if not profile_token:
+        logger.error(f"{profile_name}_TELEGRAM_BOT_TOKEN tidak ditemukan. Pastikan Anda menyetelnya di file .env")
+        raise ValueError(f"{profile_name}_TELEGRAM_BOT_TOKEN tidak ditemukan")
+    PROFILE_SETTINGS[profile_name] = {
+        'token': profile_token,
+        'gpt_id': os.getenv(f'{profile_name}_GPT_ID'),
+        'bot_name': os.getenv(f'{profile_name}_BOT_NAME')
+    }
+
+# Satu token hanya boleh dipakai satu profil; dua Application yang polling token yang sama saling bentrok
+profile_tokens = [settings['token'] for settings in PROFILE_SETTINGS.values()]
+if len(set(profile_tokens)) != len(profile_tokens):
+    logger.error("Token bot yang sama dipakai oleh lebih dari satu profil. Setiap profil membutuhkan bot sendiri")
+    raise ValueError("Token bot duplikat antar profil")
+
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+if not OPENAI_API_KEY:
+    logger.error("OPENAI_API_KEY tidak ditemukan. Pastikan Anda menyetelnya di file .env")
+    raise ValueError("OPENAI_API_KEY tidak ditemukan")
+
+# Model OpenAI yang digunakan
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o')
+
+# Gunakan mode fallback jika terjadi error dengan GPT kustom
+USE_FALLBACK = os.getenv('USE_FALLBACK', 'true').lower() == 'true'
+logger.info(f"Mode fallback: {'Aktif' if USE_FALLBACK else 'Nonaktif'}")
+
+# Jumlah kegagalan GPT kustom berturut-turut sebelum langsung memakai fallback
+CIRCUIT_BREAKER_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_THRESHOLD', '3'))
+
+# Lama GPT kustom dilewati sebelum dicoba lagi dengan probe (detik)
+CIRCUIT_BREAKER_COOLDOWN = float(os.getenv('CIRCUIT_BREAKER_COOLDOWN', '300'))
+
+# Batas atas request OpenAI bersamaan untuk semua profil. Batas efektif turun-naik otomatis (AIMD)
+# mengikuti 429 dan header x-ratelimit-remaining-*; request di atas batas menunggu giliran
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '8'))
+
+# Berapa kali request yang kena 429 dicoba lagi setelah retry-after sebelum error diteruskan
+OPENAI_RATE_LIMIT_RETRIES = int(os.getenv('OPENAI_RATE_LIMIT_RETRIES', '3'))
+
+# Percobaan ulang untuk error sementara (koneksi, 408, 409, 5xx) dengan exponential backoff dan jitter (detik)
+OPENAI_MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', '2'))
+OPENAI_RETRY_BASE_DELAY = float(os.getenv('OPENAI_RETRY_BASE_DELAY', '0.5'))
+OPENAI_RETRY_MAX_DELAY = float(os.getenv('OPENAI_RETRY_MAX_DELAY', '8'))
+
+# Hedging: jika model belum menjawab setelah persentil latensinya, kirim request cadangan ke
+# OPENAI_HEDGE_MODEL dan pakai yang lebih dulu selesai. Opt-in: hanya jalan jika OPENAI_HEDGE=true
+# dan OPENAI_HEDGE_MODEL diisi model lain yang lebih murah (mis. gpt-4o-mini); request ke model
+# yang sama tidak di-hedge. OPENAI_HEDGE_MIN_DELAY adalah waktu tunggu minimum (detik)
+OPENAI_HEDGE = os.getenv('OPENAI_HEDGE', 'false').lower() == 'true'
+OPENAI_HEDGE_PERCENTILE = float(os.getenv('OPENAI_HEDGE_PERCENTILE', '0.95'))
+OPENAI_HEDGE_MIN_DELAY = float(os.getenv('OPENAI_HEDGE_MIN_DELAY', '2'))
+OPENAI_HEDGE_MODEL = os.getenv('OPENAI_HEDGE_MODEL', '')
+
+# Interval pengecekan kesehatan API OpenAI di background (detik)
+HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', '60'))
+
+# Preprocessing gambar sebelum dikirim ke OpenAI (orientasi, metadata, ukuran, kualitas).
+# Sisi terpanjang 1024 membuat chart 1280x720 muat di 2x2 tile vision (765 token, bukan 1105)
+IMAGE_PREPROCESS = os.getenv('IMAGE_PREPROCESS', 'true').lower() == 'true'
+IMAGE_MAX_EDGE = int(os.getenv('IMAGE_MAX_EDGE', '1024'))
+IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', '85'))
+IMAGE_FORMAT = os.getenv('IMAGE_FORMAT', 'JPEG').upper()
+
+# Cache hasil analisis per foto (file_unique_id) dan profil: jumlah entri dan umur maksimum (detik)
+RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', '1000'))
+RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL', '3600'))
+
+# Cache chart yang hampir sama (perceptual hash): jarak Hamming maksimum dari hash 256-bit, window waktu (detik)
+# dan jumlah entri. Re-encode dan resize chart yang sama berjarak < 10, chart berbeda biasanya > 25.
+# Lookup tetap di bawah 1 ms untuk 100rb entri sampai jarak 15; set PHASH_CACHE_SIZE=0 untuk menonaktifkan
+PHASH_MAX_DISTANCE = int(os.getenv('PHASH_MAX_DISTANCE', '10'))
+PHASH_WINDOW = float(os.getenv('PHASH_WINDOW', '300'))
+PHASH_CACHE_SIZE = int(os.getenv('PHASH_CACHE_SIZE', '100000'))
+
+# Jumlah worker antrian analisis (request OpenAI yang berjalan bersamaan)
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', '4'))
+
+# Jumlah maksimum chart yang boleh menunggu di antrian analisis
+ANALYSIS_QUEUE_MAX_SIZE = int(os.getenv('ANALYSIS_QUEUE_MAX_SIZE', '100'))
+
+# Koneksi HTTP ke Bot API per bot: ukuran pool pengiriman dan download file, HTTP/2 (butuh paket h2),
+# lama koneksi idle dipertahankan (detik) dan jumlah koneksi yang dibuka saat startup (0 = tanpa prewarm)
+TELEGRAM_POOL_SIZE = int(os.getenv('TELEGRAM_POOL_SIZE', '32'))
+TELEGRAM_DOWNLOAD_POOL_SIZE = int(os.getenv('TELEGRAM_DOWNLOAD_POOL_SIZE', '8'))
+TELEGRAM_HTTP2 = os.getenv('TELEGRAM_HTTP2', 'true').lower() == 'true'
+TELEGRAM_KEEPALIVE_EXPIRY = float(os.getenv('TELEGRAM_KEEPALIVE_EXPIRY', '60'))
+TELEGRAM_PREWARM_CONNECTIONS = int(os.getenv('TELEGRAM_PREWARM_CONNECTIONS', '2'))
+
+# Jumlah chat yang updatenya diproses bersamaan per bot profil; update dari satu chat tetap berurutan.
+# 1 = semua update diproses satu per satu seperti bawaan python-telegram-bot
+UPDATE_CONCURRENCY = max(1, int(os.getenv('UPDATE_CONCURRENCY', '16')))
+
+# Rate limit chart per pengguna (token bucket): jumlah chart beruntun dan isi ulang per menit.
+# Admin punya batas sendiri; set *_PER_MINUTE=0 untuk tanpa batas
+RATE_LIMIT_CAPACITY = int(os.getenv('RATE_LIMIT_CAPACITY', '3'))
+RATE_LIMIT_PER_MINUTE = float(os.getenv('RATE_LIMIT_PER_MINUTE', '6'))
+RATE_LIMIT_ADMIN_CAPACITY = int(os.getenv('RATE_LIMIT_ADMIN_CAPACITY', '10'))
+RATE_LIMIT_ADMIN_PER_MINUTE = float(os.getenv('RATE_LIMIT_ADMIN_PER_MINUTE', '30'))
+
+# Tampilkan analisis secara bertahap dengan mengedit pesan "Sedang memproses" selama respons di-stream.
+# Interval adalah jarak minimum antar edit (detik) agar tidak terkena limit edit Telegram
+STREAM_ANALYSIS = os.getenv('STREAM_ANALYSIS', 'true').lower() == 'true'
+STREAM_EDIT_INTERVAL = float(os.getenv('STREAM_EDIT_INTERVAL', '1.5'))
+
+# Minta analisis foto sebagai JSON dengan skema (response_format) lalu render template profil secara lokal.
+# Token output jauh lebih sedikit dan format selalu sama; analisis tidak di-stream dalam mode ini
+STRUCTURED_OUTPUT = os.getenv('STRUCTURED_OUTPUT', 'false').lower() == 'true'
+
+# Cara menerima update Telegram: 'polling' (getUpdates) atau 'webhook' (Telegram mengirim POST ke server bot)
+UPDATE_MODE = os.getenv('UPDATE_MODE', 'polling').lower()
+if UPDATE_MODE not in ('polling', 'webhook'):
+    logger.error(f"UPDATE_MODE tidak valid: {UPDATE_MODE}. Gunakan 'polling' atau 'webhook'")
+    raise ValueError(f"UPDATE_MODE tidak valid: {UPDATE_MODE}")
+
+# Webhook: alamat dan port server lokal, URL publik (HTTPS) yang dipanggil Telegram, prefix path
+# dan secret token yang dikirim Telegram di header X-Telegram-Bot-Api-Secret-Token.
+# Setiap profil mendapat path sendiri, mis. https://bot.example.com/telegram/m15
+WEBHOOK_LISTEN = os.getenv('WEBHOOK_LISTEN', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8443'))
+WEBHOOK_URL = os.getenv('WEBHOOK_URL', '').rstrip('/')
+WEBHOOK_PATH = '/' + os.getenv('WEBHOOK_PATH', '/telegram').strip('/')
+WEBHOOK_SECRET_TOKEN = os.getenv('WEBHOOK_SECRET_TOKEN', '')
+if UPDATE_MODE == 'webhook':
+    if not WEBHOOK_URL:
+        logger.error("WEBHOOK_URL tidak ditemukan. Mode webhook membutuhkan URL publik HTTPS")
+        raise ValueError("WEBHOOK_URL tidak ditemukan")
+    # Secret token wajib dan harus sama di semua replika di belakang load balancer
+    if not re.fullmatch(r'[A-Za-z0-9_-]{1,256}', WEBHOOK_SECRET_TOKEN):
+        logger.error("WEBHOOK_SECRET_TOKEN wajib diisi (1-256 karakter A-Z, a-z, 0-9, _ atau -) dalam mode webhook")
+        raise ValueError("WEBHOOK_SECRET_TOKEN tidak valid")
+
+# File untuk menyimpan data user
+USERS_FILE = os.getenv('USERS_FILE', 'config/users.json')
+
+# Backend penyimpanan daftar pengguna: 'json' (USERS_FILE) atau 'sqlite' (USERS_DB, mode WAL).
+# Saat pertama memakai sqlite, isi USERS_FILE dimigrasikan otomatis ke database
+USERS_STORAGE = os.getenv('USERS_STORAGE', 'json').lower()
+USERS_DB = os.getenv('USERS_DB', 'config/users.db')
+
+# Jeda sebelum perubahan daftar pengguna ditulis ke file; perubahan berdekatan digabung jadi satu penulisan (detik)
+USERS_SAVE_DELAY = float(os.getenv('USERS_SAVE_DELAY', '1.0'))
+
+# Jarak antar pengecekan perubahan daftar pengguna dari luar proses (detik), 0 untuk menonaktifkan
+USERS_RELOAD_INTERVAL = float(os.getenv('USERS_RELOAD_INTERVAL', '5.0'))
+
+# Admin ID default (gunakan koma sebagai pemisah jika ada lebih dari satu)
+DEFAULT_ADMIN_IDS = os.getenv('DEFAULT_ADMIN_IDS', '')
+try:
+    DEFAULT_ADMIN_IDS = [int(admin_id.strip()) for admin_id in DEFAULT_ADMIN_IDS.split(',') if admin_id.strip()]
+    if DEFAULT_ADMIN_IDS:
+        logger.info(f"Default admin IDs: {DEFAULT_ADMIN_IDS}")
+    else:
+        logger.warning("No default admin IDs configured. Add DEFAULT_ADMIN_IDS in .env file.")
+except Exception as e:
+    logger.error(f"Error parsing DEFAULT_ADMIN_IDS: {str(e)}")
+    DEFAULT_ADMIN_IDS = []
+
+# Nama bot
+BOT_NAME = os.getenv('BOT_NAME', 'CryptoScreener AI')
+
+logger.info("Konfigurasi dimuat dengan sukses") 
\ No newline at end of file
@@ -0,0 +1,158 @@
+import asyncio
+import time
+import logging
+from typing import Any, Dict, Optional
+import openai
+
+logger = logging.getLogger(__name__)
+
+class HealthMonitor:
+    """
+    Memantau validitas API key dan keterjangkauan API OpenAI di background
+
+    Pengecekan dilakukan berkala dengan endpoint models (tanpa biaya token)
+    dan hasilnya disimpan, sehingga request analisis cukup membaca status
+    terakhir tanpa melakukan probe sendiri.
+    """
+    def __init__(self, client: openai.AsyncOpenAI, interval: float = 60.0):
+        """
+        Inisialisasi HealthMonitor
+
+        Args:
+            client: Client AsyncOpenAI yang dipakai untuk pengecekan
+            interval: Jeda antar pengecekan dalam detik
+        """
+        self.client = client
+        self.interval = interval
+        self.key_valid: Optional[bool] = None  # None = belum pernah dicek
+        self.reachable: Optional[bool] = None
+        self.last_error: Optional[str] = None
+        self.last_check: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Jalankan pengecekan berkala pada event loop yang sedang aktif"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Health monitor OpenAI dimulai dengan interval {self.interval:.0f} detik")
+
+    async def stop(self) -> None:
+        """Hentikan pengecekan berkala"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            logger.info("Health monitor OpenAI dihentikan")
+
+    async def _run(self) -> None:
+        """Loop pengecekan; status tidak sehat dicek ulang lebih cepat, error request membangunkan loop"""
+        self._wake = asyncio.Event()
+        while True:
+            self._wake.clear()
+            await self.check()
+            delay = self.interval if self.is_healthy() else min(self.interval, 10.0)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def check(self) -> bool:
+        """
+        Cek API key dan koneksi ke OpenAI sekali
+
+        Returns:
+            bool: True jika API key valid dan API dapat dijangkau
+        """
+        try:
+            await self.client.models.list()
+            self._set_state(True, True, None)
+        except Exception as e:
+            if not self._apply_error(e):
+                # 429, 5xx, timeout, dsb. tidak membuktikan key atau koneksi bermasalah
+                logger.warning(f"Pengecekan kesehatan OpenAI gagal, status sebelumnya dipertahankan: {str(e)}")
+        self.last_check = time.time()
+        return self.is_healthy()
+
+    def record_error(self, error: Exception) -> None:
+        """
+        Perbarui status dari error request OpenAI (probe maupun request analisis)
+
+        Timeout tidak dihitung: satu request vision yang lambat bukan tanda API
+        tidak terjangkau. Jika status berubah menjadi tidak sehat, loop monitor
+        langsung mengecek ulang sehingga request lain tidak ikut gagal cepat
+        sampai pengecekan berkala berikutnya.
+
+        Args:
+            error: Exception yang dilempar oleh client OpenAI
+        """
+        was_healthy = self.is_healthy()
+        self._apply_error(error)
+        if was_healthy and not self.is_healthy() and self._wake is not None:
+            self._wake.set()
+
+    def _apply_error(self, error: Exception) -> bool:
+        """
+        Ubah status hanya untuk error yang membuktikan masalah key atau koneksi
+
+        AuthenticationError berarti API key tidak valid; APIConnectionError selain
+        timeout berarti API tidak terjangkau. Error lain (mis. PermissionDeniedError
+        untuk satu model, 429 atau 5xx) tidak mengubah status.
+
+        Args:
+            error: Exception yang dilempar oleh client OpenAI
+
+        Returns:
+            bool: True jika status diperbarui dari error ini
+        """
+        if isinstance(error, openai.AuthenticationError):
+            self._set_state(False, True, str(error))
+            return True
+        if isinstance(error, openai.APIConnectionError) and not isinstance(error, openai.APITimeoutError):
+            self._set_state(self.key_valid, False, str(error))
+            return True
+        return False
+
+    def _set_state(self, key_valid: Optional[bool], reachable: Optional[bool], error: Optional[str]) -> None:
+        """Simpan status baru dan log jika status berubah"""
+        was_healthy = self.is_healthy()
+        self.key_valid = key_valid
+        self.reachable = reachable
+        self.last_error = error
+        if self.is_healthy() != was_healthy:
+            if self.is_healthy():
+                logger.info("OpenAI API kembali sehat")
+            else:
+                logger.error(f"OpenAI API tidak sehat: {error}")
+
+    def is_healthy(self) -> bool:
+        """Cek status terakhir; status yang belum diketahui dianggap sehat"""
+        return self.key_valid is not False and self.reachable is not False
+
+    def ensure_healthy(self) -> None:
+        """
+        Gagal cepat berdasarkan status terakhir tanpa request ke OpenAI
+
+        Raises:
+            ValueError: Jika API key tidak valid
+            ConnectionError: Jika API OpenAI tidak dapat dijangkau
+        """
+        if self.key_valid is False:
+            raise ValueError(f"API key tidak valid: {self.last_error}")
+        if self.reachable is False:
+            raise ConnectionError(f"OpenAI API tidak dapat dijangkau: {self.last_error}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan status kesehatan terakhir
+
+        Returns:
+            dict: Status API key, koneksi, error terakhir dan umur pengecekan
+        """
+        return {
+            'healthy': self.is_healthy(),
+            'key_valid': self.key_valid,
+            'reachable': self.reachable,
+            'last_error': self.last_error,
+            'last_check_age': time.time() - self.last_check if self.last_check else None
+        }
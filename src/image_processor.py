@@ -0,0 +1,134 @@
+import io
+import math
+import logging
+from typing import Any, Dict, Tuple
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Format output Pillow dan MIME type untuk data URL
+FORMATS = {
+    'JPEG': 'image/jpeg',
+    'WEBP': 'image/webp'
+}
+
+# Tag EXIF untuk orientasi gambar
+ORIENTATION_TAG = 0x0112
+
+def estimate_vision_tokens(width: int, height: int) -> int:
+    """
+    Estimasi token input vision OpenAI untuk gambar detail tinggi
+
+    Gambar diskalakan agar muat di 2048x2048, lalu sisi terpendek menjadi
+    maksimal 768px; setiap tile 512x512 bernilai 170 token ditambah 85 token dasar.
+
+    Args:
+        width: Lebar gambar dalam piksel
+        height: Tinggi gambar dalam piksel
+
+    Returns:
+        int: Perkiraan jumlah token
+    """
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    tiles = math.ceil(width / 512) * math.ceil(height / 512)
+    return 85 + 170 * tiles
+
+class ImageProcessor:
+    """
+    Preprocessing gambar chart sebelum dikirim ke OpenAI
+
+    Menormalkan orientasi EXIF, membuang metadata, memperkecil gambar ke sisi
+    terpanjang yang dikonfigurasi lalu meng-encode ulang sebagai JPEG/WebP.
+    """
+    def __init__(self, max_edge: int = 1280, quality: int = 85, image_format: str = 'JPEG', enabled: bool = True):
+        """
+        Inisialisasi ImageProcessor
+
+        Args:
+            max_edge: Panjang maksimum sisi terpanjang gambar (piksel)
+            quality: Kualitas encode JPEG/WebP (1-100)
+            image_format: Format output, JPEG atau WEBP
+            enabled: Nonaktifkan untuk mengirim gambar asli apa adanya
+        """
+        self.max_edge = max_edge
+        self.quality = quality
+        self.image_format = image_format.upper() if image_format.upper() in FORMATS else 'JPEG'
+        self.enabled = enabled
+        self.images = 0
+        self.bytes_saved = 0
+        self.tokens_saved = 0
+
+    def process(self, data) -> Tuple[bytes, str, Dict[str, Any]]:
+        """
+        Proses gambar di memori
+
+        Args:
+            data: Bytes gambar asli
+
+        Returns:
+            tuple: (bytes gambar, MIME type, laporan ukuran dan token sebelum/sesudah)
+        """
+        with Image.open(io.BytesIO(data)) as original:
+            original_format = original.format
+            original_size = original.size
+
+            if not self.enabled:
+                mime_type = Image.MIME.get(original_format, 'image/jpeg')
+                return data, mime_type, self._report(data, data, original_size, original_size)
+
+            # Normalkan orientasi dari EXIF; metadata tidak ikut disimpan saat encode ulang
+            transposed = original.getexif().get(ORIENTATION_TAG, 1) != 1
+            image = ImageOps.exif_transpose(original)
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+
+            resized = max(image.size) > self.max_edge
+            if resized:
+                image.thumbnail((self.max_edge, self.max_edge), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            image.save(buffer, format=self.image_format, quality=self.quality, optimize=True)
+            processed = buffer.getvalue()
+            processed_size = image.size
+
+        # Gambar asli yang sudah kecil dan tidak perlu diputar tetap dipakai jika lebih hemat
+        if not resized and not transposed and len(data) <= len(processed) and original_format in FORMATS:
+            return data, FORMATS[original_format], self._report(data, data, original_size, original_size)
+
+        return processed, FORMATS[self.image_format], self._report(data, processed, original_size, processed_size)
+
+    def _report(self, original, processed, original_size, processed_size) -> Dict[str, Any]:
+        """Buat laporan penghematan byte dan token lalu perbarui statistik"""
+        report = {
+            'original_bytes': len(original),
+            'processed_bytes': len(processed),
+            'original_size': original_size,
+            'processed_size': processed_size,
+            'original_tokens': estimate_vision_tokens(*original_size),
+            'processed_tokens': estimate_vision_tokens(*processed_size)
+        }
+        self.images += 1
+        self.bytes_saved += report['original_bytes'] - report['processed_bytes']
+        self.tokens_saved += report['original_tokens'] - report['processed_tokens']
+        logger.info(
+            f"Preprocessing gambar: {original_size[0]}x{original_size[1]} -> {processed_size[0]}x{processed_size[1]}, "
+            f"{report['original_bytes']/1024:.1f} KB -> {report['processed_bytes']/1024:.1f} KB, "
+            f"token vision {report['original_tokens']} -> {report['processed_tokens']}"
+        )
+        return report
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Dapatkan statistik penghematan preprocessing
+
+        Returns:
+            dict: Jumlah gambar, total byte dan token yang dihemat
+        """
+        return {
+            'images': self.images,
+            'bytes_saved': self.bytes_saved,
+            'tokens_saved': self.tokens_saved
+        }
@@ -0,0 +1,97 @@
+import bisect
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def _bucket_bounds(minimum: float = 0.1, maximum: float = 300.0, factor: float = 1.25) -> List[float]:
+    """Batas atas bucket histogram dengan skala logaritmik"""
+    bounds = []
+    bound = minimum
+    while bound < maximum:
+        bounds.append(bound)
+        bound *= factor
+    bounds.append(maximum)
+    return bounds
+
+BUCKET_BOUNDS = _bucket_bounds()
+
+class LatencyTracker:
+    """
+    Histogram latensi per model dengan bucket logaritmik
+
+    Setiap model punya array hitungan per bucket (sekitar 40 bucket dari 0,1
+    sampai 300 detik, masing-masing 25% lebih lebar dari sebelumnya), jadi
+    mencatat dan membaca persentil tidak bergantung pada jumlah sampel.
+    Setelah max_samples sampel semua hitungan dibagi dua sehingga histogram
+    mengikuti latensi terbaru.
+    """
+    def __init__(self, min_samples: int = 20, max_samples: int = 1000):
+        """
+        Inisialisasi LatencyTracker
+
+        Args:
+            min_samples: Jumlah sampel minimum sebelum persentil dianggap valid
+            max_samples: Jumlah sampel sebelum hitungan lama diperkecil
+        """
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self._histograms: Dict[str, List[int]] = {}
+        self._totals: Dict[str, int] = {}
+
+    def record(self, model: str, seconds: float) -> None:
+        """
+        Catat satu latensi
+
+        Args:
+            model: Kunci model (mis. "gpt-4o" atau "gpt-4o:stream")
+            seconds: Latensi dalam detik
+        """
+        counts = self._histograms.get(model)
+        if counts is None:
+            counts = self._histograms[model] = [0] * len(BUCKET_BOUNDS)
+            self._totals[model] = 0
+        counts[min(bisect.bisect_left(BUCKET_BOUNDS, seconds), len(BUCKET_BOUNDS) - 1)] += 1
+        self._totals[model] += 1
+        if self._totals[model] >= self.max_samples:
+            for i, count in enumerate(counts):
+                counts[i] = count // 2
+            self._totals[model] = sum(counts)
+
+    def percentile(self, model: str, fraction: float) -> Optional[float]:
+        """
+        Perkiraan persentil latensi (batas atas bucket)
+
+        Args:
+            model: Kunci model
+            fraction: Persentil antara 0 dan 1 (mis. 0.95)
+
+        Returns:
+            float: Latensi dalam detik, atau None jika sampel belum cukup
+        """
+        total = self._totals.get(model, 0)
+        if total < self.min_samples:
+            return None
+        target = fraction * total
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self._histograms[model]):
+            seen += count
+            if seen >= target:
+                return bound
+        return BUCKET_BOUNDS[-1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan p50 dan p95 setiap model
+
+        Returns:
+            dict: Per model jumlah sampel, p50 dan p95 (None jika sampel belum cukup)
+        """
+        return {
+            model: {
+                'samples': self._totals[model],
+                'p50': self.percentile(model, 0.5),
+                'p95': self.percentile(model, 0.95)
+            }
+            for model in self._histograms
+        }
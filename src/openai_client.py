@@ -0,0 +1,516 @@
+import os
+import base64
+import logging
+import traceback
+import json
+import time
+import asyncio
+import openai
+from openai import AsyncOpenAI
+from src.config import (
+    OPENAI_API_KEY,
+    OPENAI_MODEL,
+    USE_FALLBACK,
+    HEALTH_CHECK_INTERVAL,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_BREAKER_COOLDOWN,
+    OPENAI_MAX_CONCURRENCY,
+    OPENAI_RATE_LIMIT_RETRIES,
+    OPENAI_MAX_RETRIES,
+    OPENAI_RETRY_BASE_DELAY,
+    OPENAI_RETRY_MAX_DELAY,
+    OPENAI_HEDGE,
+    OPENAI_HEDGE_PERCENTILE,
+    OPENAI_HEDGE_MIN_DELAY,
+    OPENAI_HEDGE_MODEL,
+    IMAGE_PREPROCESS,
+    IMAGE_MAX_EDGE,
+    IMAGE_QUALITY,
+    IMAGE_FORMAT,
+    STRUCTURED_OUTPUT
+)
+from src.health_monitor import HealthMonitor
+from src.circuit_breaker import CircuitBreaker, CircuitOpenError, HALF_OPEN
+from src.image_processor import ImageProcessor
+from src.openai_limiter import AdaptiveLimiter, retry_after_seconds, is_quota_exhausted
+from src.retry_policy import RetryPolicy
+from src.latency_tracker import LatencyTracker
+from src.analysis_formatter import to_telegram_html
+from src.usage_tracker import UsageTracker
+from src.structured_analysis import RESPONSE_FORMAT, AnalysisRefusedError, parse_structured_analysis, render_analysis
+import datetime
+
+logger = logging.getLogger(__name__)
+
+# Header yang mengawali setiap analisis foto sesuai template
+ANALYSIS_HEADER = '🔮 CRYPTOSCREENER AI 🔮'
+
+# Potongan teks (huruf kecil) yang menandakan model menolak atau menambahkan disclaimer
+REFUSAL_MARKERS = ("unable to provide", "i can guide you", "i can't assist", "sorry")
+
+class FallbackAnalysis(str):
+    """
+    Teks PHOTO_FALLBACK_ANALYSIS yang dikirim saat model menolak atau jawabannya tidak terbaca
+
+    Tetap berupa str sehingga bisa langsung dikirim, tetapi pemanggil bisa
+    mengenalinya (isinstance) agar placeholder ini tidak disimpan di cache.
+    """
+    pass
+
+
+class OpenAIClient:
+    """
+    Client OpenAI bersama untuk semua profil; GPT kustom dan prompt diambil dari
+    Profile yang diberikan ke setiap pemanggilan analisis
+    """
+    def __init__(self):
+        # Client async agar handler Telegram tidak memblokir event loop. Retry bawaan SDK
+        # dimatikan karena 429 dan error sementara ditangani _complete bersama limiter
+        self.async_client = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+        # Batas global request bersamaan ke OpenAI, menyesuaikan diri dengan header rate limit
+        self.limiter = AdaptiveLimiter(OPENAI_MAX_CONCURRENCY)
+        # Backoff dengan jitter untuk error sementara
+        self.retry_policy = RetryPolicy(OPENAI_MAX_RETRIES, OPENAI_RETRY_BASE_DELAY, OPENAI_RETRY_MAX_DELAY)
+        # Latensi per model menentukan kapan request cadangan (hedge) dikirim
+        self.latency = LatencyTracker()
+        # Token per model dan berapa token prompt yang dilayani dari prompt cache OpenAI
+        self.usage = UsageTracker()
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.model = OPENAI_MODEL
+        self.use_fallback = USE_FALLBACK
+        # Analisis foto sebagai JSON terstruktur yang dirender dengan template profil
+        self.structured_output = STRUCTURED_OUTPUT
+        # Status API key dan koneksi dicek di background, bukan per request
+        self.health_monitor = HealthMonitor(self.async_client, HEALTH_CHECK_INTERVAL)
+        # Lewati GPT kustom sementara jika terus-menerus ditolak API
+        self.circuit_breaker = CircuitBreaker(CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN)
+        # Perkecil dan encode ulang gambar sebelum upload untuk menghemat byte dan token vision
+        self.image_processor = ImageProcessor(IMAGE_MAX_EDGE, IMAGE_QUALITY, IMAGE_FORMAT, IMAGE_PREPROCESS)
+        logger.info(f"OpenAI client diinisialisasi dengan model {self.model}")
+        logger.info(f"Mode fallback: {'Aktif' if self.use_fallback else 'Nonaktif'}")
+        
+        # Verifikasi API key yang digunakan
+        logger.debug(f"API key yang digunakan: {OPENAI_API_KEY[:5]}...{OPENAI_API_KEY[-4:]}")
+
+    def encode_image(self, image):
+        """
+        Mengubah gambar menjadi base64 string untuk dikirim ke OpenAI
+        
+        Args:
+            image: Bytes gambar (bytes/bytearray/memoryview) atau path file gambar
+        """
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            # Encode langsung dari buffer di memori tanpa menyalin atau menyimpan ke disk
+            encoded = base64.b64encode(image).decode('ascii')
+            logger.debug(f"Gambar berhasil di-encode dari memori, ukuran: {len(image)/1024:.2f} KB, panjang base64: {len(encoded)} karakter")
+            return encoded
+        
+        image_path = image
+        if not os.path.exists(image_path):
+            logger.error(f"File gambar tidak ditemukan: {image_path}")
+            raise FileNotFoundError(f"File gambar tidak ditemukan: {image_path}")
+        
+        try:
+            with open(image_path, "rb") as image_file:
+                encoded = base64.b64encode(image_file.read()).decode('utf-8')
+                file_size = os.path.getsize(image_path)
+                logger.debug(f"Gambar berhasil di-encode, ukuran file: {file_size/1024:.2f} KB, panjang base64: {len(encoded)} karakter")
+                return encoded
+        except Exception as e:
+            logger.error(f"Error saat mengubah gambar ke base64: {str(e)}")
+            raise
+
+    def prepare_image(self, image):
+        """
+        Preprocessing lalu encode gambar ke base64
+        
+        Args:
+            image: Bytes gambar atau path file gambar
+        
+        Returns:
+            tuple: (base64 string, MIME type gambar)
+        """
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            data = image
+        else:
+            if not os.path.exists(image):
+                logger.error(f"File gambar tidak ditemukan: {image}")
+                raise FileNotFoundError(f"File gambar tidak ditemukan: {image}")
+            with open(image, "rb") as image_file:
+                data = image_file.read()
+        
+        try:
+            data, mime_type, report = self.image_processor.process(data)
+        except Exception as e:
+            # Gambar yang tidak bisa dibaca Pillow tetap dikirim apa adanya
+            logger.warning(f"Preprocessing gambar gagal, mengirim gambar asli: {str(e)}")
+            mime_type = "image/jpeg"
+        
+        return self.encode_image(data), mime_type
+
+    def _describe_image(self, image):
+        """
+        Deskripsi singkat gambar untuk log (path file atau ukuran buffer)
+        """
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return f"<{len(image)} bytes di memori>"
+        return image
+
+    def _ensure_circuit_closed(self, gpt_id):
+        """
+        Lempar CircuitOpenError jika GPT kustom sedang dilewati oleh circuit breaker
+        
+        Returns:
+            bool: True jika request ini adalah probe half-open; pemanggil wajib
+                memanggil circuit_breaker.release_probe setelah request selesai
+        """
+        if not self.circuit_breaker.allow(gpt_id):
+            raise CircuitOpenError(f"Circuit breaker untuk {gpt_id} terbuka, GPT kustom dilewati")
+        return self.circuit_breaker.get_state(gpt_id) == HALF_OPEN
+
+    def _photo_messages(self, profile, base64_image, mime_type="image/jpeg"):
+        """
+        Membuat pesan lengkap (system + user) untuk analyze_photo_async
+        """
+        return profile.prompt_set.photo_messages(profile.prompt_set.image_part(base64_image, mime_type))
+
+    def _clean_photo_analysis(self, profile, analysis):
+        """
+        Hapus disclaimer atau text yang tidak diinginkan sebelum template,
+        lalu render menjadi HTML yang diterima Telegram
+        
+        Respons tanpa isi (content None, mis. karena filter konten) diperlakukan
+        seperti penolakan.
+        """
+        if not analysis or not analysis.strip():
+            logger.warning("Respons analisis kosong, memakai analisis fallback")
+            return FallbackAnalysis(profile.prompts.PHOTO_FALLBACK_ANALYSIS)
+        lowered = analysis.lower()
+        if any(marker in lowered for marker in REFUSAL_MARKERS):
+            start_idx = analysis.find(ANALYSIS_HEADER)
+            if start_idx < 0:
+                # Jika tidak menemukan header CRYPTOSCREENER AI, buat respons fallback sederhana
+                return FallbackAnalysis(profile.prompts.PHOTO_FALLBACK_ANALYSIS)
+            analysis = analysis[start_idx:]
+        return to_telegram_html(analysis)
+
+    def _render_structured(self, profile, content):
+        """
+        Render respons JSON terstruktur dengan template profil
+        
+        GPT kustom bisa mengabaikan response_format dan menjawab dengan teks
+        template; teks seperti itu dibersihkan seperti mode biasa.
+        """
+        data = parse_structured_analysis(content)
+        if data is None:
+            logger.warning("Respons analisis bukan JSON terstruktur, memakai teks respons")
+            return self._clean_photo_analysis(profile, content)
+        return render_analysis(data, profile.prompts.RESULT_TEMPLATE)
+
+    def _latency_key(self, model, stream):
+        """Kunci histogram latensi; untuk stream yang diukur adalah waktu sampai potongan analisis pertama tampil"""
+        return f"{model}:stream" if stream else model
+
+    def _hedge_delay(self, model, stream):
+        """
+        Waktu tunggu sebelum request cadangan dikirim, atau None jika hedging tidak dipakai
+        
+        Hedging hanya ke OPENAI_HEDGE_MODEL yang berbeda dari model ini; request kedua ke
+        model yang sama menggandakan biaya tanpa jalur yang benar-benar berbeda. Hedging
+        juga dilewati saat limiter sudah penuh karena request tambahan hanya memperpanjang antrian.
+        """
+        if not OPENAI_HEDGE or not OPENAI_HEDGE_MODEL or OPENAI_HEDGE_MODEL == model:
+            return None
+        if self.limiter.waiting > 0:
+            return None
+        p95 = self.latency.percentile(self._latency_key(model, stream), OPENAI_HEDGE_PERCENTILE)
+        if p95 is None:
+            return None
+        return max(OPENAI_HEDGE_MIN_DELAY, p95)
+
+    async def _complete(self, model, messages, max_tokens, on_progress=None, response_format=None):
+        """
+        Kirim chat completion dan kembalikan teks respons, dengan hedging untuk request yang lambat
+        
+        Jika model belum menjawab setelah persentil latensinya (p95), request
+        cadangan dikirim ke OPENAI_HEDGE_MODEL dan yang lebih dulu menjawab
+        dipakai; yang kalah dibatalkan. Untuk stream, "menjawab" berarti
+        potongan analisis pertama sudah tiba.
+        
+        Args:
+            model: ID model atau GPT kustom
+            messages: Pesan chat
+            max_tokens: Batas token respons
+            on_progress: Coroutine opsional untuk teks parsial; jika diisi respons di-stream
+            response_format: response_format opsional (mis. skema JSON structured output)
+        
+        Returns:
+            tuple: (teks respons lengkap, model yang menjawab; OPENAI_HEDGE_MODEL jika request cadangan menang)
+        """
+        hedge_delay = self._hedge_delay(model, on_progress is not None)
+        if hedge_delay is None:
+            return await self._complete_with_retry(model, messages, max_tokens, on_progress, response_format), model
+        
+        tasks = {}
+        winner = None
+        
+        def report_for(name):
+            # Hanya request yang lebih dulu mengirim potongan analisis yang boleh mengedit pesan
+            async def report(text):
+                nonlocal winner
+                if winner is None:
+                    winner = name
+                    for other, task in tasks.items():
+                        if other != name:
+                            task.cancel()
+                if winner == name:
+                    await on_progress(text)
+            return report if on_progress is not None else None
+        
+        tasks['primary'] = asyncio.create_task(
+            self._complete_with_retry(model, messages, max_tokens, report_for('primary'), response_format)
+        )
+        try:
+            done, _ = await asyncio.wait({tasks['primary']}, timeout=hedge_delay)
+            if done or winner is not None:
+                return await tasks['primary'], model
+            
+            hedge_model = OPENAI_HEDGE_MODEL
+            self.hedges += 1
+            logger.info(f"Model {model} belum menjawab setelah {hedge_delay:.1f} detik, mengirim request cadangan ke {hedge_model}")
+            tasks['hedge'] = asyncio.create_task(
+                self._complete_with_retry(hedge_model, messages, max_tokens, report_for('hedge'), response_format)
+            )
+            
+            error = None
+            pending = set(tasks.values())
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for name, task in tasks.items():
+                    if task not in done or task.cancelled():
+                        continue
+                    if task.exception() is None:
+                        if name == 'hedge':
+                            self.hedge_wins += 1
+                            return task.result(), hedge_model
+                        return task.result(), model
+                    # Satu request gagal: tunggu yang lain
+                    error = error or task.exception()
+            raise error if error is not None else asyncio.CancelledError()
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+
+    def _timed_progress(self, on_progress, latency_key, started):
+        """
+        Bungkus on_progress agar waktu sampai potongan analisis pertama dicatat di histogram latensi
+
+        Hedging untuk stream menunggu potongan analisis pertama (bukan header
+        respons), jadi p95-nya harus diukur dari kejadian yang sama.
+        """
+        first = True
+        
+        async def report(text):
+            nonlocal first
+            if first:
+                first = False
+                self.latency.record(latency_key, time.monotonic() - started)
+            await on_progress(text)
+        return report
+
+    async def _complete_with_retry(self, model, messages, max_tokens, on_progress=None, response_format=None):
+        """
+        Kirim satu chat completion lewat limiter global dengan percobaan ulang
+        
+        Request menunggu slot limiter (tidak error saat batas penuh). Respons 429
+        menurunkan batas, menahan request baru selama retry-after lalu dicoba
+        lagi; 429 bukan kegagalan model sehingga tidak dihitung circuit breaker.
+        Error sementara (koneksi, 408, 409, 5xx) dicoba lagi sesuai RetryPolicy.
+        
+        Returns:
+            str: Teks respons lengkap
+        
+        Raises:
+            AnalysisRefusedError: Model menolak (field refusal pada structured output)
+        """
+        rate_limit_retries = 0
+        attempt = 0
+        latency_key = self._latency_key(model, on_progress is not None)
+        options = {'response_format': response_format} if response_format is not None else {}
+        if on_progress is not None:
+            # Usage (termasuk cached_tokens) hanya dikirim di potongan terakhir stream jika diminta
+            options['stream_options'] = {'include_usage': True}
+        while True:
+            try:
+                async with self.limiter.slot():
+                    started = time.monotonic()
+                    raw = await self.async_client.chat.completions.with_raw_response.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        stream=on_progress is not None,
+                        **options
+                    )
+                    self.limiter.record_response(raw.headers)
+                    response = raw.parse()
+                    # Slot ditahan sampai stream selesai karena model masih bekerja
+                    if on_progress is not None:
+                        analysis, usage = await self._collect_stream(
+                            response, self._timed_progress(on_progress, latency_key, started)
+                        )
+                        self.usage.record(model, usage, time.monotonic() - started)
+                        return analysis
+                    self.latency.record(latency_key, time.monotonic() - started)
+                    self.usage.record(model, getattr(response, 'usage', None), time.monotonic() - started)
+                    message = response.choices[0].message
+                    # Penolakan structured output datang sebagai field terpisah, bukan teks respons
+                    refusal = getattr(message, 'refusal', None)
+                    if refusal:
+                        raise AnalysisRefusedError(refusal)
+                    return message.content
+            except openai.RateLimitError as e:
+                if is_quota_exhausted(e) or rate_limit_retries >= OPENAI_RATE_LIMIT_RETRIES:
+                    raise
+                rate_limit_retries += 1
+                delay = self.limiter.record_rate_limit(retry_after_seconds(e.response.headers))
+                logger.warning(f"Rate limit OpenAI untuk {model}, mencoba lagi dalam {delay:.1f} detik")
+            except Exception as e:
+                if not self.retry_policy.should_retry(e, attempt):
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                attempt += 1
+                logger.warning(f"Error sementara dari OpenAI untuk {model}: {str(e)}, percobaan ulang ke-{attempt} dalam {delay:.1f} detik")
+                await asyncio.sleep(delay)
+
+    def get_latency_stats(self):
+        """
+        Dapatkan statistik latensi, retry dan hedging
+        
+        Returns:
+            dict: Latensi per model, jumlah retry, hedge yang dikirim dan yang menang, serta usage token
+                dan prompt cache per model
+        """
+        return {
+            'models': self.latency.get_stats(),
+            'usage': self.usage.get_stats(),
+            'retries': self.retry_policy.retries,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins
+        }
+
+    async def _collect_stream(self, stream, on_progress):
+        """
+        Kumpulkan potongan teks dari response stream dan laporkan teks sejauh ini ke on_progress
+        
+        Teks sebelum header analisis (mis. disclaimer) tidak ditampilkan, sama
+        seperti yang dibuang oleh _clean_photo_analysis
+        
+        Returns:
+            tuple: (teks lengkap, usage dari potongan terakhir atau None)
+        """
+        analysis = ""
+        usage = None
+        async for chunk in stream:
+            if getattr(chunk, 'usage', None) is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            analysis += delta
+            start = analysis.find(ANALYSIS_HEADER)
+            if start < 0:
+                continue
+            try:
+                await on_progress(analysis[start:])
+            except Exception as e:
+                # Gagal menampilkan progres tidak boleh menggagalkan analisis
+                logger.warning(f"Error saat melaporkan progres analisis: {str(e)}")
+        return analysis, usage
+
+    async def analyze_photo_async(self, profile, image, on_progress=None):
+        """
+        Menganalisis foto dengan format yang siap untuk Telegram; di-await langsung
+        oleh handler Telegram sehingga request ke OpenAI tidak memblokir event loop
+        
+        Args:
+            profile: Profile yang menentukan GPT kustom dan prompt
+            image: Bytes gambar atau path file gambar
+            on_progress: Coroutine opsional yang dipanggil dengan teks parsial; jika diisi,
+                respons di-stream (stream=True) sehingga pengguna melihat analisis bertahap.
+                Diabaikan dalam mode STRUCTURED_OUTPUT karena JSON parsial tidak bisa ditampilkan
+        
+        Returns:
+            str: Analisis lengkap yang sudah dibersihkan, atau FallbackAnalysis jika
+                model menolak atau jawabannya tidak bisa dipakai
+        """
+        try:
+            self.health_monitor.ensure_healthy()
+            
+            # Preprocessing dan encode gambar sebagai base64 di thread terpisah
+            base64_image, mime_type = await asyncio.to_thread(self.prepare_image, image)
+            
+            logger.info(f"Menganalisis foto (async): {self._describe_image(image)}")
+            if self.structured_output:
+                # Model hanya mengisi field JSON; template profil dirender lokal
+                messages = profile.prompt_set.structured_photo_messages(
+                    profile.prompt_set.image_part(base64_image, mime_type)
+                )
+                response_format = RESPONSE_FORMAT
+                on_progress = None
+            else:
+                messages = self._photo_messages(profile, base64_image, mime_type)
+                response_format = None
+            
+            analysis = None
+            try:
+                # Mencoba menggunakan GPT kustom jika tersedia dan circuit breaker tertutup
+                if profile.is_custom_gpt:
+                    try:
+                        probe = self._ensure_circuit_closed(profile.gpt_id)
+                        try:
+                            analysis, answered_by = await self._complete(profile.gpt_id, messages, 1500, on_progress, response_format)
+                            # Jawaban dari OPENAI_HEDGE_MODEL bukan bukti GPT kustom sehat
+                            if answered_by == profile.gpt_id:
+                                self.circuit_breaker.record_success(profile.gpt_id)
+                        except (openai.RateLimitError, AnalysisRefusedError):
+                            raise
+                        except Exception as e:
+                            self.circuit_breaker.record_failure(profile.gpt_id, e)
+                            raise
+                        finally:
+                            # 429, penolakan atau task dibatalkan tidak mencatat hasil; probe tetap harus dilepas
+                            if probe:
+                                self.circuit_breaker.release_probe(profile.gpt_id)
+                    except (openai.RateLimitError, AnalysisRefusedError):
+                        # Rate limit dan penolakan bukan kegagalan model: fallback hanya akan menggandakan beban
+                        raise
+                    except Exception as e:
+                        logger.warning(f"Error menggunakan GPT kustom: {str(e)}")
+                        if not self.use_fallback:
+                            raise
+                
+                if analysis is None:
+                    # Fallback ke model standar gpt-4o
+                    logger.info(f"Menggunakan model fallback: gpt-4o")
+                    analysis, _ = await self._complete("gpt-4o", messages, 1500, on_progress, response_format)
+            except AnalysisRefusedError as e:
+                logger.warning(f"Model menolak menganalisis chart: {str(e)}")
+                return FallbackAnalysis(profile.prompts.PHOTO_FALLBACK_ANALYSIS)
+            
+            logger.info("Analisis gambar berhasil diperoleh")
+            logger.debug(f"Panjang respons: {len(analysis or '')} karakter")
+            
+            if self.structured_output:
+                return self._render_structured(profile, analysis)
+            return self._clean_photo_analysis(profile, analysis)
+            
+        except Exception as e:
+            self.health_monitor.record_error(e)
+            error_trace = traceback.format_exc()
+            logger.error(f"Error dalam analyze_photo_async: {str(e)}")
+            logger.error(f"Traceback: {error_trace}")
+            raise 
@@ -0,0 +1,197 @@
+import re
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+import openai
+
+logger = logging.getLogger(__name__)
+
+# Sisa kuota (request atau token) di bawah fraksi ini dianggap mendekati limit
+LOW_REMAINING_FRACTION = 0.1
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Ubah durasi dari header OpenAI ("1s", "6m0s", "20ms" atau angka detik) menjadi detik
+
+    Returns:
+        float: Durasi dalam detik, atau None jika tidak bisa dibaca
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """Baca jeda dari header retry-after-ms atau retry-after respons 429"""
+    if headers is None:
+        return None
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+    return parse_duration(headers.get('retry-after'))
+
+def _header_int(headers, name: str) -> Optional[int]:
+    """Baca header bilangan bulat, None jika tidak ada atau tidak valid"""
+    value = headers.get(name) if headers is not None else None
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+class AdaptiveLimiter:
+    """
+    Batas global request OpenAI yang berjalan bersamaan, diatur dengan AIMD
+
+    Setiap respons sukses menaikkan batas sedikit (additive increase, sekitar
+    +1 per satu putaran batas penuh). Respons 429 atau header
+    x-ratelimit-remaining-* yang hampir habis memotong batas menjadi setengah
+    (multiplicative decrease). Saat kuota habis atau ada retry-after, semua
+    request baru ditahan sampai waktu reset. Pemanggil yang melebihi batas
+    menunggu giliran, bukan mendapat error.
+    """
+    def __init__(self, max_concurrency: int = 8, min_concurrency: int = 1):
+        """
+        Inisialisasi AdaptiveLimiter
+
+        Args:
+            max_concurrency: Batas atas request bersamaan
+            min_concurrency: Batas bawah request bersamaan
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.requests = 0
+        self.rate_limited = 0
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Condition dibuat saat pertama dipakai agar terikat ke event loop yang berjalan"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @asynccontextmanager
+    async def slot(self):
+        """Tahan satu slot request selama blok berjalan; menunggu jika batas penuh atau sedang jeda"""
+        condition = self._get_condition()
+        async with condition:
+            self.waiting += 1
+            try:
+                while True:
+                    pause = self._paused_until - time.monotonic()
+                    if pause <= 0 and self.in_flight < int(self.limit):
+                        break
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=pause if pause > 0 else None)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                self.in_flight -= 1
+                condition.notify_all()
+
+    def _decrease(self, reason: str) -> None:
+        """Potong batas menjadi setengah, paling sering sekali per detik agar satu burst tidak memotong berkali-kali"""
+        now = time.monotonic()
+        if now - self._last_decrease < 1.0:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(float(self.min_concurrency), self.limit / 2)
+        if int(previous) != int(self.limit):
+            logger.warning(f"Batas request OpenAI bersamaan turun {int(previous)} -> {int(self.limit)} ({reason})")
+
+    def _pause(self, seconds: float) -> None:
+        """Tahan semua request baru selama beberapa detik"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def record_response(self, headers) -> None:
+        """
+        Catat respons sukses dan sesuaikan batas dari header x-ratelimit-*
+
+        Args:
+            headers: Header respons HTTP OpenAI
+        """
+        self.requests += 1
+        near_limit = False
+        for kind in ('requests', 'tokens'):
+            remaining = _header_int(headers, f'x-ratelimit-remaining-{kind}')
+            limit = _header_int(headers, f'x-ratelimit-limit-{kind}')
+            setattr(self, f'remaining_{kind}', remaining)
+            if remaining is None or not limit:
+                continue
+            if remaining <= 0:
+                # Kuota habis: tunggu sampai reset, bukan menembak 429
+                reset = parse_duration(headers.get(f'x-ratelimit-reset-{kind}'))
+                if reset:
+                    self._pause(reset)
+            if remaining < limit * LOW_REMAINING_FRACTION:
+                near_limit = True
+        if near_limit:
+            self._decrease("kuota hampir habis")
+        elif self.limit < self.max_concurrency:
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def record_rate_limit(self, retry_after: Optional[float]) -> float:
+        """
+        Catat respons 429: potong batas dan tahan request baru selama retry-after
+
+        Args:
+            retry_after: Jeda dari header respons (detik), atau None
+
+        Returns:
+            float: Jeda yang dipakai sebelum mencoba lagi (detik)
+        """
+        self.rate_limited += 1
+        self._decrease("429 dari OpenAI")
+        delay = retry_after if retry_after is not None else 1.0
+        self._pause(delay)
+        return delay
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan statistik limiter
+
+        Returns:
+            dict: Batas saat ini, request berjalan dan menunggu, jumlah 429 dan sisa kuota terakhir
+        """
+        return {
+            'limit': int(self.limit),
+            'max_concurrency': self.max_concurrency,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'requests': self.requests,
+            'rate_limited': self.rate_limited,
+            'remaining_requests': self.remaining_requests,
+            'remaining_tokens': self.remaining_tokens,
+            'paused_for': max(0.0, self._paused_until - time.monotonic())
+        }
+
+def is_quota_exhausted(error: Exception) -> bool:
+    """429 karena kuota billing habis tidak akan pulih dengan menunggu"""
+    return isinstance(error, openai.RateLimitError) and getattr(error, 'code', None) == 'insufficient_quota'
@@ -0,0 +1,171 @@
+import io
+import time
+import logging
+import itertools
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 16
+HASH_BITS = HASH_SIZE * HASH_SIZE
+SEGMENT_BITS = 16
+SEGMENTS = HASH_BITS // SEGMENT_BITS
+
+def dhash(data) -> int:
+    """
+    Hitung difference hash (dHash) 256-bit dari bytes gambar
+
+    Gambar dikecilkan ke 17x16 grayscale; setiap bit menyatakan apakah piksel
+    lebih terang dari piksel di sebelah kanannya. Bit disusun per kolom
+    sehingga setiap segmen 16-bit mencakup seluruh tinggi chart. Baris atas dan
+    bawah chart biasanya hanya latar belakang gelap; jika disusun per baris,
+    segmen itu bernilai 0 untuk hampir semua chart dan bucket-nya membengkak.
+
+    Args:
+        data: Bytes gambar
+
+    Returns:
+        int: Hash 256-bit
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))  # Decode JPEG pada resolusi rendah agar cepat
+        pixels = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS).tobytes()
+    width = HASH_SIZE + 1
+    value = 0
+    for col in range(HASH_SIZE):
+        for row in range(HASH_SIZE):
+            left = pixels[row * width + col]
+            right = pixels[row * width + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+class PhashCache:
+    """
+    Cache hasil analisis untuk chart yang hampir sama (perceptual hash)
+
+    Menggunakan multi-index hash table: hash 256-bit dibagi menjadi 16 segmen
+    16-bit. Dua hash dengan jarak Hamming <= max_distance pasti memiliki
+    minimal satu segmen dengan jarak <= max_distance // 16 (prinsip pigeonhole),
+    sehingga lookup hanya memeriksa bucket segmen yang berjarak sedekat itu.
+    """
+    def __init__(self, max_distance: int = 10, window: float = 600.0, max_size: int = 100000):
+        """
+        Inisialisasi PhashCache
+
+        Args:
+            max_distance: Jarak Hamming maksimum agar dua chart dianggap sama
+            window: Umur maksimum hasil yang boleh dipakai ulang (detik)
+            max_size: Jumlah maksimum entri yang disimpan
+        """
+        self.max_distance = max(0, min(max_distance, HASH_BITS - 1))
+        self.window = window
+        self.max_size = max_size
+        # Semua pola flip bit dalam satu segmen sejauh max_distance // SEGMENTS
+        radius = self.max_distance // SEGMENTS
+        self._flips: List[int] = [
+            sum(1 << bit for bit in bits)
+            for count in range(radius + 1)
+            for bits in itertools.combinations(range(SEGMENT_BITS), count)
+        ]
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(SEGMENTS)]
+        # entry_id -> (waktu, hash, kunci profil, hasil analisis), urut dari yang terlama
+        self._entries: "OrderedDict[int, Tuple[float, int, str, str]]" = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _segment_values(self, value: int):
+        """Nilai setiap segmen dari hash"""
+        for index in range(SEGMENTS):
+            yield index, (value >> (index * SEGMENT_BITS)) & ((1 << SEGMENT_BITS) - 1)
+
+    def _remove(self, entry_id: int) -> None:
+        """Hapus entri dari tabel dan semua bucket"""
+        _, value, _, _ = self._entries.pop(entry_id)
+        for index, segment in self._segment_values(value):
+            bucket = self._buckets[index].get(segment)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[index][segment]
+
+    def _expire(self, now: float) -> None:
+        """Buang entri yang sudah keluar dari window waktu"""
+        while self._entries:
+            entry_id, entry = next(iter(self._entries.items()))
+            if now - entry[0] < self.window:
+                break
+            self._remove(entry_id)
+
+    def get(self, value: int, profile_key: str) -> Optional[str]:
+        """
+        Cari hasil analisis chart yang hampir sama
+
+        Args:
+            value: dHash gambar
+            profile_key: Kunci profil (prompt dan model)
+
+        Returns:
+            str: Hasil analisis terdekat, atau None jika tidak ada
+        """
+        now = time.monotonic()
+        self._expire(now)
+        best_id = None
+        best_distance = self.max_distance + 1
+        seen: Set[int] = set()
+        for index, segment in self._segment_values(value):
+            buckets = self._buckets[index]
+            for flip in self._flips:
+                for entry_id in buckets.get(segment ^ flip, ()):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    _, other, other_profile, _ = self._entries[entry_id]
+                    if other_profile != profile_key:
+                        continue
+                    distance = bin(value ^ other).count('1')
+                    if distance < best_distance:
+                        best_id, best_distance = entry_id, distance
+        if best_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.debug(f"Chart hampir sama ditemukan di cache phash (jarak {best_distance})")
+        return self._entries[best_id][3]
+
+    def set(self, value: int, profile_key: str, analysis: str) -> None:
+        """
+        Simpan hasil analisis untuk hash gambar
+
+        Args:
+            value: dHash gambar
+            profile_key: Kunci profil (prompt dan model)
+            analysis: Hasil analisis yang sudah terformat
+        """
+        if self.max_size <= 0:
+            return
+        now = time.monotonic()
+        self._expire(now)
+        while len(self._entries) >= self.max_size:
+            self._remove(next(iter(self._entries)))
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (now, value, profile_key, analysis)
+        for index, segment in self._segment_values(value):
+            self._buckets[index].setdefault(segment, set()).add(entry_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan statistik cache phash
+
+        Returns:
+            dict: Jumlah entri, hit dan miss
+        """
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
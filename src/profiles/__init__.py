@@ -0,0 +1,71 @@
+import hashlib
+import importlib
+import logging
+from src.prompt_registry import PromptSet
+from src.config import (
+    PROFILES,
+    PROFILE_SETTINGS,
+    OPENAI_MODEL,
+    BOT_NAME,
+    STRUCTURED_OUTPUT
+)
+
+logger = logging.getLogger(__name__)
+
+class Profile:
+    """
+    Satu profil timeframe (H1, H4, M15): token bot, GPT kustom dan prompt-nya.
+    Semua profil berbagi OpenAI client, antrian, cache dan daftar pengguna yang sama.
+    """
+    def __init__(self, name, token, gpt_id, bot_name, prompts):
+        self.name = name
+        self.token = token
+        self.gpt_id = gpt_id
+        self.bot_name = bot_name
+        self.prompts = prompts
+        self.timeframe = prompts.TIMEFRAME
+        self.profile_name = prompts.PROFILE_NAME
+        # Cek apakah ini adalah GPT kustom
+        self.is_custom_gpt = self.gpt_id.startswith('g-')
+        # Kunci profil untuk cache hasil: berubah jika prompt, model atau mode output berubah
+        key_parts = [self.gpt_id, OPENAI_MODEL, prompts.PHOTO_SYSTEM_MESSAGE, prompts.PHOTO_PROMPT]
+        if STRUCTURED_OUTPUT:
+            key_parts += [prompts.STRUCTURED_PROMPT, prompts.RESULT_TEMPLATE]
+        self.key = hashlib.sha1("\0".join(key_parts).encode('utf-8')).hexdigest()[:16]
+        # Kerangka pesan dan jumlah token prompt, dibuat sekali untuk semua request profil ini
+        self.prompt_set = PromptSet(prompts, OPENAI_MODEL)
+
+    def __repr__(self):
+        return f"Profile({self.name}, {self.profile_name}, {self.gpt_id})"
+
+def load_profiles():
+    """
+    Memuat semua profil yang diaktifkan lewat PROFILES di .env
+
+    Returns:
+        list: Daftar Profile sesuai urutan di PROFILES
+    """
+    profiles = []
+    for name in PROFILES:
+        try:
+            prompts = importlib.import_module(f"src.profiles.{name.lower()}")
+        except ImportError:
+            logger.error(f"Profil {name} tidak dikenal. Profil yang tersedia: H1, H4, M15")
+            raise ValueError(f"Profil {name} tidak dikenal")
+
+        settings = PROFILE_SETTINGS[name]
+        profile = Profile(
+            name,
+            settings['token'],
+            settings['gpt_id'] or prompts.DEFAULT_GPT_ID,
+            settings['bot_name'] or BOT_NAME,
+            prompts
+        )
+        tokens = profile.prompt_set.token_counts
+        request_tokens = tokens['structured_request' if STRUCTURED_OUTPUT else 'photo_request']
+        logger.info(
+            f"Profil {name} dimuat: {profile.profile_name} dengan GPT ID {profile.gpt_id}, "
+            f"{'' if profile.prompt_set.exact else '~'}{request_tokens} token prompt per analisis foto sebelum gambar"
+        )
+        profiles.append(profile)
+    return profiles
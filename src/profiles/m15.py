@@ -0,0 +1,132 @@
+# Prompt dan teks khusus profil UltraScalp untuk timeframe M15 (15 menit)
+
+# ID GPT kustom default (bisa diganti dengan M15_GPT_ID di .env)
+DEFAULT_GPT_ID = "g-67e7e2b2aad0819183cf30988154b9a5"
+
+# Timeframe yang ditampilkan di teks bantuan
+TIMEFRAME = "15 menit"
+
+# Nama pendekatan GPT kustom
+PROFILE_NAME = "UltraScalp"
+
+# Template formatting yang diminta
+PHOTO_FORMAT_TEMPLATE = """
+Analisis chart crypto berikut dan buat output yang sudah terformat lengkap dengan emoji untuk platform Telegram. Ikuti template format di bawah ini dengan tepat:
+
+🔮 CRYPTOSCREENER AI 🔮
+
+📊 ANALISIS [COIN] [TIMEFRAME] 📊
+Symbol: [SYMBOL] | Harga: [CURRENT PRICE]
+
+📈 TREND
+- 🚀 TREND UTAMA: [Jelaskan trend utama - uptrend/downtrend/sideways]
+- 📊 PERGERAKAN HARGA: [Jelaskan pergerakan harga terkini]
+
+🔍 SUPPORT & RESISTANCE
+- 🛡️ SUPPORT KUNCI: [Level support]
+- 🔥 RESISTANCE KUNCI: [Level resistance]
+
+⚡ SETUP TRADING
+- 💎 POSISI: [LONG/SHORT]
+- 🎯 ENTRY: [Harga entry]
+- ⏱️ DURASI: [Estimasi waktu pergerakan]
+
+💰 TARGET PROFIT
+- 🥉 Target 1: [Harga] (+[Persentase]%)
+- 🥈 Target 2: [Harga] (+[Persentase]%)
+- 🥇 Target 3: [Harga] (+[Persentase]%)
+
+⛔ STOP LOSS
+- 🚨 Stop Loss: [Harga] (-[Persentase]%)
+
+⚖️ RASIO RISK:REWARD
+- 📊 R:R = [Rasio]
+
+🧰 SKENARIO LANJUTAN
+- ✅ Jika TP tercapai: [Tindakan selanjutnya]
+- ❌ Jika SL tercapai: [Tindakan selanjutnya]
+
+<b>⚠️ DISCLAIMER: Bukan saran finansial</b>
+<b>🤖 Bot CRYPTOSCREENER AI v1.2</b>
+
+<i>Pastikan untuk selalu melakukan analisis lebih lanjut dan pertimbangan risiko sebelum mengambil keputusan trading.</i>
+"""
+
+# Prompt untuk analisis dengan format template yang sudah ditentukan
+PHOTO_PROMPT = f"""Analisis ini adalah untuk PENDIDIKAN SAJA, tidak mengandung nasihat finansial. 
+
+Analisis pola grafik teknikal dan tampilkan informasi visual yang terlihat pada grafik berikut, menggunakan analisis objektif tanpa rekomendasi trading aktual. Identifikasi pola visual, level harga penting, dan pergerakan historis yang terlihat pada chart. 
+
+Berikan output terformat dengan template berikut untuk membantu pembaca memahami apa yang terlihat pada grafik. Perlu diingat analisis ini bersifat pendidikan dan hanya melihat pola visual, bukan rekomendasi trading aktual.
+
+{PHOTO_FORMAT_TEMPLATE}"""
+
+# Prompt untuk mode STRUCTURED_OUTPUT: model hanya mengisi field JSON, template dirender lokal
+STRUCTURED_PROMPT = """Analisis ini adalah untuk PENDIDIKAN SAJA, tidak mengandung nasihat finansial.
+
+Analisis pola grafik teknikal pada chart berikut secara objektif, fokus pada TIMEFRAME M15 (15 MENIT) untuk scalping dengan pendekatan UltraScalp. Isi setiap field JSON dengan informasi yang terlihat pada chart: symbol, harga terkini, trend, support, resistance, posisi LONG/SHORT, entry, durasi, tiga target profit, stop loss, rasio risk:reward dan dua skenario lanjutan: jika TP tercapai dan jika SL tercapai. Tulis dalam Bahasa Indonesia, singkat dan tanpa disclaimer."""
+
+# Template HTML hasil mode STRUCTURED_OUTPUT (str.format, nilai sudah di-escape)
+RESULT_TEMPLATE = """🔮 CRYPTOSCREENER AI 🔮
+
+📊 ANALISIS {coin} M15 📊
+Symbol: {symbol} | Harga: {price}
+
+📈 TREND
+- 🚀 TREND UTAMA: {trend}
+- 📊 PERGERAKAN HARGA: {price_action}
+
+🔍 SUPPORT & RESISTANCE
+- 🛡️ SUPPORT KUNCI: {support}
+- 🔥 RESISTANCE KUNCI: {resistance}
+
+⚡ SETUP TRADING
+- 💎 POSISI: {position}
+- 🎯 ENTRY: {entry}
+- ⏱️ DURASI: {duration}
+
+💰 TARGET PROFIT
+{targets}
+
+⛔ STOP LOSS
+- 🚨 Stop Loss: {stop_loss}
+
+⚖️ RASIO RISK:REWARD
+- 📊 R:R = {risk_reward}
+
+🧰 SKENARIO LANJUTAN
+{scenarios}
+
+<b>⚠️ DISCLAIMER: Bukan saran finansial</b>
+<b>🤖 Bot CRYPTOSCREENER AI v1.2</b>
+
+<i>Pastikan untuk selalu melakukan analisis lebih lanjut dan pertimbangan risiko sebelum mengambil keputusan trading.</i>"""
+
+# Pesan sistem untuk analyze_photo_async
+PHOTO_SYSTEM_MESSAGE = """Kamu adalah pendidik teknikal analisis yang fokus menganalisis pola visual dan struktur grafik. Tugas utamamu adalah mengidentifikasi dan menjelaskan pola-pola teknikal yang TERLIHAT pada grafik, bukan memberikan rekomendasi atau saran trading. 
+
+Mulai output langsung dengan '🔮 CRYPTOSCREENER AI 🔮' tanpa penjelasan atau disclaimer. Semua analisis adalah untuk tujuan pendidikan dan pemahaman pola grafik saja."""
+
+# Respons fallback sederhana jika model menolak dan header CRYPTOSCREENER AI tidak ditemukan
+PHOTO_FALLBACK_ANALYSIS = """🔮 CRYPTOSCREENER AI 🔮
+
+📊 ANALISIS CHART 📊
+Symbol: XAU/USD | Harga: Current
+
+📈 TREND
+- 🚀 TREND UTAMA: Saat ini tidak dapat dianalisis dengan jelas
+- 📊 PERGERAKAN HARGA: Perlu analisis lanjutan
+
+🔍 SUPPORT & RESISTANCE
+- 🛡️ SUPPORT KUNCI: Memerlukan analisis lebih detail
+- 🔥 RESISTANCE KUNCI: Memerlukan analisis lebih detail
+
+⚡ SETUP TRADING
+- 💎 POSISI: Tidak dapat ditentukan
+- 🎯 ENTRY: Perlu analisis lanjutan
+- ⏱️ DURASI: Tidak dapat diperkirakan
+
+<b>⚠️ DISCLAIMER: Bukan saran finansial</b>
+<b>🤖 Bot CRYPTOSCREENER AI v1.2</b>
+
+<i>Pastikan untuk selalu melakukan analisis lebih lanjut dan pertimbangan risiko sebelum mengambil keputusan trading.</i>"""
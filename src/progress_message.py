@@ -0,0 +1,184 @@
+import re
+import time
+import html
+import asyncio
+import logging
+from typing import Optional
+from telegram.constants import ChatAction, ParseMode
+from telegram.error import BadRequest, RetryAfter, TelegramError
+from src.analysis_formatter import render_html
+
+logger = logging.getLogger(__name__)
+
+# Batas panjang teks pesan Telegram
+MAX_MESSAGE_LENGTH = 4096
+
+PARTIAL_TAG_PATTERN = re.compile(r'</?[a-zA-Z0-9-]*(\s[^<>]*)?$')
+PARTIAL_ENTITY_PATTERN = re.compile(r'&#?[a-zA-Z0-9]*$')
+
+def render_partial_html(text: str, cursor: str = " ▌") -> str:
+    """
+    Ubah teks HTML yang belum selesai di-stream menjadi HTML yang valid untuk Telegram
+
+    Tag atau entity yang terpotong di akhir dibuang, sisanya dirender seperti
+    hasil akhir (lihat analysis_formatter), lalu tag yang masih terbuka
+    ditutup dalam urutan terbalik setelah penanda kursor.
+
+    Args:
+        text: Teks parsial dari model
+        cursor: Penanda bahwa teks masih bertambah
+
+    Returns:
+        str: HTML yang aman dikirim dengan parse_mode HTML
+    """
+    # Buang tag atau entity yang belum lengkap di akhir stream
+    partial = PARTIAL_TAG_PATTERN.search(text)
+    if partial:
+        text = text[:partial.start()]
+    partial = PARTIAL_ENTITY_PATTERN.search(text)
+    if partial:
+        text = text[:partial.start()]
+
+    rendered, stack = render_html(text)
+    rendered = rendered.rstrip() + html.escape(cursor)
+    return rendered + ''.join(f"</{name}>" for name in reversed(stack))
+
+class ProgressMessage:
+    """
+    Pesan "Sedang memproses..." yang diperbarui dengan analisis parsial selama streaming
+
+    Edit dibatasi paling sering sekali per interval per pesan agar tidak
+    terkena limit edit Telegram; RetryAfter menunda edit berikutnya.
+    """
+    def __init__(self, bot, chat_id: int, message_id: int, interval: float = 1.5):
+        """
+        Inisialisasi ProgressMessage
+
+        Args:
+            bot: telegram.Bot untuk mengedit pesan
+            chat_id: ID chat
+            message_id: ID pesan yang diedit
+            interval: Jarak minimum antar edit (detik)
+        """
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.interval = interval
+        self.edits = 0
+        self._next_edit = 0.0  # Edit pertama langsung saat konten pertama tiba
+        self._last_text: Optional[str] = None
+        self._stopped = False
+
+    async def update(self, text: str) -> None:
+        """
+        Perbarui pesan dengan teks parsial jika interval sudah lewat
+
+        Args:
+            text: Seluruh teks analisis yang sudah diterima sejauh ini
+        """
+        if self._stopped or time.monotonic() < self._next_edit:
+            return
+
+        rendered = render_partial_html(text)
+        if len(rendered) > MAX_MESSAGE_LENGTH:
+            # Teks parsial terlalu panjang untuk satu pesan; tunggu hasil akhir
+            self._stopped = True
+            return
+        if rendered == self._last_text:
+            return
+
+        try:
+            await self.bot.edit_message_text(
+                chat_id=self.chat_id,
+                message_id=self.message_id,
+                text=rendered,
+                parse_mode=ParseMode.HTML
+            )
+            self._last_text = rendered
+            self.edits += 1
+            self._next_edit = time.monotonic() + self.interval
+        except RetryAfter as e:
+            retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, 'total_seconds') else e.retry_after
+            logger.warning(f"Edit pesan progres dibatasi Telegram, coba lagi dalam {retry_after} detik")
+            self._next_edit = time.monotonic() + retry_after
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                # HTML parsial yang tetap ditolak atau pesan sudah dihapus: berhenti mengedit
+                logger.warning(f"Edit pesan progres gagal: {str(e)}")
+                self._stopped = True
+        except TelegramError as e:
+            logger.warning(f"Edit pesan progres gagal: {str(e)}")
+            self._next_edit = time.monotonic() + self.interval
+
+async def deliver_result(bot, chat_id: int, message_id: int, text: str) -> bool:
+    """
+    Ganti pesan "Sedang memproses..." dengan hasil akhir
+
+    Hasil dikirim dengan mengedit pesan progres (satu panggilan Bot API,
+    bukan kirim pesan baru lalu hapus). Pesan baru hanya dikirim jika teks
+    melebihi batas edit atau edit gagal (mis. pesan progres sudah dihapus
+    pengguna); pesan progres lalu dihapus seperti sebelumnya.
+
+    Args:
+        bot: telegram.Bot
+        chat_id: ID chat
+        message_id: ID pesan progres
+        text: Hasil dalam HTML
+
+    Returns:
+        bool: True jika hasil dikirim dengan mengedit pesan progres
+    """
+    if len(text) <= MAX_MESSAGE_LENGTH:
+        try:
+            await bot.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=text,
+                parse_mode=ParseMode.HTML
+            )
+            return True
+        except BadRequest as e:
+            if "not modified" in str(e).lower():
+                # Pesan progres sudah berisi hasil yang sama
+                return True
+            logger.warning(f"Edit pesan hasil gagal, mengirim pesan baru: {str(e)}")
+        except TelegramError as e:
+            logger.warning(f"Edit pesan hasil gagal, mengirim pesan baru: {str(e)}")
+
+    await bot.send_message(
+        chat_id=chat_id,
+        text=text,
+        parse_mode=ParseMode.HTML
+    )
+    try:
+        await bot.delete_message(chat_id=chat_id, message_id=message_id)
+    except TelegramError as e:
+        logger.warning(f"Hapus pesan progres gagal: {str(e)}")
+    return False
+
+async def keep_chat_action(bot, chat_id: int, action: str = ChatAction.TYPING, interval: float = 4.5) -> None:
+    """
+    Tampilkan status chat (mis. "mengetik...") sampai task ini dibatalkan
+
+    Telegram menghapus status chat setelah 5 detik atau saat bot mengirim
+    pesan, jadi status dikirim ulang setiap interval. Jalankan sebagai task
+    dan batalkan sebelum hasil dikirim.
+
+    Args:
+        bot: telegram.Bot
+        chat_id: ID chat
+        action: Status chat dari telegram.constants.ChatAction
+        interval: Jarak antar pengiriman status (detik)
+    """
+    while True:
+        try:
+            await bot.send_chat_action(chat_id=chat_id, action=action)
+        except RetryAfter as e:
+            retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, 'total_seconds') else e.retry_after
+            await asyncio.sleep(retry_after)
+            continue
+        except TelegramError as e:
+            # Status chat hanya pelengkap; jangan ganggu analisis
+            logger.debug(f"Kirim status chat gagal: {str(e)}")
+            return
+        await asyncio.sleep(interval)
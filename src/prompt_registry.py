@@ -0,0 +1,113 @@
+import math
+import logging
+from types import MappingProxyType
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Token tambahan per pesan chat (role dan pemisah) dan untuk pembuka balasan assistant
+TOKENS_PER_MESSAGE = 3
+TOKENS_REPLY_PRIMING = 3
+
+_encodings: Dict[str, Any] = {}
+
+def _get_encoding(model: str):
+    """
+    Dapatkan encoding tiktoken untuk model, atau None jika tiktoken tidak tersedia
+
+    tiktoken bersifat opsional; tanpa tiktoken (atau tanpa file encoding yang
+    biasanya diunduh saat pertama dipakai) jumlah token diperkirakan.
+    """
+    if model not in _encodings:
+        try:
+            import tiktoken
+            try:
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                # GPT kustom (g-...) memakai tokenizer gpt-4o
+                _encodings[model] = tiktoken.get_encoding('o200k_base')
+        except Exception as e:
+            logger.info(f"tiktoken tidak tersedia ({e.__class__.__name__}), jumlah token prompt diperkirakan")
+            _encodings[model] = None
+    return _encodings[model]
+
+def count_tokens(text: str, model: str = 'gpt-4o') -> Tuple[int, bool]:
+    """
+    Hitung jumlah token sebuah teks
+
+    Args:
+        text: Teks yang dihitung
+        model: Nama model untuk memilih tokenizer
+
+    Returns:
+        tuple: (jumlah token, True jika dihitung tiktoken atau False jika perkiraan)
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        # Perkiraan kasar: sekitar 4 karakter per token
+        return math.ceil(len(text) / 4), False
+    return len(encoding.encode(text)), True
+
+class PromptSet:
+    """
+    Kerangka pesan chat untuk satu profil, dibuat sekali saat startup
+
+    Pesan system dan bagian teks prompt sudah jadi; setiap request hanya
+    menyisipkan bagian gambar. Jumlah token setiap prompt dihitung di depan
+    sehingga terlihat berapa token input yang dipakai profil sebelum gambar.
+
+    Urutan pesan kanonik: bagian statis profil selalu di depan dan sama persis
+    byte demi byte (objek yang sama dipakai ulang), bagian per request (gambar)
+    selalu terakhir. GPT kustom dan model fallback mengirim awalan yang sama
+    sehingga prompt caching otomatis OpenAI bisa dipakai di semua cabang.
+    """
+    def __init__(self, prompts, model: str = 'gpt-4o'):
+        """
+        Inisialisasi PromptSet
+
+        Args:
+            prompts: Modul profil (src.profiles.h1/h4/m15)
+            model: Model untuk menghitung token
+        """
+        self.model = model
+        # Bagian pesan ini dipakai bersama oleh semua request dan tidak boleh diubah
+        self._photo_system = {"role": "system", "content": prompts.PHOTO_SYSTEM_MESSAGE}
+        self._photo_text = {"type": "text", "text": prompts.PHOTO_PROMPT}
+        self._structured_text = {"type": "text", "text": prompts.STRUCTURED_PROMPT}
+
+        counts = {}
+        exact = True
+        for name, text in (
+            ('photo_system', prompts.PHOTO_SYSTEM_MESSAGE),
+            ('photo_prompt', prompts.PHOTO_PROMPT),
+            ('structured_prompt', prompts.STRUCTURED_PROMPT)
+        ):
+            counts[name], counted = count_tokens(text, model)
+            exact = exact and counted
+        # Token sebelum gambar untuk satu request analyze_photo_async (system + user)
+        counts['photo_request'] = counts['photo_system'] + counts['photo_prompt'] + 2 * TOKENS_PER_MESSAGE + TOKENS_REPLY_PRIMING
+        counts['structured_request'] = counts['photo_system'] + counts['structured_prompt'] + 2 * TOKENS_PER_MESSAGE + TOKENS_REPLY_PRIMING
+        self.token_counts = MappingProxyType(counts)
+        self.exact = exact
+
+    @staticmethod
+    def image_part(base64_image: str, mime_type: str = "image/jpeg") -> Dict[str, Any]:
+        """Bagian pesan berisi gambar base64, satu-satunya bagian yang dibuat per request"""
+        return {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{base64_image}"}}
+
+    def photo_messages(self, image_part: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Pesan lengkap (system + user) untuk analyze_photo_async"""
+        return [self._photo_system, {"role": "user", "content": [self._photo_text, image_part]}]
+
+    def structured_photo_messages(self, image_part: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Pesan lengkap (system + user) untuk analyze_photo_async dalam mode STRUCTURED_OUTPUT"""
+        return [self._photo_system, {"role": "user", "content": [self._structured_text, image_part]}]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan jumlah token prompt
+
+        Returns:
+            dict: Jumlah token per prompt dan apakah hasilnya perkiraan
+        """
+        return {'tokens': dict(self.token_counts), 'exact': self.exact}
@@ -0,0 +1,100 @@
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+class UserRateLimiter:
+    """
+    Token bucket per pengguna di memori, dengan batas terpisah untuk admin
+
+    Setiap bucket berisi paling banyak `capacity` token dan terisi ulang
+    `per_minute` token per menit; satu chart memakai satu token. Bucket
+    disimpan dalam OrderedDict urut waktu akses terakhir, jadi bucket yang
+    sudah penuh kembali (sama dengan bucket baru) dibuang dari depan tanpa
+    memindai seluruh isi. Setiap pengecekan O(1) teramortisasi.
+    """
+    def __init__(self, capacity: int = 3, per_minute: float = 6.0,
+                 admin_capacity: int = 10, admin_per_minute: float = 30.0):
+        """
+        Inisialisasi UserRateLimiter
+
+        Args:
+            capacity: Jumlah chart beruntun yang boleh dikirim pengguna biasa
+            per_minute: Token yang terisi ulang per menit untuk pengguna biasa (0 untuk tanpa batas)
+            admin_capacity: Jumlah chart beruntun untuk admin
+            admin_per_minute: Token yang terisi ulang per menit untuk admin (0 untuk tanpa batas)
+        """
+        self._limits = {
+            False: (max(1, capacity), per_minute / 60.0),
+            True: (max(1, admin_capacity), admin_per_minute / 60.0)
+        }
+        # Bucket yang tidak dipakai selama ini sudah penuh kembali dan boleh dibuang
+        self._idle_ttl = max(
+            (capacity / rate for capacity, rate in self._limits.values() if rate > 0),
+            default=0.0
+        )
+        # user_id -> [token, waktu update terakhir, admin]
+        self._buckets: "OrderedDict[int, List[Any]]" = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+
+    def acquire(self, user_id: int, is_admin: bool = False) -> float:
+        """
+        Ambil satu token untuk pengguna
+
+        Args:
+            user_id: ID pengguna Telegram
+            is_admin: Pakai batas admin
+
+        Returns:
+            float: 0 jika diizinkan, selain itu detik sampai token berikutnya tersedia
+        """
+        capacity, rate = self._limits[is_admin]
+        if rate <= 0:
+            self.allowed += 1
+            return 0.0
+
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        bucket = self._buckets.get(user_id)
+        if bucket is None or bucket[2] != is_admin:
+            bucket = [float(capacity), now, is_admin]
+            self._buckets[user_id] = bucket
+        else:
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            self._buckets.move_to_end(user_id)
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            self.allowed += 1
+            return 0.0
+        self.limited += 1
+        return (1.0 - bucket[0]) / rate
+
+    def _evict_idle(self, now: float) -> None:
+        """Buang bucket dari depan yang sudah tidak dipakai selama idle_ttl"""
+        while self._buckets:
+            user_id, bucket = next(iter(self._buckets.items()))
+            if now - bucket[1] < self._idle_ttl:
+                break
+            del self._buckets[user_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan statistik rate limit
+
+        Returns:
+            dict: Jumlah bucket aktif, request diizinkan dan ditolak
+        """
+        self._evict_idle(time.monotonic())
+        return {
+            'buckets': len(self._buckets),
+            'allowed': self.allowed,
+            'limited': self.limited,
+            'capacity': self._limits[False][0],
+            'per_minute': self._limits[False][1] * 60.0
+        }
@@ -0,0 +1,79 @@
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """
+    Cache LRU di memori dengan TTL untuk hasil analisis
+
+    Kunci cache adalah file_unique_id foto Telegram ditambah kunci profil
+    (prompt dan model), sehingga chart yang di-forward ke banyak user hanya
+    dianalisis sekali.
+    """
+    def __init__(self, max_size: int = 1000, ttl: float = 3600.0):
+        """
+        Inisialisasi ResultCache
+
+        Args:
+            max_size: Jumlah maksimum hasil yang disimpan
+            ttl: Umur maksimum hasil dalam detik
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Ambil hasil analisis dari cache
+
+        Args:
+            key: Kunci cache
+
+        Returns:
+            str: Hasil analisis, atau None jika tidak ada atau sudah kedaluwarsa
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, analysis: str) -> None:
+        """
+        Simpan hasil analisis ke cache
+
+        Args:
+            key: Kunci cache
+            analysis: Hasil analisis yang sudah terformat
+        """
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic(), analysis)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan statistik cache
+
+        Returns:
+            dict: Jumlah entri, hit, miss dan rasio hit
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
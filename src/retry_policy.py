@@ -0,0 +1,57 @@
+import random
+import logging
+import openai
+
+logger = logging.getLogger(__name__)
+
+# Status HTTP yang layak dicoba lagi (timeout, konflik sementara dan error server)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 500, 502, 503, 504})
+
+class RetryPolicy:
+    """
+    Kebijakan percobaan ulang request OpenAI dengan exponential backoff dan jitter
+
+    Jeda percobaan ke-n dipilih acak antara 0 dan min(max_delay, base_delay * 2^n)
+    (full jitter) agar banyak request yang gagal bersamaan tidak mencoba lagi
+    serentak. Hanya error koneksi dan status sementara yang dicoba lagi; 429
+    ditangani terpisah oleh AdaptiveLimiter.
+    """
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.5, max_delay: float = 8.0):
+        """
+        Inisialisasi RetryPolicy
+
+        Args:
+            max_retries: Jumlah percobaan ulang maksimum
+            base_delay: Jeda dasar sebelum percobaan ulang pertama (detik)
+            max_delay: Jeda maksimum antar percobaan (detik)
+        """
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """
+        Cek apakah error bersifat sementara
+
+        Args:
+            error: Exception dari client OpenAI
+
+        Returns:
+            bool: True untuk error koneksi/timeout dan status 408, 409 atau 5xx
+        """
+        if isinstance(error, openai.APIConnectionError):
+            return True
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+        return False
+
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """Cek apakah percobaan ke-attempt (mulai 0) boleh diulang setelah error"""
+        return attempt < self.max_retries and self.is_retryable(error)
+
+    def delay(self, attempt: int) -> float:
+        """Jeda acak sebelum percobaan ulang ke-attempt (mulai 0)"""
+        self.retries += 1
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
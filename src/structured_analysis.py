@@ -0,0 +1,156 @@
+import json
+import html
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+def _string(description: str) -> Dict[str, Any]:
+    return {"type": "string", "description": description}
+
+def _level(description: str) -> Dict[str, Any]:
+    """Level harga beserta persentase jaraknya dari harga entry"""
+    return {
+        "type": "object",
+        "properties": {
+            "price": _string(description),
+            "percent": {"type": "number", "description": "Persentase dari harga entry, negatif jika turun"}
+        },
+        "required": ["price", "percent"],
+        "additionalProperties": False
+    }
+
+# Skema JSON hasil analisis foto. Harga berupa string agar format angka di chart (mis. "64.200") tetap utuh
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "symbol": _string("Pasangan yang terlihat di chart, mis. BTC/USDT"),
+        "price": _string("Harga terkini yang terlihat di chart"),
+        "trend": _string("Trend utama: uptrend, downtrend atau sideways, dengan penjelasan singkat"),
+        "price_action": _string("Pergerakan harga terkini"),
+        "support": _string("Level support kunci"),
+        "resistance": _string("Level resistance kunci"),
+        "position": {"type": "string", "enum": ["LONG", "SHORT"]},
+        "entry": _string("Harga atau area entry"),
+        "duration": _string("Estimasi waktu pergerakan"),
+        "targets": {"type": "array", "items": _level("Harga target profit"), "description": "Target profit, terdekat lebih dulu"},
+        "stop_loss": _level("Harga stop loss"),
+        "risk_reward": _string("Rasio risk:reward, mis. 1:2.5"),
+        "scenarios": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "condition": _string("Kondisi, mis. Jika TP tercapai"),
+                    "action": _string("Tindakan selanjutnya")
+                },
+                "required": ["condition", "action"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": [
+        "symbol", "price", "trend", "price_action", "support", "resistance", "position",
+        "entry", "duration", "targets", "stop_loss", "risk_reward", "scenarios"
+    ],
+    "additionalProperties": False
+}
+
+# Parameter response_format untuk chat completion (structured outputs dengan skema ketat)
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "chart_analysis", "strict": True, "schema": ANALYSIS_SCHEMA}
+}
+
+# Ikon baris target dan skenario sesuai urutannya
+TARGET_ICONS = ('🥉', '🥈', '🥇')
+SCENARIO_ICONS = ('✅', '❌', '🔄')
+
+class AnalysisRefusedError(Exception):
+    """Model menolak menganalisis chart (field refusal pada respons structured output)"""
+    pass
+
+def _text(value: Any) -> str:
+    """Nilai dari model sebagai teks HTML yang aman; kosong menjadi '-'"""
+    if value is None or value == '':
+        return '-'
+    return html.escape(str(value), quote=False)
+
+def _percent(value: Any) -> str:
+    """Persentase bertanda, mis. 2.6 -> '+2.6%'"""
+    try:
+        return f"{float(value):+g}%"
+    except (TypeError, ValueError):
+        return _text(value)
+
+def _level_text(level: Any) -> str:
+    """Level harga dengan persentase, mis. '3.180 (+2.6%)'"""
+    if not isinstance(level, dict):
+        return _text(level)
+    if level.get('percent') is None:
+        return _text(level.get('price'))
+    return f"{_text(level.get('price'))} ({_percent(level.get('percent'))})"
+
+def _lines(items: Any, icons: tuple, render) -> str:
+    """Baris daftar '- ikon isi'; ikon terakhir dipakai untuk sisa item"""
+    if not isinstance(items, list) or not items:
+        return f"- {icons[0]} -"
+    return "\n".join(
+        f"- {icons[min(index, len(icons) - 1)]} {render(index, item)}" for index, item in enumerate(items)
+    )
+
+def parse_structured_analysis(content: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Baca JSON analisis dari respons model
+
+    Args:
+        content: Isi pesan respons
+
+    Returns:
+        dict: Field analisis, atau None jika respons bukan objek JSON (mis. GPT kustom
+            yang mengabaikan response_format dan menjawab dengan teks template)
+    """
+    if not content:
+        return None
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def render_analysis(data: Dict[str, Any], template: str) -> str:
+    """
+    Render analisis terstruktur menjadi HTML Telegram dengan template profil
+
+    Semua nilai dari model di-escape; placeholder template: symbol, coin, price,
+    trend, price_action, support, resistance, position, entry, duration,
+    targets, stop_loss, risk_reward dan scenarios.
+
+    Args:
+        data: Field analisis dari parse_structured_analysis
+        template: RESULT_TEMPLATE profil (str.format)
+
+    Returns:
+        str: Analisis siap kirim dengan parse_mode HTML
+    """
+    symbol = data.get('symbol') or ''
+    return template.format(
+        symbol=_text(symbol),
+        coin=_text(symbol.split('/')[0].strip() if isinstance(symbol, str) else symbol),
+        price=_text(data.get('price')),
+        trend=_text(data.get('trend')),
+        price_action=_text(data.get('price_action')),
+        support=_text(data.get('support')),
+        resistance=_text(data.get('resistance')),
+        position=_text(data.get('position')),
+        entry=_text(data.get('entry')),
+        duration=_text(data.get('duration')),
+        targets=_lines(data.get('targets'), TARGET_ICONS, lambda i, level: f"Target {i + 1}: {_level_text(level)}"),
+        stop_loss=_level_text(data.get('stop_loss')),
+        risk_reward=_text(data.get('risk_reward')),
+        scenarios=_lines(
+            data.get('scenarios'), SCENARIO_ICONS,
+            lambda i, scenario: f"{_text(scenario.get('condition'))}: {_text(scenario.get('action'))}"
+            if isinstance(scenario, dict) else _text(scenario)
+        )
+    )
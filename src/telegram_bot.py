@@ -0,0 +1,658 @@
+import io
+import math
+import csv
+import uuid
+import logging
+import traceback
+import re
+import datetime
+import functools
+import html
+import asyncio
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ParseMode
+from telegram.ext import (
+    Application,
+    CommandHandler,
+    MessageHandler,
+    CallbackQueryHandler,
+    filters,
+    ContextTypes
+)
+from src.config import STREAM_ANALYSIS, STREAM_EDIT_INTERVAL, STRUCTURED_OUTPUT, UPDATE_CONCURRENCY
+from src.analysis_queue import QueueFullError
+from src.openai_client import FallbackAnalysis
+from src.progress_message import ProgressMessage, deliver_result, keep_chat_action
+from src.phash_cache import dhash
+from src.update_processor import ChatOrderedUpdateProcessor
+import openai
+
+logger = logging.getLogger(__name__)
+
+# Jenis update yang benar-benar ditangani bot; update lain tidak perlu dikirim Telegram
+ALLOWED_UPDATES = [Update.MESSAGE]
+
+# Ukuran maksimum file CSV/TXT untuk /adduser dan /removeuser massal
+MAX_USER_FILE_SIZE = 1024 * 1024
+
+# Batas ID pengguna Telegram yang masuk akal (bilangan bulat positif 52-bit)
+MAX_USER_ID = 2 ** 52
+
+def is_user_id_token(token):
+    """Cek token hanya berisi angka ASCII; str.isdigit juga menerima digit Unicode seperti '²' yang ditolak int()"""
+    return token.isascii() and token.isdigit()
+
+def parse_user_ids(text, is_csv=False):
+    """
+    Ambil user_id dari teks perintah atau isi file
+    
+    Args:
+        text: Teks berisi ID yang dipisahkan spasi, koma, titik koma atau baris baru
+        is_csv: Jika True, hanya kolom pertama setiap baris yang dibaca dan baris header dilewati
+    
+    Returns:
+        tuple: (daftar user_id valid, daftar token tidak valid)
+    """
+    if is_csv:
+        rows = [row for row in csv.reader(io.StringIO(text)) if row and row[0].strip()]
+        tokens = [row[0].strip() for row in rows]
+        # Baris pertama yang bukan angka dianggap header (mis. "user_id")
+        if tokens and not is_user_id_token(tokens[0]):
+            tokens = tokens[1:]
+    else:
+        tokens = [token for token in re.split(r'[\s,;]+', text) if token]
+    
+    user_ids, invalid = [], []
+    for token in tokens:
+        if is_user_id_token(token) and 0 < int(token) < MAX_USER_ID:
+            user_ids.append(int(token))
+        else:
+            invalid.append(token)
+    return user_ids, invalid
+
+def access_control(admin_only=False, rate_limited=False):
+    """
+    Dekorator untuk memeriksa akses pengguna ke bot
+    
+    Args:
+        admin_only: Apakah fitur hanya untuk admin
+        rate_limited: Apakah setiap pemanggilan memakai satu token rate limit pengguna
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+            user_id = update.effective_user.id
+            
+            # Cek apakah user diizinkan
+            if admin_only and not self.user_manager.is_admin(user_id):
+                await update.message.reply_text(
+                    "⛔ Maaf, fitur ini hanya tersedia untuk admin.",
+                    parse_mode=ParseMode.HTML
+                )
+                logger.warning(f"User {user_id} mencoba mengakses fitur admin")
+                return
+            
+            if not self.user_manager.is_allowed(user_id):
+                await update.message.reply_text(
+                    f"⛔ <b>Akses Ditolak</b>\n\n"
+                    f"Maaf, Anda tidak memiliki akses ke {self.profile.bot_name}.\n\n"
+                    f"Silakan hubungi admin untuk mendapatkan akses.",
+                    parse_mode=ParseMode.HTML
+                )
+                logger.warning(f"User {user_id} ditolak aksesnya")
+                return
+            
+            # Rate limit dicek sebelum foto diunduh atau dikirim ke OpenAI
+            if rate_limited:
+                wait = self.rate_limiter.acquire(user_id, self.user_manager.is_admin(user_id))
+                if wait > 0:
+                    await update.message.reply_text(
+                        f"⏳ <b>Terlalu banyak chart</b>\n\n"
+                        f"Silakan coba lagi dalam {max(1, math.ceil(wait))} detik.",
+                        parse_mode=ParseMode.HTML
+                    )
+                    logger.info(f"User {user_id} terkena rate limit, coba lagi dalam {wait:.1f} detik")
+                    return
+            
+            # Jalankan fungsi asli
+            return await func(self, update, context, *args, **kwargs)
+        return wrapper
+    return decorator
+
+class TelegramBot:
+    def __init__(self, profile, host):
+        """
+        Bot Telegram untuk satu profil timeframe
+        
+        Args:
+            profile: Profile dengan token bot, GPT kustom dan prompt
+            host: BotHost yang menyediakan OpenAI client, antrian, cache dan daftar pengguna bersama
+        """
+        self.profile = profile
+        # Update dari chat berbeda diproses bersamaan, update satu chat tetap berurutan
+        self.update_processor = ChatOrderedUpdateProcessor(UPDATE_CONCURRENCY)
+        # Pool koneksi terpisah untuk getUpdates, pengiriman dan download file
+        self.transport = host.telegram_transport
+        builder, self.download_request = self.transport.configure(Application.builder().token(profile.token))
+        self.application = builder.concurrent_updates(self.update_processor).build()
+        self.openai_client = host.openai_client
+        self.user_manager = host.user_manager
+        self.analysis_queue = host.analysis_queue
+        self.result_cache = host.result_cache
+        self.phash_cache = host.phash_cache
+        self.rate_limiter = host.rate_limiter
+        
+        logger.info(f"{profile.bot_name} bot diinisialisasi")
+        
+        # Tambahkan handler
+        self._add_handlers()
+    
+    def _add_handlers(self):
+        """Menambahkan handler untuk perintah dan pesan"""
+        # Handler untuk perintah /start
+        self.application.add_handler(CommandHandler("start", self.start_command))
+        
+        # Handler untuk perintah /help
+        self.application.add_handler(CommandHandler("help", self.help_command))
+        
+        # Handler untuk perintah admin
+        self.application.add_handler(CommandHandler("admin", self.admin_command))
+        self.application.add_handler(CommandHandler("adduser", self.add_user_command))
+        self.application.add_handler(CommandHandler("removeuser", self.remove_user_command))
+        self.application.add_handler(CommandHandler("listusers", self.list_users_command))
+        self.application.add_handler(CommandHandler("stats", self.stats_command))
+        
+        # Handler untuk file CSV/TXT berisi user_id dengan caption /adduser atau /removeuser
+        self.application.add_handler(MessageHandler(
+            filters.Document.ALL & filters.CaptionRegex(r'^/(adduser|removeuser)(@\w+)?(\s|$)'),
+            self.handle_user_document
+        ))
+        
+        # Handler untuk gambar
+        self.application.add_handler(MessageHandler(filters.PHOTO, self.handle_photo))
+        
+        # Handler untuk pesan teks
+        self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_text))
+        
+        logger.info("Handler bot Telegram ditambahkan")
+    
+    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk perintah /start"""
+        user = update.effective_user
+        user_id = user.id
+        
+        # Cek apakah user diizinkan
+        if not self.user_manager.is_allowed(user_id):
+            await update.message.reply_text(
+                f"👋 Halo {user.first_name}!\n\n"
+                f"Maaf, Anda belum memiliki akses ke {self.profile.bot_name}.\n"
+                f"Silakan hubungi admin untuk mendapatkan akses.",
+                parse_mode=ParseMode.HTML
+            )
+            logger.info(f"User {user_id} mencoba memulai bot tapi tidak memiliki akses")
+            return
+        
+        await update.message.reply_text(
+            f"Halo {user.first_name}! 👋\n\n"
+            f"Selamat datang di {self.profile.bot_name}! Saya adalah bot yang akan membantu menganalisis grafik trading crypto.\n\n"
+            f"Cukup kirimkan gambar grafik trading Anda, dan saya akan memberikan analisis lengkap.\n\n"
+            f"Ketik /help untuk informasi lebih lanjut."
+        )
+        logger.info(f"User {user.id} memulai bot")
+    
+    @access_control()
+    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk perintah /help"""
+        user = update.effective_user
+        is_admin = self.user_manager.is_admin(user.id)
+        
+        help_text = (
+            f"<b>🔍 PANDUAN PENGGUNAAN {self.profile.bot_name}</b>\n\n"
+            "<b>Langkah-langkah:</b>\n"
+            "1️⃣ Kirim gambar grafik trading crypto untuk dianalisis\n"
+            f"2️⃣ Pastikan grafik dalam timeframe {self.profile.timeframe} untuk hasil optimal\n"
+            "3️⃣ Bot akan menganalisis gambar dengan AI\n"
+            "4️⃣ Tunggu beberapa saat untuk menerima hasil analisis\n\n"
+            "<b>Analisis akan mencakup:</b>\n"
+            "• <b>Support & Resistance</b> - Level kunci untuk pergerakan harga\n"
+            "• <b>Trend Direction</b> - Arah pergerakan market\n"
+            "• <b>Entry Points</b> - Rekomendasi titik masuk posisi\n"
+            "• <b>Take Profit & Stop Loss</b> - Level manajemen risiko\n\n"
+            "<b>Perintah yang tersedia:</b>\n"
+            "/start - Memulai bot\n"
+            "/help - Menampilkan bantuan ini"
+        )
+        
+        # Tambahkan perintah admin jika user adalah admin
+        if is_admin:
+            help_text += "\n\n<b>Perintah Admin:</b>\n"
+            help_text += "/admin - Panel admin\n"
+            help_text += "/adduser [user_id ...] - Tambahkan satu atau banyak user\n"
+            help_text += "/removeuser [user_id ...] - Hapus satu atau banyak user\n"
+            help_text += "/listusers - Lihat daftar user\n"
+            help_text += "/stats - Lihat statistik bot"
+        
+        await update.message.reply_text(help_text, parse_mode=ParseMode.HTML)
+        logger.info(f"User {update.effective_user.id} meminta bantuan")
+    
+    @access_control(admin_only=True)
+    async def admin_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk perintah /admin"""
+        help_text = (
+            "<b>🔧 PANEL ADMIN</b>\n\n"
+            "<b>Perintah yang tersedia:</b>\n"
+            "/adduser [user_id ...] - Tambahkan satu atau banyak user\n"
+            "/removeuser [user_id ...] - Hapus satu atau banyak user\n"
+            "/listusers - Lihat daftar user\n"
+            "/stats - Lihat statistik antrian, cache, API dan circuit breaker\n\n"
+            "<b>Contoh:</b>\n"
+            "/adduser 123456789 - Tambahkan user dengan ID 123456789\n"
+            "/adduser 111 222 333 - Tambahkan beberapa user sekaligus\n"
+            "/removeuser 123456789 - Hapus user dengan ID 123456789\n\n"
+            "Untuk banyak user, kirim file CSV/TXT berisi user_id dengan caption /adduser atau /removeuser "
+            "(atau balas file tersebut dengan perintahnya)"
+        )
+        
+        await update.message.reply_text(help_text, parse_mode=ParseMode.HTML)
+        logger.info(f"User {update.effective_user.id} mengakses panel admin")
+    
+    @access_control(admin_only=True)
+    async def add_user_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk perintah /adduser (satu atau banyak user_id, atau file CSV/TXT)"""
+        await self._update_users(update, context, add=True)
+    
+    @access_control(admin_only=True)
+    async def remove_user_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk perintah /removeuser (satu atau banyak user_id, atau file CSV/TXT)"""
+        await self._update_users(update, context, add=False)
+    
+    @access_control(admin_only=True)
+    async def handle_user_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk file CSV/TXT berisi user_id dengan caption /adduser atau /removeuser"""
+        command = update.message.caption.split()[0].split('@')[0].lower()
+        await self._update_users(update, context, add=(command == '/adduser'))
+    
+    async def _read_user_document(self, document):
+        """
+        Download dan parse file CSV/TXT berisi user_id
+        
+        Returns:
+            tuple: (daftar user_id, daftar token tidak valid), atau None jika file ditolak
+        """
+        file_name = (document.file_name or '').lower()
+        is_csv = file_name.endswith('.csv') or document.mime_type == 'text/csv'
+        if not (is_csv or file_name.endswith('.txt') or (document.mime_type or '').startswith('text/')):
+            return None
+        if document.file_size and document.file_size > MAX_USER_FILE_SIZE:
+            return None
+        
+        document_file = await document.get_file()
+        data = await self.transport.download(document_file, self.download_request)
+        return parse_user_ids(bytes(data).decode('utf-8', errors='replace'), is_csv)
+    
+    async def _update_users(self, update: Update, context: ContextTypes.DEFAULT_TYPE, add: bool):
+        """Tambah atau hapus banyak user sekaligus dengan satu penulisan, lalu kirim ringkasan"""
+        command = "/adduser" if add else "/removeuser"
+        message = update.message
+        
+        # ID dari argumen perintah atau dari caption file
+        if context.args is not None:
+            args = context.args
+        else:
+            args = (message.caption or '').split()[1:]
+        user_ids, invalid = parse_user_ids(' '.join(args))
+        
+        # ID dari file yang dikirim bersama perintah atau yang dibalas dengan perintah
+        document = message.document or (message.reply_to_message.document if message.reply_to_message else None)
+        if document is not None:
+            parsed = await self._read_user_document(document)
+            if parsed is None:
+                await message.reply_text(
+                    f"❌ <b>Error:</b> File harus berupa CSV atau TXT dengan ukuran maksimal {MAX_USER_FILE_SIZE // 1024} KB",
+                    parse_mode=ParseMode.HTML
+                )
+                return
+            user_ids += parsed[0]
+            invalid += parsed[1]
+        
+        if not user_ids and not invalid:
+            await message.reply_text(
+                f"❌ <b>Error:</b> Format yang benar adalah {command} [user_id] [user_id ...] "
+                f"atau kirim file CSV/TXT dengan caption {command}",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        # Satu ID tanpa file: balasan singkat seperti sebelumnya
+        if len(user_ids) == 1 and not invalid and document is None:
+            await self._update_single_user(update, user_ids[0], add)
+            return
+        
+        protected = []
+        if add:
+            changed, skipped = self.user_manager.add_allowed_users(user_ids)
+        else:
+            # Admin tidak menghapus dirinya sendiri lewat perintah massal
+            own_id = update.effective_user.id
+            protected = [own_id] if own_id in user_ids and self.user_manager.is_admin(own_id) else []
+            changed, skipped = self.user_manager.remove_allowed_users([user_id for user_id in user_ids if user_id not in protected])
+        
+        summary = f"📋 <b>Hasil {command}</b>\n\n"
+        summary += f"✅ {'Ditambahkan' if add else 'Dihapus'}: {len(changed)}\n"
+        summary += f"ℹ️ {'Sudah ada' if add else 'Tidak ditemukan'}: {len(skipped) + len(protected)}\n"
+        summary += f"❌ Tidak valid: {len(invalid)}"
+        if invalid:
+            shown = ', '.join(html.escape(token[:32]) for token in invalid[:10])
+            summary += f" ({shown}{', ...' if len(invalid) > 10 else ''})"
+        await message.reply_text(summary, parse_mode=ParseMode.HTML)
+        logger.info(
+            f"Admin {update.effective_user.id} {command}: {len(changed)} diubah, "
+            f"{len(skipped) + len(protected)} dilewati, {len(invalid)} tidak valid"
+        )
+    
+    async def _update_single_user(self, update: Update, user_id: int, add: bool):
+        """Tambah atau hapus satu user dengan balasan per user"""
+        if add:
+            # Tambahkan user
+            if self.user_manager.add_allowed_user(user_id):
+                await update.message.reply_text(
+                    f"✅ <b>Berhasil:</b> User ID {user_id} ditambahkan ke daftar yang diizinkan",
+                    parse_mode=ParseMode.HTML
+                )
+                logger.info(f"Admin {update.effective_user.id} menambahkan user {user_id}")
+            else:
+                await update.message.reply_text(
+                    f"ℹ️ <b>Info:</b> User ID {user_id} sudah ada dalam daftar yang diizinkan",
+                    parse_mode=ParseMode.HTML
+                )
+            return
+        
+        # Cek apakah user adalah admin yang mencoba menghapus dirinya sendiri
+        if user_id == update.effective_user.id and self.user_manager.is_admin(user_id):
+            await update.message.reply_text(
+                "❌ <b>Error:</b> Anda tidak dapat menghapus diri sendiri dari daftar admin",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        # Hapus user
+        if self.user_manager.remove_allowed_user(user_id):
+            await update.message.reply_text(
+                f"✅ <b>Berhasil:</b> User ID {user_id} dihapus dari daftar yang diizinkan",
+                parse_mode=ParseMode.HTML
+            )
+            logger.info(f"Admin {update.effective_user.id} menghapus user {user_id}")
+        else:
+            await update.message.reply_text(
+                f"ℹ️ <b>Info:</b> User ID {user_id} tidak ditemukan dalam daftar yang diizinkan",
+                parse_mode=ParseMode.HTML
+            )
+    
+    @access_control(admin_only=True)
+    async def list_users_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk perintah /listusers"""
+        admins = self.user_manager.get_admins()
+        allowed_users = self.user_manager.get_allowed_users()
+        
+        message = "<b>👥 DAFTAR PENGGUNA</b>\n\n"
+        
+        if admins:
+            message += "<b>Admin:</b>\n"
+            for admin_id in admins:
+                message += f"🔑 {admin_id}\n"
+        else:
+            message += "<b>Admin:</b> Tidak ada\n"
+        
+        message += "\n"
+        
+        if allowed_users:
+            message += "<b>Pengguna yang Diizinkan:</b>\n"
+            for user_id in allowed_users:
+                message += f"👤 {user_id}\n"
+        else:
+            message += "<b>Pengguna yang Diizinkan:</b> Tidak ada\n"
+        
+        await update.message.reply_text(message, parse_mode=ParseMode.HTML)
+        logger.info(f"Admin {update.effective_user.id} melihat daftar pengguna")
+    
+    @access_control(admin_only=True)
+    async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk perintah /stats"""
+        queue_stats = self.analysis_queue.get_stats()
+        health = self.openai_client.health_monitor.get_stats()
+        limiter = self.openai_client.limiter.get_stats()
+        images = self.openai_client.image_processor.get_stats()
+        cache = self.result_cache.get_stats()
+        phash = self.phash_cache.get_stats()
+        limits = self.rate_limiter.get_stats()
+        breakers = self.openai_client.circuit_breaker.get_stats()
+        
+        message = "<b>📊 STATISTIK BOT</b>\n"
+        message += f"🤖 Profil {self.profile.name} ({self.profile.profile_name}), antrian dan cache dipakai bersama semua profil\n\n"
+        
+        message += "<b>Antrian Analisis:</b>\n"
+        message += f"⚙️ Worker: {queue_stats['running']}/{queue_stats['workers']} aktif\n"
+        message += f"⏳ Menunggu: {queue_stats['pending']}/{queue_stats['max_size']} ({queue_stats['users']} user)\n"
+        message += f"✅ Selesai: {queue_stats['processed']} | ⛔ Ditolak: {queue_stats['rejected']}\n"
+        updates = self.update_processor.get_stats()
+        message += f"📨 Update: {updates['running']}/{updates['max_concurrent_updates']} diproses, "
+        message += f"{updates['waiting']} menunggu giliran chat\n"
+        transport = self.transport.get_stats()
+        message += f"🔌 Bot API: HTTP/{transport['http_version']}, pool kirim {transport['pool_size']}, "
+        message += f"download {transport['download_pool_size']}, keepalive {transport['keepalive_expiry']:g} detik\n"
+        message += f"🚦 Rate limit: {limits['capacity']} chart beruntun, {limits['per_minute']:g}/menit, "
+        message += f"{limits['limited']} ditolak ({limits['buckets']} user aktif)\n\n"
+        
+        message += "<b>Cache Hasil:</b>\n"
+        message += f"💾 {cache['size']}/{cache['max_size']} entri, hit {cache['hits']}, miss {cache['misses']} ({cache['hit_ratio']:.0%})\n"
+        message += f"🧩 Chart mirip: {phash['size']}/{phash['max_size']} entri, hit {phash['hits']}, miss {phash['misses']}\n\n"
+        
+        prompt_stats = self.profile.prompt_set.get_stats()
+        prefix = "" if prompt_stats['exact'] else "~"
+        mode = 'structured' if STRUCTURED_OUTPUT else 'photo'
+        message += "<b>Token Prompt Profil:</b>\n"
+        message += f"📝 Analisis foto{' (JSON terstruktur)' if STRUCTURED_OUTPUT else ''}: "
+        message += f"{prefix}{prompt_stats['tokens'][f'{mode}_request']} token sebelum gambar "
+        message += f"(system {prompt_stats['tokens']['photo_system']}, prompt {prompt_stats['tokens'][f'{mode}_prompt']})\n\n"
+        
+        message += "<b>OpenAI API:</b> "
+        message += "🟢 Sehat\n" if health['healthy'] else f"🔴 Tidak sehat ({html.escape(str(health['last_error']))})\n"
+        message += f"🚥 Request bersamaan: {limiter['in_flight']}/{limiter['limit']} (maks {limiter['max_concurrency']}), "
+        message += f"menunggu {limiter['waiting']}, 429: {limiter['rate_limited']}"
+        if limiter['paused_for'] > 0:
+            message += f", jeda {limiter['paused_for']:.0f} detik"
+        message += "\n"
+        latency = self.openai_client.get_latency_stats()
+        message += f"🔁 Retry: {latency['retries']} | Hedge: {latency['hedges']} (menang {latency['hedge_wins']})\n"
+        for model, status in latency['models'].items():
+            if status['p95'] is not None:
+                message += f"⏱️ <code>{html.escape(model)}</code>: p50 {status['p50']:.1f}s, p95 {status['p95']:.1f}s ({status['samples']} sampel)\n"
+        for model, status in latency['usage'].items():
+            message += f"🗄️ <code>{html.escape(model)}</code>: {status['cached_ratio']:.0%} token prompt dari cache "
+            message += f"({status['cache_hits']}/{status['requests']} request)"
+            if status['hit_latency'] is not None and status['miss_latency'] is not None:
+                message += f", rata-rata {status['hit_latency']:.1f}s vs {status['miss_latency']:.1f}s tanpa cache"
+            message += "\n"
+        
+        message += "\n<b>Preprocessing Gambar:</b>\n"
+        message += f"🖼️ {images['images']} gambar, hemat {images['bytes_saved']/1024:.1f} KB dan {images['tokens_saved']} token vision\n"
+        
+        if breakers:
+            message += "\n<b>Circuit Breaker:</b>\n"
+            for model, status in breakers.items():
+                message += f"🔌 <code>{model}</code>: {status['state']} (gagal {status['failures']}, trip {status['trips']})"
+                if status['cooldown_remaining'] is not None:
+                    message += f", probe dalam {status['cooldown_remaining']:.0f} detik"
+                message += "\n"
+        
+        await update.message.reply_text(message, parse_mode=ParseMode.HTML)
+        logger.info(f"Admin {update.effective_user.id} melihat statistik bot")
+    
+    @access_control(rate_limited=True)
+    async def handle_photo(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle incoming photos by queueing them for analysis."""
+        chat_id = update.effective_chat.id
+        user_id = update.effective_user.id
+        
+        try:
+            # Forwarded charts keep their file_unique_id - answer from the cache without downloading
+            photo = update.message.photo[-1]
+            cache_key = f"{photo.file_unique_id}:{self.profile.key}"
+            analysis = self.result_cache.get(cache_key)
+            if analysis is not None:
+                await context.bot.send_message(
+                    chat_id=chat_id,
+                    text=analysis,
+                    parse_mode=ParseMode.HTML
+                )
+                logger.info(f"Served cached analysis to user {user_id}")
+                return
+            
+            # Reject early so a full queue doesn't cost a "Processing..." message
+            self.analysis_queue.ensure_capacity()
+            
+            # Send a "Processing..." message with the position in the queue
+            position = self.analysis_queue.next_position(user_id)
+            if position:
+                text = f"⏳ <b>Chart Anda dalam antrian</b> (posisi {position})..."
+            else:
+                text = "⏳ <b>Sedang memproses chart...</b>"
+            processing_message = await context.bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                parse_mode=ParseMode.HTML
+            )
+            
+            # The worker pool downloads, analyzes and replies; fairness is per user
+            await self.analysis_queue.submit(
+                user_id,
+                functools.partial(self._process_photo, context, chat_id, user_id, photo, processing_message, cache_key)
+            )
+            
+        except QueueFullError:
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text="⚠️ <b>Antrian penuh:</b> Terlalu banyak chart yang sedang dianalisis. Silakan coba lagi beberapa saat lagi.",
+                parse_mode=ParseMode.HTML
+            )
+            logger.warning(f"Antrian analisis penuh, foto dari user {user_id} ditolak")
+        except Exception as e:
+            logging.error(f"Error queueing photo from user {user_id}: {e}")
+            traceback_str = traceback.format_exc()
+            logging.error(f"Traceback: {traceback_str}")
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text=f"⚠️ <b>Error:</b> Terjadi kesalahan saat memproses foto. Silakan coba lagi nanti.",
+                parse_mode=ParseMode.HTML
+            )
+    
+    async def _process_photo(self, context: ContextTypes.DEFAULT_TYPE, chat_id, user_id, photo, processing_message, cache_key) -> None:
+        """Download, analyze and reply to a queued photo (runs on an analysis worker)."""
+        # "typing..." shows the wait without extra messages; cancelled before the reply
+        typing = asyncio.create_task(keep_chat_action(context.bot, chat_id))
+        try:
+            # Download the photo into memory - nothing touches the disk
+            photo_file = await photo.get_file()
+            image_data = await self.transport.download(photo_file, self.download_request)
+            
+            logging.info(f"Downloaded photo from user {user_id} ({len(image_data)} bytes)")
+            
+            # Re-screenshotted or re-cropped charts reuse a recent analysis of a near-identical image
+            profile_key = self.profile.key
+            image_hash = await self._image_hash(image_data)
+            analysis = self.phash_cache.get(image_hash, profile_key) if image_hash is not None else None
+            if analysis is not None:
+                logger.info(f"Reusing near-duplicate chart analysis for user {user_id}")
+            else:
+                # Analyze the photo without blocking the event loop - the formatting is now done in the OpenAI client.
+                # While streaming, the processing message shows the partial analysis (structured JSON is not streamed)
+                on_progress = None
+                if STREAM_ANALYSIS and not STRUCTURED_OUTPUT:
+                    progress = ProgressMessage(context.bot, chat_id, processing_message.message_id, STREAM_EDIT_INTERVAL)
+                    on_progress = progress.update
+                analysis = await self.openai_client.analyze_photo_async(self.profile, image_data, on_progress=on_progress)
+                # Placeholder penolakan tidak disimpan: forward berikutnya dicoba analisis ulang
+                if image_hash is not None and not isinstance(analysis, FallbackAnalysis):
+                    self.phash_cache.set(image_hash, profile_key, analysis)
+            if not isinstance(analysis, FallbackAnalysis):
+                self.result_cache.set(cache_key, analysis)
+            
+            # Replace the "Processing..." message with the result - already formatted appropriately
+            typing.cancel()
+            await deliver_result(context.bot, chat_id, processing_message.message_id, analysis)
+            
+            logger.info(f"Successfully processed photo from user {user_id}")
+            
+        except Exception as e:
+            logging.error(f"Error handling photo from user {user_id}: {e}")
+            traceback_str = traceback.format_exc()
+            logging.error(f"Traceback: {traceback_str}")
+            typing.cancel()
+            await deliver_result(
+                context.bot,
+                chat_id,
+                processing_message.message_id,
+                "⚠️ <b>Error:</b> Terjadi kesalahan saat memproses foto. Silakan coba lagi nanti."
+            )
+        finally:
+            typing.cancel()
+    
+    async def _image_hash(self, image_data):
+        """Perceptual hash of the photo, or None if it can't be decoded or the cache is disabled."""
+        if self.phash_cache.max_size <= 0:
+            return None
+        try:
+            return await asyncio.to_thread(dhash, image_data)
+        except Exception as e:
+            logging.warning(f"Could not compute perceptual hash: {e}")
+            return None
+    
+    @access_control()
+    async def handle_text(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk pesan teks selain perintah"""
+        await update.message.reply_text(
+            f"📈 <b>Silakan kirim gambar grafik trading crypto untuk mendapatkan analisis.</b>\n"
+            f"Ketik /help untuk bantuan.",
+            parse_mode=ParseMode.HTML
+        )
+    
+    async def start(self):
+        """Inisialisasi aplikasi dan mulai memproses update (dipanggil oleh BotHost)"""
+        await self.application.initialize()
+        await self.download_request.initialize()
+        # Buka koneksi Bot API sebelum pengguna pertama datang
+        timings = await self.transport.prewarm(self.application.bot, self.download_request)
+        if timings:
+            logger.info(f"{self.profile.bot_name} koneksi Bot API dibuka: " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+        await self.application.start()
+        logger.info(f"{self.profile.bot_name} mulai berjalan")
+    
+    async def start_polling(self):
+        """Ambil update dengan long polling (getUpdates)"""
+        await self.application.updater.start_polling(allowed_updates=ALLOWED_UPDATES)
+        logger.info(f"{self.profile.bot_name} menerima update lewat polling")
+    
+    async def set_webhook(self, url, secret_token):
+        """
+        Daftarkan webhook sehingga Telegram mengirim update ke server bot
+        
+        Args:
+            url: URL publik HTTPS untuk profil ini
+            secret_token: Token yang dikirim Telegram di header setiap request
+        """
+        await self.application.bot.set_webhook(
+            url=url,
+            secret_token=secret_token,
+            allowed_updates=ALLOWED_UPDATES
+        )
+        logger.info(f"{self.profile.bot_name} menerima update lewat webhook {url}")
+    
+    async def stop(self):
+        """Hentikan polling dan aplikasi (dipanggil oleh BotHost)"""
+        if self.application.updater.running:
+            await self.application.updater.stop()
+        if self.application.running:
+            await self.application.stop()
+        await self.application.shutdown()
+        await self.download_request.shutdown()
+        logger.info(f"{self.profile.bot_name} berhenti") 
\ No newline at end of file
@@ -0,0 +1,168 @@
+import socket
+import asyncio
+import logging
+import importlib.util
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from telegram.request import HTTPXRequest
+
+logger = logging.getLogger(__name__)
+
+def tcp_keepalive_options(idle: int = 30, interval: int = 10, count: int = 3) -> List[Tuple[int, int, int]]:
+    """
+    Opsi socket TCP keepalive agar koneksi idle tidak diputus diam-diam oleh NAT atau firewall
+
+    Opsi yang tidak tersedia di platform ini (mis. TCP_KEEPIDLE di macOS/Windows) dilewati.
+    """
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name, value in (('TCP_KEEPIDLE', idle), ('TCP_KEEPINTVL', interval), ('TCP_KEEPCNT', count)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+def http2_available() -> bool:
+    """HTTP/2 di httpx membutuhkan paket h2 (python-telegram-bot[http2])"""
+    return importlib.util.find_spec('h2') is not None
+
+class TelegramTransport:
+    """
+    Pengaturan HTTP bersama untuk semua panggilan Bot API
+
+    Setiap bot memakai tiga pool koneksi terpisah: getUpdates (long polling),
+    pengiriman (send_message, edit, delete, get_file, dll.) dan download file,
+    sehingga download chart yang besar atau long polling tidak menahan
+    pengiriman pesan. Koneksi idle dipertahankan lebih lama dari bawaan httpx
+    (5 detik) dengan TCP keepalive, memakai HTTP/2 jika paket h2 tersedia, dan
+    bisa dibuka lebih dulu saat startup (prewarm) sehingga pengguna pertama
+    tidak menunggu TCP dan TLS handshake.
+    """
+    def __init__(self, pool_size: int = 32, download_pool_size: int = 8, http2: bool = True,
+                 keepalive_expiry: float = 60.0, prewarm_connections: int = 2):
+        """
+        Inisialisasi TelegramTransport
+
+        Args:
+            pool_size: Jumlah koneksi maksimum pool pengiriman per bot
+            download_pool_size: Jumlah koneksi maksimum pool download file per bot
+            http2: Pakai HTTP/2 jika paket h2 terpasang
+            keepalive_expiry: Lama koneksi idle dipertahankan (detik)
+            prewarm_connections: Jumlah koneksi per pool yang dibuka saat startup (0 = tanpa prewarm)
+        """
+        self.pool_size = max(1, pool_size)
+        self.download_pool_size = max(1, download_pool_size)
+        self.keepalive_expiry = keepalive_expiry
+        self.prewarm_connections = max(0, prewarm_connections)
+        self.http_version = '1.1'
+        if http2:
+            if http2_available():
+                self.http_version = '2'
+            else:
+                logger.warning("HTTP/2 untuk Bot API membutuhkan paket h2 (pip install \"python-telegram-bot[http2]\"), memakai HTTP/1.1")
+
+    def build_request(self, pool_size: int, **timeouts: Any) -> HTTPXRequest:
+        """
+        Buat HTTPXRequest dengan pool, keepalive dan versi HTTP dari transport ini
+
+        Args:
+            pool_size: Jumlah koneksi maksimum pool
+            timeouts: Timeout tambahan untuk HTTPXRequest (mis. read_timeout)
+
+        Returns:
+            HTTPXRequest: Objek request untuk python-telegram-bot
+        """
+        http1 = self.http_version == '1.1'
+        # Transport dibuat sendiri: httpx mengabaikan limits milik client jika transport diberikan,
+        # jadi keepalive dan opsi socket harus dipasang langsung di transport
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            socket_options=tcp_keepalive_options(),
+            http1=http1,
+            http2=not http1
+        )
+        return HTTPXRequest(
+            connection_pool_size=pool_size,
+            http_version=self.http_version,
+            httpx_kwargs={'transport': transport},
+            **timeouts
+        )
+
+    def configure(self, builder):
+        """
+        Pasang pool getUpdates dan pool pengiriman ke ApplicationBuilder
+
+        Args:
+            builder: ApplicationBuilder yang sudah diberi token
+
+        Returns:
+            tuple: (builder, HTTPXRequest untuk download file)
+        """
+        builder = builder.request(self.build_request(self.pool_size)).get_updates_request(self.build_request(1))
+        return builder, self.build_request(self.download_pool_size)
+
+    async def prewarm(self, bot, download_request: HTTPXRequest) -> Dict[str, float]:
+        """
+        Buka koneksi pool pengiriman dan download sebelum update pertama datang
+
+        Pool pengiriman dihangatkan dengan getMe dan pool download dengan
+        request ke URL file (jawaban 404 tidak masalah, yang dibutuhkan adalah
+        koneksinya). Pool getUpdates terbuka sendiri oleh polling pertama.
+
+        Args:
+            bot: telegram.Bot yang sudah diinisialisasi
+            download_request: HTTPXRequest untuk download file
+
+        Returns:
+            dict: Waktu prewarm per pool (detik), kosong jika prewarm dimatikan
+        """
+        if self.prewarm_connections <= 0:
+            return {}
+        loop = asyncio.get_running_loop()
+        timings = {}
+        for name, call in (
+            ('send', lambda: bot.get_me()),
+            ('download', lambda: download_request.do_request(f"{bot.base_file_url}/", 'GET'))
+        ):
+            started = loop.time()
+            results = await asyncio.gather(*(call() for _ in range(self.prewarm_connections)), return_exceptions=True)
+            timings[name] = loop.time() - started
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                logger.warning(f"Prewarm koneksi {name} Bot API gagal: {str(errors[0])}")
+        return timings
+
+    @staticmethod
+    async def download(file, download_request: Optional[HTTPXRequest]) -> bytearray:
+        """
+        Download file Telegram ke memori lewat pool download
+
+        Args:
+            file: telegram.File dari get_file()
+            download_request: HTTPXRequest untuk download file, None untuk memakai pool bot
+
+        Returns:
+            bytearray: Isi file
+        """
+        file_path = getattr(file, 'file_path', None)
+        if download_request is None or not file_path or not file_path.startswith(('http://', 'https://')):
+            # Mode lokal Bot API server memberikan path file, bukan URL
+            return await file.download_as_bytearray()
+        return bytearray(await download_request.retrieve(file_path))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan pengaturan transport
+
+        Returns:
+            dict: Versi HTTP, ukuran pool, keepalive dan jumlah koneksi prewarm
+        """
+        return {
+            'http_version': self.http_version,
+            'pool_size': self.pool_size,
+            'download_pool_size': self.download_pool_size,
+            'keepalive_expiry': self.keepalive_expiry,
+            'prewarm_connections': self.prewarm_connections
+        }
@@ -0,0 +1,95 @@
+import logging
+from collections import deque
+from typing import Any, Awaitable, Deque, Dict, Optional
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Proses update Telegram secara bersamaan dengan urutan terjaga per chat
+
+    Update dari chat berbeda berjalan paralel sampai max_concurrent_updates.
+    Update dari chat yang sedang diproses tidak menunggu sambil memegang slot
+    global: update itu diantrikan di belakang update sebelumnya dari chat yang
+    sama dan dijalankan oleh task chat tersebut setelah selesai. Satu chat
+    memakai paling banyak satu slot, jadi pengguna yang mengirim banyak pesan
+    tidak bisa menghabiskan slot pengguna lain.
+    """
+    def __init__(self, max_concurrent_updates: int):
+        """
+        Inisialisasi ChatOrderedUpdateProcessor
+
+        Args:
+            max_concurrent_updates: Jumlah maksimum chat yang updatenya diproses bersamaan
+        """
+        super().__init__(max_concurrent_updates)
+        self._pending: Dict[int, Deque[Awaitable[Any]]] = {}
+        self.queued = 0
+
+    @staticmethod
+    def _chat_id(update: object) -> Optional[int]:
+        """ID chat update, atau None untuk update tanpa chat (mis. inline query)"""
+        if isinstance(update, Update) and update.effective_chat is not None:
+            return update.effective_chat.id
+        return None
+
+    @staticmethod
+    async def _run(coroutine: Awaitable[Any]) -> None:
+        """Jalankan satu update; error tidak boleh menghentikan update berikutnya dari chat yang sama"""
+        try:
+            await coroutine
+        except Exception as e:
+            logger.error(f"Error saat memproses update: {str(e)}")
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Jalankan update sekarang, atau antrikan di belakang update lain dari chat yang sama"""
+        chat_id = self._chat_id(update)
+        if chat_id is None:
+            await coroutine
+            return
+
+        pending = self._pending.get(chat_id)
+        if pending is not None:
+            # Chat sedang diproses: task chat itu yang akan menjalankan update ini
+            pending.append(coroutine)
+            self.queued += 1
+            return
+
+        pending = self._pending[chat_id] = deque()
+        try:
+            await self._run(coroutine)
+            while pending:
+                await self._run(pending.popleft())
+        finally:
+            del self._pending[chat_id]
+            # Hanya tersisa jika task dibatalkan (mis. saat shutdown)
+            for leftover in pending:
+                leftover.close()
+            if pending:
+                logger.warning(f"{len(pending)} update dari chat {chat_id} dibatalkan sebelum diproses")
+
+    async def initialize(self) -> None:
+        """Tidak ada resource yang perlu disiapkan"""
+        pass
+
+    async def shutdown(self) -> None:
+        """Tidak ada resource yang perlu dilepas; update yang masih antri ditutup oleh task chatnya"""
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan statistik pemrosesan update
+
+        Returns:
+            dict: Update yang sedang diproses, batas, chat aktif, update yang menunggu
+                giliran chat dan total update yang pernah menunggu
+        """
+        return {
+            'running': self.current_concurrent_updates,
+            'max_concurrent_updates': self.max_concurrent_updates,
+            'chats': len(self._pending),
+            'waiting': sum(len(pending) for pending in self._pending.values()),
+            'queued': self.queued
+        }
@@ -0,0 +1,78 @@
+import logging
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+def cached_tokens(usage) -> int:
+    """Jumlah token prompt yang dilayani dari prompt cache (usage.prompt_tokens_details.cached_tokens)"""
+    details = getattr(usage, 'prompt_tokens_details', None)
+    return getattr(details, 'cached_tokens', None) or 0
+
+class UsageTracker:
+    """
+    Pemakaian token per model dan efek prompt caching OpenAI
+
+    Untuk setiap respons dicatat token prompt, token prompt dari cache dan
+    token output, serta total durasi request yang dipisah antara request yang
+    kena cache (cached_tokens > 0) dan yang tidak, sehingga rasio hit dan
+    latensi yang dihemat terlihat di /stats.
+    """
+    def __init__(self):
+        """Inisialisasi UsageTracker"""
+        self._models: Dict[str, Dict[str, float]] = {}
+
+    def record(self, model: str, usage, seconds: float) -> None:
+        """
+        Catat usage satu respons
+
+        Args:
+            model: ID model atau GPT kustom
+            usage: Objek usage dari respons (None jika tidak ada, mis. GPT kustom tanpa usage)
+            seconds: Durasi request sampai respons lengkap (detik)
+        """
+        if usage is None:
+            return
+        stats = self._models.get(model)
+        if stats is None:
+            stats = self._models[model] = {
+                'requests': 0, 'prompt_tokens': 0, 'cached_tokens': 0, 'completion_tokens': 0,
+                'cache_hits': 0, 'hit_seconds': 0.0, 'miss_seconds': 0.0
+            }
+        cached = cached_tokens(usage)
+        stats['requests'] += 1
+        stats['prompt_tokens'] += getattr(usage, 'prompt_tokens', 0) or 0
+        stats['cached_tokens'] += cached
+        stats['completion_tokens'] += getattr(usage, 'completion_tokens', 0) or 0
+        if cached > 0:
+            stats['cache_hits'] += 1
+            stats['hit_seconds'] += seconds
+        else:
+            stats['miss_seconds'] += seconds
+        logger.debug(
+            f"Usage {model}: prompt {getattr(usage, 'prompt_tokens', 0)} token ({cached} dari cache), "
+            f"output {getattr(usage, 'completion_tokens', 0)} token, {seconds:.1f} detik"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Dapatkan pemakaian token dan prompt cache setiap model
+
+        Returns:
+            dict: Per model jumlah request dan token, rasio token prompt dari cache,
+                jumlah request yang kena cache dan rata-rata durasi hit/miss (None jika belum ada)
+        """
+        result = {}
+        for model, stats in self._models.items():
+            hits = stats['cache_hits']
+            misses = stats['requests'] - hits
+            result[model] = {
+                'requests': stats['requests'],
+                'prompt_tokens': stats['prompt_tokens'],
+                'cached_tokens': stats['cached_tokens'],
+                'completion_tokens': stats['completion_tokens'],
+                'cache_hits': hits,
+                'cached_ratio': stats['cached_tokens'] / stats['prompt_tokens'] if stats['prompt_tokens'] else 0.0,
+                'hit_latency': stats['hit_seconds'] / hits if hits else None,
+                'miss_latency': stats['miss_seconds'] / misses if misses else None
+            }
+        return result
@@ -0,0 +1,381 @@
+import asyncio
+import logging
+from typing import List, Dict, Set, Tuple, Optional
+from src.user_storage import JsonUserStorage, ROLE_ADMIN, ROLE_ALLOWED, Change
+
+logger = logging.getLogger(__name__)
+
+class UserManager:
+    """
+    Kelas untuk mengelola akses pengguna ke bot
+    
+    Keanggotaan disimpan dalam set sehingga pengecekan akses O(1). Perubahan
+    disimpan secara write-behind: beberapa perubahan berdekatan digabung
+    menjadi satu penulisan ke backend penyimpanan (JSON atau SQLite) di
+    thread terpisah, sehingga event loop tidak menunggu disk.
+    
+    Perubahan dari luar proses (file diedit operator atau proses bot lain)
+    dideteksi dengan polling penanda file yang murah. Daftar baru dibaca di
+    thread terpisah ke set baru, lalu ditukar sekaligus di event loop, jadi
+    pengecekan akses tidak pernah menunggu atau melihat data setengah dimuat.
+    """
+    def __init__(self, users_file: str = 'config/users.json', save_delay: float = 1.0, storage=None):
+        """
+        Inisialisasi UserManager
+        
+        Args:
+            users_file: Path ke file JSON untuk menyimpan data pengguna (jika storage tidak diberikan)
+            save_delay: Jeda sebelum perubahan ditulis, untuk menggabungkan perubahan (detik)
+            storage: Backend penyimpanan (JsonUserStorage atau SqliteUserStorage)
+        """
+        self.storage = storage if storage is not None else JsonUserStorage(users_file)
+        self.save_delay = save_delay
+        self.admins: Set[int] = set()  # Set user_id admin
+        self.allowed_users: Set[int] = set()  # Set user_id pengguna yang diizinkan
+        self._changes: List[Change] = []  # Perubahan yang belum ditulis
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._writing: List[Change] = []  # Perubahan yang sedang ditulis di thread lain
+        self._write_generation = 0  # Bertambah setiap penulisan selesai
+        self._signature = None  # Penanda file saat terakhir dibaca atau ditulis
+        self._watch_task: Optional[asyncio.Task] = None
+        
+        # Load user data dari backend penyimpanan
+        self.load_users()
+    
+    def load_users(self) -> None:
+        """Load data pengguna dari backend penyimpanan"""
+        try:
+            self._signature = self.storage.signature()
+            loaded = self.storage.load()
+            if loaded is not None:
+                self.admins, self.allowed_users = loaded
+                logger.info(f"Loaded {len(self.admins)} admins and {len(self.allowed_users)} allowed users from {self.storage.describe()}")
+            else:
+                # Jika file belum ada, buat file kosong
+                self.save_users()
+                logger.info(f"Created new users file at {self.storage.describe()}")
+        except Exception as e:
+            logger.error(f"Error loading users: {str(e)}")
+            # Buat data kosong jika terjadi error
+            self.admins = set()
+            self.allowed_users = set()
+    
+    def _take_pending(self):
+        """
+        Ambil perubahan yang belum ditulis beserta snapshot (hanya jika backend membutuhkannya)
+        
+        Dipanggil di event loop sehingga snapshot konsisten; penulisan bisa dilakukan di thread lain.
+        """
+        changes, self._changes = self._changes, []
+        self._writing = changes
+        self._dirty = False
+        snapshot = None
+        if self.storage.needs_snapshot:
+            # Diurutkan agar isi file stabil
+            snapshot = {
+                'admins': sorted(self.admins),
+                'allowed_users': sorted(self.allowed_users)
+            }
+        return changes, snapshot
+    
+    def _write(self, changes: List[Change], snapshot: Optional[Dict[str, List[int]]]) -> None:
+        """Tulis perubahan ke backend penyimpanan"""
+        self.storage.write(changes, snapshot)
+        # Penulisan sendiri tidak perlu dimuat ulang oleh watcher
+        self._signature = self.storage.signature()
+        self._write_generation += 1
+        self._writing = []
+        logger.info(f"Saved user data ({len(changes)} changes) with {len(self.admins)} admins and {len(self.allowed_users)} allowed users")
+    
+    def _restore_pending(self, changes: List[Change]) -> None:
+        """Kembalikan perubahan yang gagal ditulis agar dicoba lagi"""
+        self._changes = changes + self._changes
+        self._writing = []
+        self._dirty = True
+    
+    def save_users(self) -> None:
+        """Simpan data pengguna sekarang juga"""
+        changes, snapshot = self._take_pending()
+        try:
+            self._write(changes, snapshot)
+        except Exception as e:
+            self._restore_pending(changes)
+            logger.error(f"Error saving users: {str(e)}")
+    
+    def _record(self, action: str, role: str, user_id: int) -> None:
+        """Catat perubahan dan jadwalkan penulisan"""
+        self._changes.append((action, role, user_id))
+        self._schedule_save()
+    
+    def _schedule_save(self) -> None:
+        """Tandai data berubah dan jadwalkan satu penulisan untuk semua perubahan berdekatan"""
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Belum ada event loop (mis. saat startup): simpan langsung
+            self.save_users()
+            return
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._save_later())
+    
+    async def _save_later(self) -> None:
+        """Tunggu save_delay lalu tulis snapshot terbaru di thread terpisah"""
+        await asyncio.sleep(self.save_delay)
+        while self._dirty:
+            # Gabungkan dulu perubahan dari luar agar snapshot JSON tidak menimpanya
+            await self._reload_before_write()
+            changes, snapshot = self._take_pending()
+            try:
+                await asyncio.to_thread(self._write, changes, snapshot)
+            except Exception as e:
+                # Dicoba lagi pada perubahan berikutnya atau saat flush
+                self._restore_pending(changes)
+                logger.error(f"Error saving users: {str(e)}")
+                return
+    
+    async def flush(self) -> None:
+        """Tulis semua perubahan yang belum tersimpan (dipanggil saat bot berhenti)"""
+        if self._save_task is not None and not self._save_task.done():
+            self._save_task.cancel()
+            try:
+                await self._save_task
+            except asyncio.CancelledError:
+                pass
+        if self._dirty:
+            await self._reload_before_write()
+            changes, snapshot = self._take_pending()
+            try:
+                await asyncio.to_thread(self._write, changes, snapshot)
+            except Exception as e:
+                self._restore_pending(changes)
+                logger.error(f"Error saving users: {str(e)}")
+    
+    def start_watching(self, interval: float) -> None:
+        """
+        Mulai memantau perubahan daftar pengguna dari luar proses
+        
+        Args:
+            interval: Jarak antar pengecekan penanda file (detik), 0 untuk menonaktifkan
+        """
+        if interval > 0 and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(interval))
+            logger.info(f"Memantau perubahan {self.storage.describe()} setiap {interval:g} detik")
+    
+    async def stop_watching(self) -> None:
+        """Hentikan pemantauan perubahan daftar pengguna"""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+    
+    async def _watch(self, interval: float) -> None:
+        """Loop pengecekan perubahan; error tidak menghentikan pemantauan"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload_if_changed()
+            except Exception as e:
+                logger.error(f"Error reloading users: {str(e)}")
+    
+    async def reload_if_changed(self) -> bool:
+        """
+        Muat ulang daftar pengguna jika penanda file berubah sejak terakhir dibaca atau ditulis
+        
+        Perubahan lokal yang belum tersimpan (atau sedang ditulis) diterapkan
+        ulang di atas daftar baru sehingga tidak tertimpa.
+        
+        Returns:
+            bool: True jika daftar pengguna diganti
+        """
+        signature = await asyncio.to_thread(self.storage.signature)
+        if signature is None or signature == self._signature:
+            return False
+        generation = self._write_generation
+        loaded = await asyncio.to_thread(self.storage.load)
+        if loaded is None or generation != self._write_generation:
+            # Penulisan sendiri selesai di tengah pembacaan; dicek lagi pada putaran berikutnya
+            return False
+        
+        admins, allowed_users = loaded
+        for action, role, user_id in self._writing + self._changes:
+            target = admins if role == ROLE_ADMIN else allowed_users
+            if action == 'add':
+                target.add(user_id)
+            else:
+                target.discard(user_id)
+        
+        # Tukar sekaligus: pengecekan akses melihat daftar lama atau daftar baru, tidak pernah campuran
+        self.admins, self.allowed_users = admins, allowed_users
+        self._signature = signature
+        logger.info(f"Reloaded {len(admins)} admins and {len(allowed_users)} allowed users from {self.storage.describe()}")
+        return True
+    
+    async def _reload_before_write(self) -> None:
+        """Muat ulang perubahan dari luar sebelum menulis; kegagalan tidak membatalkan penulisan"""
+        try:
+            await self.reload_if_changed()
+        except Exception as e:
+            logger.error(f"Error reloading users: {str(e)}")
+    
+    def is_admin(self, user_id: int) -> bool:
+        """
+        Cek apakah user adalah admin
+        
+        Args:
+            user_id: ID pengguna Telegram
+        
+        Returns:
+            bool: True jika user adalah admin
+        """
+        return user_id in self.admins
+    
+    def is_allowed(self, user_id: int) -> bool:
+        """
+        Cek apakah user diizinkan mengakses bot
+        
+        Args:
+            user_id: ID pengguna Telegram
+        
+        Returns:
+            bool: True jika user diizinkan (admin atau dalam daftar allowed_users)
+        """
+        return user_id in self.admins or user_id in self.allowed_users
+    
+    def add_admin(self, user_id: int) -> bool:
+        """
+        Tambahkan admin baru
+        
+        Args:
+            user_id: ID pengguna Telegram
+        
+        Returns:
+            bool: True jika berhasil
+        """
+        if user_id not in self.admins:
+            self.admins.add(user_id)
+            self._record('add', ROLE_ADMIN, user_id)
+            logger.info(f"Added admin: {user_id}")
+            return True
+        return False
+    
+    def remove_admin(self, user_id: int) -> bool:
+        """
+        Hapus admin
+        
+        Args:
+            user_id: ID pengguna Telegram
+        
+        Returns:
+            bool: True jika berhasil
+        """
+        if user_id in self.admins:
+            self.admins.discard(user_id)
+            self._record('remove', ROLE_ADMIN, user_id)
+            logger.info(f"Removed admin: {user_id}")
+            return True
+        return False
+    
+    def add_allowed_user(self, user_id: int) -> bool:
+        """
+        Tambahkan user yang diizinkan
+        
+        Args:
+            user_id: ID pengguna Telegram
+        
+        Returns:
+            bool: True jika berhasil
+        """
+        if user_id not in self.allowed_users:
+            self.allowed_users.add(user_id)
+            self._record('add', ROLE_ALLOWED, user_id)
+            logger.info(f"Added allowed user: {user_id}")
+            return True
+        return False
+    
+    def remove_allowed_user(self, user_id: int) -> bool:
+        """
+        Hapus user dari daftar yang diizinkan
+        
+        Args:
+            user_id: ID pengguna Telegram
+        
+        Returns:
+            bool: True jika berhasil
+        """
+        if user_id in self.allowed_users:
+            self.allowed_users.discard(user_id)
+            self._record('remove', ROLE_ALLOWED, user_id)
+            logger.info(f"Removed allowed user: {user_id}")
+            return True
+        return False
+    
+    def add_allowed_users(self, user_ids: List[int]) -> Tuple[List[int], List[int]]:
+        """
+        Tambahkan banyak user sekaligus; semua perubahan disimpan dalam satu penulisan
+        
+        Args:
+            user_ids: Daftar ID pengguna Telegram (duplikat diabaikan)
+        
+        Returns:
+            tuple: (ID yang ditambahkan, ID yang sudah ada sebelumnya)
+        """
+        added, skipped = [], []
+        for user_id in dict.fromkeys(user_ids):
+            if user_id in self.allowed_users:
+                skipped.append(user_id)
+                continue
+            self.allowed_users.add(user_id)
+            self._changes.append(('add', ROLE_ALLOWED, user_id))
+            added.append(user_id)
+        if added:
+            self._schedule_save()
+        logger.info(f"Added {len(added)} allowed users in bulk ({len(skipped)} already allowed)")
+        return added, skipped
+    
+    def remove_allowed_users(self, user_ids: List[int]) -> Tuple[List[int], List[int]]:
+        """
+        Hapus banyak user sekaligus; semua perubahan disimpan dalam satu penulisan
+        
+        Args:
+            user_ids: Daftar ID pengguna Telegram (duplikat diabaikan)
+        
+        Returns:
+            tuple: (ID yang dihapus, ID yang tidak ada dalam daftar)
+        """
+        removed, skipped = [], []
+        for user_id in dict.fromkeys(user_ids):
+            if user_id not in self.allowed_users:
+                skipped.append(user_id)
+                continue
+            self.allowed_users.discard(user_id)
+            self._changes.append(('remove', ROLE_ALLOWED, user_id))
+            removed.append(user_id)
+        if removed:
+            self._schedule_save()
+        logger.info(f"Removed {len(removed)} allowed users in bulk ({len(skipped)} not found)")
+        return removed, skipped
+    
+    def get_admins(self) -> List[int]:
+        """Dapatkan daftar admin"""
+        return sorted(self.admins)
+    
+    def get_allowed_users(self) -> List[int]:
+        """Dapatkan daftar user yang diizinkan"""
+        return sorted(self.allowed_users)
+    
+    def get_user_status(self, user_id: int) -> Dict[str, bool]:
+        """
+        Dapatkan status user
+        
+        Args:
+            user_id: ID pengguna Telegram
+        
+        Returns:
+            dict: Status user (admin dan allowed)
+        """
+        return {
+            'is_admin': self.is_admin(user_id),
+            'is_allowed': self.is_allowed(user_id)
+        }
@@ -0,0 +1,207 @@
+import os
+import json
+import sqlite3
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Peran pengguna yang disimpan
+ROLE_ADMIN = 'admin'
+ROLE_ALLOWED = 'allowed'
+
+# Perubahan: ('add' atau 'remove', peran, user_id)
+Change = Tuple[str, str, int]
+
+class JsonUserStorage:
+    """
+    Penyimpanan daftar pengguna dalam satu file JSON {"admins": [...], "allowed_users": [...]}
+
+    Setiap penulisan menulis ulang seluruh file secara atomik, jadi backend ini
+    membutuhkan snapshot lengkap dari UserManager.
+    """
+    needs_snapshot = True
+
+    def __init__(self, users_file: str = 'config/users.json'):
+        """
+        Inisialisasi JsonUserStorage
+
+        Args:
+            users_file: Path ke file JSON
+        """
+        self.path = users_file
+        os.makedirs(os.path.dirname(users_file) or '.', exist_ok=True)
+
+    def load(self) -> Optional[Tuple[Set[int], Set[int]]]:
+        """
+        Baca daftar admin dan pengguna yang diizinkan
+
+        Returns:
+            tuple: (admins, allowed_users), atau None jika file belum ada
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        return (
+            {int(user_id) for user_id in data.get('admins', [])},
+            {int(user_id) for user_id in data.get('allowed_users', [])}
+        )
+
+    def write(self, changes: List[Change], snapshot: Optional[Dict[str, List[int]]]) -> None:
+        """Tulis snapshot secara atomik: file sementara di direktori yang sama lalu os.replace"""
+        directory = os.path.dirname(self.path) or '.'
+        fd, temp_path = tempfile.mkstemp(prefix='.users-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def signature(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Penanda murah untuk mendeteksi perubahan file dari luar proses
+
+        Returns:
+            tuple: (inode, mtime_ns, ukuran), atau None jika file belum ada
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        # os.replace mengganti inode, jadi penulisan atomik selalu terdeteksi
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def describe(self) -> str:
+        """Deskripsi singkat backend untuk log"""
+        return f"JSON {self.path}"
+
+class SqliteUserStorage:
+    """
+    Penyimpanan daftar pengguna di SQLite dengan mode WAL
+
+    Beberapa proses bisa membaca bersamaan selama satu proses menulis. Setiap
+    penulisan hanya menerapkan perubahan (bukan seluruh daftar) dalam satu
+    transaksi. Saat pertama dibuat, isi users.json lama dimigrasikan sekali.
+    """
+    needs_snapshot = False
+
+    def __init__(self, db_file: str = 'config/users.db', migrate_from: Optional[str] = None):
+        """
+        Inisialisasi SqliteUserStorage
+
+        Args:
+            db_file: Path ke file database SQLite
+            migrate_from: Path users.json yang diimpor jika belum pernah dimigrasikan
+        """
+        self.path = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        with self._connect() as conn:
+            # WAL tersimpan di file database, cukup diset sekali
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "role TEXT NOT NULL, user_id INTEGER NOT NULL, "
+                "added_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+                "PRIMARY KEY (role, user_id)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        if migrate_from:
+            self._migrate_json(migrate_from)
+
+    @contextmanager
+    def _connect(self):
+        """Koneksi baru per operasi (aman dipakai dari thread mana pun), commit di akhir lalu ditutup"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _migrate_json(self, users_file: str) -> None:
+        """Impor users.json lama satu kali; perubahan JSON setelahnya tidak diimpor lagi"""
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return
+            loaded = JsonUserStorage(users_file).load() if os.path.exists(users_file) else None
+            if loaded is not None:
+                admins, allowed_users = loaded
+                conn.executemany(
+                    "INSERT OR IGNORE INTO users (role, user_id) VALUES (?, ?)",
+                    [(ROLE_ADMIN, user_id) for user_id in admins] + [(ROLE_ALLOWED, user_id) for user_id in allowed_users]
+                )
+                logger.info(f"Migrated {len(admins)} admins and {len(allowed_users)} allowed users from {users_file} to {self.path}")
+            conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (users_file,))
+
+    def load(self) -> Optional[Tuple[Set[int], Set[int]]]:
+        """
+        Baca daftar admin dan pengguna yang diizinkan
+
+        Returns:
+            tuple: (admins, allowed_users)
+        """
+        admins, allowed_users = set(), set()
+        with self._connect() as conn:
+            for role, user_id in conn.execute("SELECT role, user_id FROM users"):
+                (admins if role == ROLE_ADMIN else allowed_users).add(user_id)
+        return admins, allowed_users
+
+    def write(self, changes: List[Change], snapshot: Optional[Dict[str, List[int]]]) -> None:
+        """Terapkan semua perubahan dalam satu transaksi"""
+        if not changes:
+            return
+        with self._connect() as conn:
+            for action, role, user_id in changes:
+                if action == 'add':
+                    conn.execute("INSERT OR IGNORE INTO users (role, user_id) VALUES (?, ?)", (role, user_id))
+                else:
+                    conn.execute("DELETE FROM users WHERE role = ? AND user_id = ?", (role, user_id))
+
+    def signature(self) -> Optional[Tuple[Tuple[int, int], ...]]:
+        """
+        Penanda murah untuk mendeteksi commit dari proses lain
+
+        Commit dalam mode WAL menulis ke file -wal dan checkpoint menulis ke file
+        database, jadi mtime dan ukuran keduanya dipakai sebagai penanda.
+        PRAGMA data_version tidak dipakai karena nilainya hanya bermakna untuk
+        koneksi yang tetap terbuka.
+        """
+        parts = []
+        for path in (self.path, self.path + '-wal'):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            parts.append((st.st_mtime_ns, st.st_size))
+        return tuple(parts) or None
+
+    def describe(self) -> str:
+        """Deskripsi singkat backend untuk log"""
+        return f"SQLite {self.path}"
+
+def create_user_storage(kind: str, users_file: str, db_file: str):
+    """
+    Buat backend penyimpanan pengguna sesuai konfigurasi
+
+    Args:
+        kind: 'json' atau 'sqlite'
+        users_file: Path users.json (juga sumber migrasi untuk SQLite)
+        db_file: Path database SQLite
+
+    Returns:
+        JsonUserStorage atau SqliteUserStorage
+    """
+    if kind == 'sqlite':
+        return SqliteUserStorage(db_file, migrate_from=users_file)
+    if kind != 'json':
+        raise ValueError(f"Backend penyimpanan pengguna tidak dikenal: {kind}")
+    return JsonUserStorage(users_file)
@@ -0,0 +1,108 @@
+import hmac
+import json
+import logging
+import tornado.web
+from tornado.httpserver import HTTPServer
+from telegram import Update
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+class TelegramWebhookHandler(tornado.web.RequestHandler):
+    """
+    Menerima POST update dari Telegram untuk satu bot dan memasukkannya ke update_queue aplikasinya
+    """
+    SUPPORTED_METHODS = ("POST",)
+
+    def initialize(self, bot_application, secret_token, stats):
+        self.bot_application = bot_application
+        self.secret_token = secret_token
+        self.stats = stats
+
+    def check_xsrf_cookie(self):
+        # Request datang dari server Telegram, bukan browser
+        pass
+
+    async def post(self):
+        # Tolak request yang tidak membawa secret token yang benar (bukan dari Telegram)
+        received = self.request.headers.get(SECRET_HEADER, "")
+        if not hmac.compare_digest(received.encode('utf-8'), self.secret_token.encode('utf-8')):
+            self.stats['rejected'] += 1
+            logger.warning(f"Webhook {self.request.path} ditolak: secret token tidak cocok ({self.request.remote_ip})")
+            raise tornado.web.HTTPError(403)
+
+        try:
+            data = json.loads(self.request.body)
+            update = Update.de_json(data, self.bot_application.bot)
+        except Exception as e:
+            self.stats['invalid'] += 1
+            logger.warning(f"Webhook {self.request.path} menerima update tidak valid: {str(e)}")
+            raise tornado.web.HTTPError(400)
+
+        if update is None:
+            self.stats['invalid'] += 1
+            raise tornado.web.HTTPError(400)
+
+        # Handler dijalankan oleh aplikasi; Telegram cukup menerima 200 secepatnya
+        await self.bot_application.update_queue.put(update)
+        self.stats['received'] += 1
+        self.set_status(200)
+        self.finish()
+
+    def log_exception(self, typ, value, tb):
+        if isinstance(value, tornado.web.HTTPError):
+            return
+        super().log_exception(typ, value, tb)
+
+class WebhookServer:
+    """
+    Satu server HTTP untuk webhook semua profil; setiap bot mendapat path sendiri.
+    Karena tidak ada getUpdates, beberapa replika bisa berjalan di belakang load balancer.
+    """
+    def __init__(self, listen="0.0.0.0", port=8443, secret_token=""):
+        self.listen = listen
+        self.port = port
+        self.secret_token = secret_token
+        self._routes = []
+        self._server = None
+        self.stats = {'received': 0, 'rejected': 0, 'invalid': 0}
+
+    def add_bot(self, path, application):
+        """
+        Daftarkan aplikasi Telegram pada path webhook tertentu
+
+        Args:
+            path: Path URL, mis. /telegram/m15
+            application: telegram.ext.Application yang menerima update
+        """
+        self._routes.append((
+            path,
+            TelegramWebhookHandler,
+            {'bot_application': application, 'secret_token': self.secret_token, 'stats': self.stats}
+        ))
+
+    async def start(self):
+        """Mulai menerima request di event loop yang sedang berjalan"""
+        app = tornado.web.Application(self._routes)
+        self._server = HTTPServer(app, xheaders=True)
+        self._server.listen(self.port, address=self.listen)
+        logger.info(f"Server webhook berjalan di {self.listen}:{self.port} untuk {len(self._routes)} bot")
+
+    async def stop(self):
+        """Berhenti menerima request dan tutup koneksi yang masih terbuka"""
+        if self._server is None:
+            return
+        self._server.stop()
+        await self._server.close_all_connections()
+        self._server = None
+        logger.info("Server webhook dihentikan")
+
+    def get_stats(self):
+        """
+        Dapatkan statistik webhook
+
+        Returns:
+            dict: Jumlah update diterima, ditolak (secret salah) dan tidak valid
+        """
+        return dict(self.stats)
@@ -0,0 +1,16 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Konfigurasi tetap untuk test; nilai dari config/.env tidak dipakai
+os.environ.update({
+    'PROFILES': 'M15',
+    'M15_TELEGRAM_BOT_TOKEN': '123456:TEST',
+    'M15_GPT_ID': 'g-test',
+    'OPENAI_API_KEY': 'sk-test-0000',
+    'STRUCTURED_OUTPUT': 'false',
+    'USE_FALLBACK': 'true',
+    'OPENAI_RATE_LIMIT_RETRIES': '0',
+    'OPENAI_MAX_RETRIES': '0'
+})
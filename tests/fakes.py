@@ -0,0 +1,34 @@
+"""Client OpenAI palsu dan data uji yang dipakai bersama oleh beberapa file test"""
+
+import io
+from types import SimpleNamespace
+from PIL import Image
+
+from src.openai_client import OpenAIClient
+
+ANALYSIS = "🔮 CRYPTOSCREENER AI 🔮\n\ntest"
+
+
+def chart_jpeg():
+    buffer = io.BytesIO()
+    Image.new('RGB', (320, 180), (20, 20, 30)).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+class FakeRawResponse:
+    headers = {}
+
+    def __init__(self, content):
+        self.content = content
+
+    def parse(self):
+        message = SimpleNamespace(content=self.content, refusal=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_client(create):
+    client = OpenAIClient()
+    client.async_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=SimpleNamespace(create=create)))
+    )
+    return client
@@ -0,0 +1,52 @@
+from src.analysis_formatter import render_html, to_telegram_html
+from src.progress_message import render_partial_html
+
+TEMPLATE = """🔮 CRYPTOSCREENER AI 🔮
+
+📊 ANALISIS BTC H1 📊
+Symbol: BTC/USDT | Harga: 64,250
+
+🔍 SUPPORT &amp; RESISTANCE
+- 🛡️ SUPPORT KUNCI: 63,800
+
+<b>⚠️ DISCLAIMER: Bukan saran finansial</b>
+<i>Pastikan untuk selalu melakukan analisis lebih lanjut.</i>"""
+
+
+def test_valid_template_is_unchanged():
+    assert to_telegram_html(TEMPLATE) == TEMPLATE
+    assert to_telegram_html(to_telegram_html(TEMPLATE)) == TEMPLATE
+
+
+def test_markdown_is_converted_to_bold():
+    text = "### 📈 TREND\n- 🚀 **TREND UTAMA:** uptrend\nR:R **1:2**"
+    assert to_telegram_html(text) == "<b>📈 TREND</b>\n- 🚀 <b>TREND UTAMA:</b> uptrend\nR:R <b>1:2</b>"
+
+
+def test_heading_only_at_line_start():
+    assert to_telegram_html("Target #1 dan ## 2") == "Target #1 dan ## 2"
+    assert to_telegram_html("## **Target** & SL") == "<b>Target &amp; SL</b>"
+
+
+def test_stray_characters_are_escaped():
+    text = "SUPPORT & RESISTANCE: 1.2 < harga > 1.1 &amp; &#128200;"
+    assert to_telegram_html(text) == "SUPPORT &amp; RESISTANCE: 1.2 &lt; harga &gt; 1.1 &amp; &#128200;"
+
+
+def test_unsupported_tags_are_escaped_and_br_becomes_newline():
+    text = "Entry<br>Target<br/>SL <div>x</div>"
+    assert to_telegram_html(text) == "Entry\nTarget\nSL &lt;div&gt;x&lt;/div&gt;"
+
+
+def test_unbalanced_tags_are_repaired():
+    assert to_telegram_html("<b>Stop Loss: <i>63,000</b> sisa</i>") == "<b>Stop Loss: <i>63,000</i></b> sisa"
+    assert to_telegram_html("</i><b>DISCLAIMER") == "<b>DISCLAIMER</b>"
+
+
+def test_render_html_reports_open_tags():
+    assert render_html("<b>a <i>b") == ("<b>a <i>b", ['b', 'i'])
+
+
+def test_partial_render_drops_cut_tag_and_closes_open_tags():
+    assert render_partial_html("<b>TREND & **naik** </b") == "<b>TREND &amp; <b>naik</b> ▌</b>"
+    assert render_partial_html("SUPPORT &am") == "SUPPORT ▌"
@@ -0,0 +1,85 @@
+import asyncio
+import httpx
+import openai
+import pytest
+
+from src.circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+from src.profiles import load_profiles
+from fakes import ANALYSIS, FakeRawResponse, chart_jpeg, make_client
+
+
+def rate_limit_error():
+    request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+    return openai.RateLimitError("Rate limit", response=httpx.Response(429, request=request), body=None)
+
+
+def open_circuit(breaker, model):
+    """Buka circuit lalu hilangkan cooldown sehingga request berikutnya menjadi probe"""
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure(model, Exception("gagal"))
+    breaker.cooldown = 0
+    assert breaker.get_state(model) == OPEN
+
+
+def test_release_probe_allows_next_probe():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    breaker.record_failure('g-test', Exception("gagal"))
+    assert breaker.allow('g-test')
+    assert not breaker.allow('g-test')
+
+    breaker.release_probe('g-test')
+
+    assert breaker.get_state('g-test') == HALF_OPEN
+    assert breaker.allow('g-test')
+
+
+def test_rate_limited_probe_is_released():
+    models = []
+    responses = [rate_limit_error(), ANALYSIS]
+
+    async def create(model, **kwargs):
+        models.append(model)
+        result = responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return FakeRawResponse(result)
+
+    profile = load_profiles()[0]
+    client = make_client(create)
+    open_circuit(client.circuit_breaker, profile.gpt_id)
+
+    async def run():
+        with pytest.raises(openai.RateLimitError):
+            await client.analyze_photo_async(profile, chart_jpeg())
+        assert client.circuit_breaker.get_state(profile.gpt_id) == HALF_OPEN
+        # Probe berikutnya tetap ke GPT kustom, bukan langsung ke fallback
+        assert await client.analyze_photo_async(profile, chart_jpeg()) == ANALYSIS
+
+    asyncio.run(run())
+
+    assert models == [profile.gpt_id, profile.gpt_id]
+    assert client.circuit_breaker.get_state(profile.gpt_id) == CLOSED
+
+
+def test_cancelled_probe_is_released():
+    started = asyncio.Event()
+
+    async def create(model, **kwargs):
+        started.set()
+        await asyncio.sleep(3600)
+
+    profile = load_profiles()[0]
+    client = make_client(create)
+    open_circuit(client.circuit_breaker, profile.gpt_id)
+
+    async def run():
+        task = asyncio.create_task(client.analyze_photo_async(profile, chart_jpeg()))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    assert client.circuit_breaker.get_state(profile.gpt_id) == HALF_OPEN
+    assert client.circuit_breaker.allow(profile.gpt_id)
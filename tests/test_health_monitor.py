@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+import httpx
+import openai
+import pytest
+
+from src.health_monitor import HealthMonitor
+
+REQUEST = httpx.Request('GET', 'https://api.openai.com/v1/models')
+
+
+def status_error(cls, status):
+    return cls("gagal", response=httpx.Response(status, request=REQUEST), body=None)
+
+
+class FakeModels:
+    def __init__(self, error):
+        self.error = error
+
+    async def list(self):
+        if self.error is not None:
+            raise self.error
+
+
+def checked(error, key_valid=True, reachable=True):
+    monitor = HealthMonitor(SimpleNamespace(models=FakeModels(error)))
+    monitor.key_valid, monitor.reachable = key_valid, reachable
+    asyncio.run(monitor.check())
+    return monitor
+
+
+@pytest.mark.parametrize('error', [
+    status_error(openai.RateLimitError, 429),
+    status_error(openai.InternalServerError, 503),
+    status_error(openai.PermissionDeniedError, 403),
+    openai.APITimeoutError(REQUEST),
+])
+def test_check_keeps_state_on_other_errors(error):
+    monitor = checked(error)
+    assert (monitor.key_valid, monitor.reachable) == (True, True)
+    # Status tidak sehat sebelumnya juga tidak dianggap pulih
+    monitor = checked(error, reachable=False)
+    assert (monitor.key_valid, monitor.reachable) == (True, False)
+
+
+def test_check_marks_invalid_key_only_on_authentication_error():
+    monitor = checked(status_error(openai.AuthenticationError, 401))
+    assert (monitor.key_valid, monitor.reachable) == (False, True)
+
+
+def test_check_marks_unreachable_on_connection_error():
+    monitor = checked(openai.APIConnectionError(request=REQUEST))
+    assert (monitor.key_valid, monitor.reachable) == (True, False)
+
+
+def test_record_error_ignores_permission_denied():
+    monitor = HealthMonitor(None)
+    monitor.record_error(status_error(openai.PermissionDeniedError, 403))
+    assert monitor.is_healthy()
@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+import src.openai_client as openai_client_module
+from src.profiles import load_profiles
+from fakes import ANALYSIS, FakeRawResponse, chart_jpeg, make_client
+
+
+class FakeStream:
+    """Stream yang header-nya langsung tiba, tetapi potongan analisis pertama baru setelah content_delay"""
+    def __init__(self, content_delay):
+        self.content_delay = content_delay
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.content_delay)
+        delta = SimpleNamespace(content=ANALYSIS)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+
+
+class FakeStreamResponse:
+    headers = {}
+
+    def __init__(self, content_delay):
+        self.content_delay = content_delay
+
+    def parse(self):
+        return FakeStream(self.content_delay)
+
+
+def test_stream_hedge_waits_for_first_content(monkeypatch):
+    monkeypatch.setattr(openai_client_module, 'OPENAI_HEDGE', True)
+    monkeypatch.setattr(openai_client_module, 'OPENAI_HEDGE_MIN_DELAY', 0.01)
+    monkeypatch.setattr(openai_client_module, 'OPENAI_HEDGE_MODEL', 'gpt-4o-mini')
+    content_delays = [0.1] * 10 + [0.03]
+    calls = []
+
+    async def create(model, **kwargs):
+        calls.append(model)
+        return FakeStreamResponse(content_delays.pop(0))
+
+    client = make_client(create)
+
+    async def on_progress(text):
+        pass
+
+    async def run():
+        # Hangatkan histogram: potongan pertama selalu tiba setelah 0.1 detik
+        for _ in range(10):
+            await client._complete('gpt-4o', [], 100, on_progress)
+        calls.clear()
+        return await client._complete('gpt-4o', [], 100, on_progress)
+
+    assert asyncio.run(run()) == (ANALYSIS, 'gpt-4o')
+    assert calls == ['gpt-4o']
+    assert client.hedges == 0
+
+
+def test_hedge_win_is_not_credited_to_custom_gpt(monkeypatch):
+    monkeypatch.setattr(openai_client_module, 'OPENAI_HEDGE', True)
+    monkeypatch.setattr(openai_client_module, 'OPENAI_HEDGE_MIN_DELAY', 0.05)
+    monkeypatch.setattr(openai_client_module, 'OPENAI_HEDGE_MODEL', 'gpt-4o-mini')
+    profile = load_profiles()[0]
+    slow = {'value': False}
+
+    async def create(model, **kwargs):
+        if model == profile.gpt_id and slow['value']:
+            await asyncio.sleep(1)
+        return FakeRawResponse(ANALYSIS)
+
+    client = make_client(create)
+
+    async def run():
+        for _ in range(20):
+            await client.analyze_photo_async(profile, chart_jpeg())
+        client.circuit_breaker.record_failure(profile.gpt_id, Exception("gagal"))
+        slow['value'] = True
+        return await client.analyze_photo_async(profile, chart_jpeg())
+
+    assert asyncio.run(run()) == ANALYSIS
+    assert client.hedge_wins == 1
+    # Kegagalan sebelumnya tidak dihapus oleh jawaban model cadangan
+    assert client.circuit_breaker.get_stats()[profile.gpt_id]['failures'] == 1
+    assert 'gpt-4o-mini' not in client.circuit_breaker.get_stats()
+
+
+@pytest.mark.parametrize('hedge_model', ['', 'gpt-4o'])
+def test_no_hedge_without_a_different_model(monkeypatch, hedge_model):
+    monkeypatch.setattr(openai_client_module, 'OPENAI_HEDGE', True)
+    monkeypatch.setattr(openai_client_module, 'OPENAI_HEDGE_MIN_DELAY', 0.01)
+    monkeypatch.setattr(openai_client_module, 'OPENAI_HEDGE_MODEL', hedge_model)
+    calls = []
+
+    async def create(model, **kwargs):
+        calls.append(model)
+        # Request terakhir jauh lebih lambat dari p95 histogram
+        await asyncio.sleep(0.1 if len(calls) > 20 else 0.01)
+        return FakeRawResponse(ANALYSIS)
+
+    client = make_client(create)
+
+    async def run():
+        for _ in range(21):
+            await client._complete('gpt-4o', [], 100)
+
+    asyncio.run(run())
+
+    assert calls == ['gpt-4o'] * 21
+    assert client.hedges == 0
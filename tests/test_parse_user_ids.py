@@ -0,0 +1,13 @@
+from src.telegram_bot import parse_user_ids
+
+
+def test_ids_from_command_text():
+    assert parse_user_ids("123, 456;789\n0 abc") == ([123, 456, 789], ['0', 'abc'])
+
+
+def test_unicode_digits_are_invalid_not_an_error():
+    assert parse_user_ids("123 ² ١٢٣ ①") == ([123], ['²', '١٢٣', '①'])
+
+
+def test_csv_skips_header_and_reads_first_column():
+    assert parse_user_ids("user_id,nama\n123,Andi\n²,Budi\n", is_csv=True) == ([123], ['²'])
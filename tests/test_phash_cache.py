@@ -0,0 +1,72 @@
+import io
+import random
+import itertools
+import pytest
+from PIL import Image, ImageDraw
+
+from src.phash_cache import PhashCache, dhash
+from src.config import PHASH_MAX_DISTANCE
+
+
+def candlestick_chart(seed, width=1280, height=720):
+    """Chart candlestick acak dengan latar gelap dan grid, seperti screenshot TradingView"""
+    rng = random.Random(seed)
+    image = Image.new('RGB', (width, height), (19, 23, 34))
+    draw = ImageDraw.Draw(image)
+    for y in range(0, height, 60):
+        draw.line([(0, y), (width, y)], fill=(35, 40, 55))
+    price = height / 2
+    count = rng.randint(60, 120)
+    candle_width = width / count
+    for index in range(count):
+        open_price = price
+        close_price = open_price + rng.gauss(0, 12)
+        high = max(open_price, close_price) + abs(rng.gauss(0, 6))
+        low = min(open_price, close_price) - abs(rng.gauss(0, 6))
+        price = min(max(close_price, 60), height - 60)
+        color = (38, 166, 154) if close_price < open_price else (239, 83, 80)
+        x = index * candle_width + candle_width / 2
+        draw.line([(x, high), (x, low)], fill=color)
+        draw.rectangle([x - candle_width * 0.35, min(open_price, close_price),
+                        x + candle_width * 0.35, max(open_price, close_price) + 1], fill=color)
+    return image
+
+
+def encode(image, **kwargs):
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', **kwargs)
+    return buffer.getvalue()
+
+
+def distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+@pytest.fixture(scope='module')
+def charts():
+    return [candlestick_chart(seed) for seed in range(200)]
+
+
+def test_distinct_charts_do_not_match(charts):
+    hashes = [dhash(encode(chart, quality=90)) for chart in charts]
+    closest = min(distance(a, b) for a, b in itertools.combinations(hashes, 2))
+    # Butuh jarak aman, bukan sekadar di atas batas: chart baru yang mirip tidak boleh ikut cocok
+    assert closest > 2 * PHASH_MAX_DISTANCE
+
+    cache = PhashCache(PHASH_MAX_DISTANCE)
+    for value in hashes[:100]:
+        cache.set(value, 'M15', 'analysis')
+    assert all(cache.get(value, 'M15') is None for value in hashes[100:])
+
+
+@pytest.mark.parametrize('variant', [
+    lambda chart: encode(chart, quality=75),
+    lambda chart: encode(chart.resize((chart.width * 3 // 4, chart.height * 3 // 4)), quality=90),
+])
+def test_reencoded_chart_matches(charts, variant):
+    cache = PhashCache(PHASH_MAX_DISTANCE)
+    for index, chart in enumerate(charts[:20]):
+        cache.set(dhash(encode(chart, quality=90)), 'M15', f"analysis {index}")
+
+    for index, chart in enumerate(charts[:20]):
+        assert cache.get(dhash(variant(chart)), 'M15') == f"analysis {index}"
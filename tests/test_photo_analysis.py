@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from src.openai_client import FallbackAnalysis
+from src.profiles import load_profiles
+from fakes import FakeRawResponse, chart_jpeg, make_client
+
+
+@pytest.mark.parametrize('content', [None, '', ' \n'])
+def test_empty_response_is_fallback(content):
+    profile = load_profiles()[0]
+    client = make_client(None)
+
+    assert isinstance(client._clean_photo_analysis(profile, content), FallbackAnalysis)
+    assert isinstance(client._render_structured(profile, content), FallbackAnalysis)
+
+
+def test_analysis_without_content_returns_fallback():
+    async def create(model, **kwargs):
+        return FakeRawResponse(None)
+
+    profile = load_profiles()[0]
+    client = make_client(create)
+
+    analysis = asyncio.run(client.analyze_photo_async(profile, chart_jpeg()))
+
+    assert isinstance(analysis, FallbackAnalysis)
+    assert analysis == profile.prompts.PHOTO_FALLBACK_ANALYSIS